@@ -1,15 +1,41 @@
 """The RAPT.io integration."""
 
 import logging
-from datetime import timedelta
 
+from homeassistant.components import webhook
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
 
 from .api import RaptApiClient
-from .const import CONF_API_KEY, CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL, DOMAIN
+from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_HEDGE_PERCENTILE,
+    CONF_MAX_STALE_AGE,
+    CONF_REQUEST_BUDGET,
+    CONF_UPDATE_INTERVAL,
+    CONF_WEBHOOK,
+    CONF_WEBHOOK_SECRET,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_HEDGE_PERCENTILE,
+    DEFAULT_MAX_STALE_AGE,
+    DEFAULT_REQUEST_BUDGET,
+    DEFAULT_UPDATE_INTERVAL,
+    DEFAULT_WEBHOOK,
+    DOMAIN,
+    RECONCILE_UPDATE_INTERVAL,
+)
 from .coordinator import RaptDataUpdateCoordinator
+from .history import RESTORED_HISTORY, RaptHistoryStore, async_remove_history
+from .profiler import async_setup_services
+from .registry import async_get_client_registry
+from .scheduler import FIRST_POLL_JITTER, async_get_poll_scheduler
+from .store import RaptDeviceCache, RaptTokenStore
+from .telemetry import TELEMETRY_SYNC_INTERVAL, RaptTelemetrySync, async_remove_telemetry_state
+from .webhook import async_register_webhook
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,6 +44,7 @@ PLATFORMS = ["sensor"]
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the RAPT.io component."""
+    async_setup_services(hass)
     # Return boolean to indicate that initialization was successful.
     return True
 
@@ -27,31 +54,102 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     _LOGGER.info("Setting up RAPT.io integration from config entry")
 
-    # Get username/password from config entry
-    username = entry.data["username"]
-    api_key = entry.data[CONF_API_KEY]
+    # Entries of the same account share one API client
+    client_registry = async_get_client_registry(hass)
+    client: RaptApiClient = client_registry.async_acquire(entry)
 
-    # Create API client instance
-    client = RaptApiClient(
-        username=username,
-        api_key=api_key,
-        session=async_get_clientsession(hass),
-    )
+    # Reuse the token from before the restart while it is still valid
+    token_store = RaptTokenStore(hass, entry.entry_id)
+    if (stored_token := await token_store.async_load()) is not None:
+        client.restore_token(*stored_token)
+    entry.async_on_unload(client.add_token_listener(token_store.async_save))
 
-    # Initialize the data update coordinator
-    update_interval = entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
-    coordinator = RaptDataUpdateCoordinator(hass, client, update_interval)
+    # Reuse the token and device lists obtained by the config flow
+    if (seed := client_registry.async_pop_seed(entry)) is not None and seed.access_token is not None:
+        if client.restore_token(seed.access_token, seed.token_expires):
+            token_store.async_save(seed.access_token, seed.token_expires)
 
-    # Fetch initial data so we have data when entities subscribe
-    await coordinator.async_config_entry_first_refresh()
+    # Initialize the data update coordinator
+    update_interval, adaptive_polling = _polling_options(entry)
+    max_stale_age = entry.options.get(CONF_MAX_STALE_AGE, DEFAULT_MAX_STALE_AGE)
+    # Polls of all entries are spread over time rather than fired in lockstep
+    poll_slot = async_get_poll_scheduler(hass).async_register(entry.entry_id)
+    entry.async_on_unload(poll_slot.async_unregister)
+    coordinator = RaptDataUpdateCoordinator(hass, client, update_interval, adaptive_polling, max_stale_age, poll_slot)
+    if seed is not None:
+        coordinator.async_seed(seed.device_lists)
+
+    # Telemetry history on disk, it restores the fermentation metrics before the first refresh
+    history = RaptHistoryStore(hass, entry.entry_id)
+    await history.async_open()
+    entry.async_on_unload(history.async_close)
+    coordinator.async_restore_readings(await history.async_get_readings(dt_util.utcnow() - RESTORED_HISTORY))
+
+    device_cache = RaptDeviceCache(hass, entry.entry_id)
+    cached_devices = await device_cache.async_load() if seed is None else None
+    if refresh_in_background := bool(cached_devices):
+        # Create the entities from the cached device list, they restore their
+        # last state, and refresh in the background so startup doesn't wait on RAPT
+        coordinator.async_restore(cached_devices)
+    else:
+        # Fetch initial data so we have data when entities subscribe. It isn't
+        # delayed, the setup waits on it, but it is still counted against the
+        # concurrent polls and schedules the next poll apart from the others
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except ConfigEntryNotReady:
+            await client_registry.async_release(entry)
+            raise
+
+    @callback
+    def async_cache_devices() -> None:
+        """Save the device list when devices were added, removed or renamed."""
+        device_cache.async_save(coordinator.endpoint_devices)
+
+    async_cache_devices()
+    entry.async_on_unload(coordinator.async_add_listener(async_cache_devices))
+
+    @callback
+    def async_record_history() -> None:
+        """Write the readings of the devices that changed during the update cycle."""
+        history.async_add(
+            coordinator.data[device_id] for device_id in coordinator.changed_devices if device_id in coordinator.data
+        )
+
+    async_record_history()
+    entry.async_on_unload(coordinator.async_add_listener(async_record_history))
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if refresh_in_background:
+
+        async def async_first_refresh() -> None:
+            """Refresh once the first poll of the entry is due, jittered and spread from the other entries."""
+            await poll_slot.async_wait_first_poll(dt_util.utcnow(), FIRST_POLL_JITTER)
+            await coordinator.async_refresh()
+
+        entry.async_create_background_task(hass, async_first_refresh(), f"{DOMAIN} first refresh")
+
+    # Telemetry pushed to the webhook replaces tight polling
+    if _webhook_enabled(entry):
+        if CONF_WEBHOOK_ID not in entry.data:
+            hass.config_entries.async_update_entry(
+                entry, data={**entry.data, CONF_WEBHOOK_ID: webhook.async_generate_id()}
+            )
+        entry.async_on_unload(async_register_webhook(hass, entry, coordinator))
+        coordinator.webhook_secret = entry.options[CONF_WEBHOOK_SECRET]
+
     entry.async_on_unload(entry.add_update_listener(update_listener))
 
+    # Import telemetry history into long-term statistics
+    if "recorder" in hass.config.components:
+        telemetry_sync = RaptTelemetrySync(hass, entry.entry_id, coordinator)
+        entry.async_create_background_task(hass, telemetry_sync.async_sync(), f"{DOMAIN} telemetry sync")
+        entry.async_on_unload(async_track_time_interval(hass, telemetry_sync.async_sync, TELEMETRY_SYNC_INTERVAL))
+
     _LOGGER.info("Finished setting up RAPT.io integration")
     return True
 
@@ -62,15 +160,45 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_forward_entry_unload(entry, "sensor")
     if unload_ok:
         # Clean up
-        coordinator: RaptDataUpdateCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
-        await coordinator.client.close()  # Close the aiohttp session
-        _LOGGER.debug("Closed RAPT.io API client session")
+        hass.data[DOMAIN].pop(entry.entry_id)
+        # Closes the API client once no other entry of the account uses it
+        await async_get_client_registry(hass).async_release(entry)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove data stored for a config entry."""
+    await RaptTokenStore(hass, entry.entry_id).async_remove()
+    await RaptDeviceCache(hass, entry.entry_id).async_remove()
+    await async_remove_telemetry_state(hass, entry.entry_id)
+    await async_remove_history(hass, entry.entry_id)
+
+
+def _webhook_enabled(entry: ConfigEntry) -> bool:
+    """Return True if telemetry is pushed to the webhook of the entry."""
+    return entry.options.get(CONF_WEBHOOK, DEFAULT_WEBHOOK) and bool(entry.options.get(CONF_WEBHOOK_SECRET))
+
+
+def _polling_options(entry: ConfigEntry) -> tuple[int, bool]:
+    """Return the update interval and adaptive polling setting of the entry."""
+    if _webhook_enabled(entry):
+        # Only reconcile the device lists, telemetry arrives through the webhook
+        return max(RECONCILE_UPDATE_INTERVAL, entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)), False
+    return (
+        entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
+        entry.options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING),
+    )
+
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
     coordinator: RaptDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    update_interval = entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
-    coordinator.update_interval = timedelta(seconds=update_interval)
+    if coordinator.webhook_secret != (entry.options[CONF_WEBHOOK_SECRET] if _webhook_enabled(entry) else None):
+        # The webhook is registered during setup
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    coordinator.async_update_polling(*_polling_options(entry))
+    coordinator.max_stale_age = entry.options.get(CONF_MAX_STALE_AGE, DEFAULT_MAX_STALE_AGE)
+    coordinator.client.set_request_budget(entry.options.get(CONF_REQUEST_BUDGET, DEFAULT_REQUEST_BUDGET))
+    coordinator.client.set_hedge_percentile(entry.options.get(CONF_HEDGE_PERCENTILE, DEFAULT_HEDGE_PERCENTILE))
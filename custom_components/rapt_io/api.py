@@ -4,16 +4,60 @@ from datetime import datetime, timedelta, timezone
 import asyncio
 import logging
 import socket
+import ssl
+import time
+from collections.abc import Callable
+from typing import Any
+from urllib.parse import urlsplit
 
 import aiohttp
+import voluptuous as vol
 from aiohttp import ClientError, ClientResponseError
 
+from .const import DEFAULT_HEDGE_PERCENTILE, DEFAULT_REQUEST_BUDGET
+from .metrics import ApiMetrics
+from .payload import (
+    DEVICE_LIST_SCHEMA,
+    TELEMETRY_SCHEMA,
+    TOKEN_SCHEMA,
+    PayloadLogger,
+    decode_json,
+    json_loads,
+)
+from .ratelimit import RequestBudget, backoff_delay, parse_retry_after
+
 _LOGGER = logging.getLogger(__name__)
 
 # Define API base URL (adjust if needed based on documentation)
 RAPT_API_BASE_URL = "https://api.rapt.io"
 RAPT_AUTH_URL = "https://id.rapt.io"
 
+# Renew the access token this long before it expires
+TOKEN_RENEWAL_MARGIN = timedelta(minutes=5)
+
+# Retries of rate limited and transient failures
+MAX_RETRIES = 3
+# Rate limits asking to wait longer than this are not retried
+MAX_RETRY_AFTER = 60  # seconds
+
+# HTTP status codes worth retrying
+TRANSIENT_STATUS_CODES = {500, 502, 503, 504}
+
+# Recent successful requests to an endpoint required before hedging its requests
+HEDGE_MIN_SAMPLES = 20
+# Shortest delay before a hedged request is sent
+MIN_HEDGE_DELAY = 0.1  # seconds
+
+# Connections to the RAPT hosts are kept open between polls
+KEEPALIVE_TIMEOUT = 120  # seconds
+DNS_CACHE_TTL = 300  # seconds
+MAX_CONNECTIONS_PER_HOST = 4
+
+# Timeouts of each class of request: token requests are small, telemetry responses can be large
+AUTH_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=5, sock_read=10)
+DEVICE_LIST_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5, sock_read=10)
+TELEMETRY_TIMEOUT = aiohttp.ClientTimeout(total=60, connect=5, sock_read=30)
+
 
 # Define custom exceptions
 class RaptApiError(Exception):
@@ -24,58 +68,362 @@ class RaptAuthError(RaptApiError):
     """Failed to authenticate with RAPT API."""
 
 
+class RaptConnectionError(RaptApiError):
+    """Transient network or server error."""
+
+
+class RaptRateLimitError(RaptApiError):
+    """The RAPT API rate limit was exceeded."""
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        """Initialize the error with the delay requested by the server."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _error_kind(status: int) -> str:
+    """Return the metrics label of an HTTP error status."""
+    if status == 401:
+        return "auth"
+    if status == 429:
+        return "rate_limited"
+    if status in TRANSIENT_STATUS_CODES:
+        return "server"
+    return "http"
+
+
+def _validate(schema: vol.Schema, response: Any, description: str) -> Any:
+    """Validate the shape of a decoded response."""
+    try:
+        return schema(response)
+    except vol.Invalid as err:
+        _LOGGER.error("Unexpected %s format received: %s", description, err)
+        raise RaptApiError(f"Unexpected format for {description}") from err
+
+
+def create_session(ssl_context: ssl.SSLContext | None = None) -> aiohttp.ClientSession:
+    """Return a session whose connector keeps connections alive between polls and caches DNS lookups."""
+    connector = aiohttp.TCPConnector(
+        ssl=ssl_context if ssl_context is not None else True,
+        limit_per_host=MAX_CONNECTIONS_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        use_dns_cache=True,
+        ttl_dns_cache=DNS_CACHE_TTL,
+    )
+    return aiohttp.ClientSession(connector=connector)
+
+
 class RaptApiClient:
     """RAPT.io API Client."""
 
-    def __init__(self, username: str, api_key: str, session: aiohttp.ClientSession | None = None) -> None:
-        """Initialize the API client."""
+    def __init__(
+        self,
+        username: str,
+        api_key: str,
+        session: aiohttp.ClientSession | None = None,
+        renew_token: bool = False,
+        request_budget: int = DEFAULT_REQUEST_BUDGET,
+        base_url: str = RAPT_API_BASE_URL,
+        auth_url: str = RAPT_AUTH_URL,
+        loads: Callable[[bytes], Any] = json_loads,
+        ssl_context: ssl.SSLContext | None = None,
+        hedge_percentile: float = DEFAULT_HEDGE_PERCENTILE,
+    ) -> None:
+        """Initialize the API client.
+
+        When renew_token is set, the access token is renewed in the background
+        shortly before it expires so requests never wait on the identity server.
+        Requests are limited to request_budget requests per minute. Response
+        bodies are decoded with loads, orjson by default when installed.
+        Without a session, the client creates and closes its own, verifying
+        certificates with ssl_context. A GET request still unanswered after the
+        hedge_percentile latency of its endpoint is duplicated, the first
+        response wins; 0 disables hedging.
+        """
         self._username = username
         self._api_key = api_key
-        # TODO: Implement token storage and management
         self._auth_token = None
         self._token_expires = None
-        self._session = session or aiohttp.ClientSession()
-        self._base_url = RAPT_API_BASE_URL
+        # Serializes authentication so concurrent callers share a single token request
+        self._auth_lock = asyncio.Lock()
+        self._renew_token = renew_token
+        self._renewal_handle: asyncio.TimerHandle | None = None
+        self._renewal_task: asyncio.Task | None = None
+        self._token_listeners: list[Callable[[str, datetime], None]] = []
+        # Only close sessions created by the client, a passed in session belongs to the caller
+        self._owns_session = session is None
+        self._session = session or create_session(ssl_context)
+        # In-flight GET requests, identical requests share the same response
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._base_url = base_url
+        self._auth_url = auth_url
+        self._request_budget = RequestBudget(request_budget)
+        self._hedge_percentile = hedge_percentile
+        self._loads = loads
+        self._payload_logger = PayloadLogger(_LOGGER)
+        self.metrics = ApiMetrics()
+
+    @property
+    def rate_limit_state(self) -> dict:
+        """Return the state of the client-side request budget."""
+        return self._request_budget.state
+
+    def set_request_budget(self, request_budget: int) -> None:
+        """Change the number of requests allowed per minute."""
+        self._request_budget.set_rate(request_budget)
+
+    def set_hedge_percentile(self, hedge_percentile: float) -> None:
+        """Change the latency percentile after which requests are hedged, 0 disables hedging."""
+        self._hedge_percentile = hedge_percentile
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        data: dict | None = None,
+        is_auth: bool = False,
+        params: dict | None = None,
+        timeout: aiohttp.ClientTimeout = DEVICE_LIST_TIMEOUT,
+        hedge: bool = False,
+    ) -> dict:
+        """Make an API request.
+
+        Identical GET requests issued while one is in flight, e.g. by config
+        entries sharing this client, wait for its response instead of being sent.
+        Small GET requests can be hedged, see _request_hedged.
+        """
+        if method != "get":
+            return await self._request_with_retries(method, url, data, is_auth, params, timeout)
+
+        key = (url, tuple(sorted(params.items())) if params else None)
+        if (inflight := self._inflight.get(key)) is not None:
+            _LOGGER.debug("Joining in-flight request to %s", url)
+            return await asyncio.shield(inflight)
+
+        if hedge:
+            task = asyncio.ensure_future(self._request_hedged(method, url, params, timeout))
+        else:
+            task = asyncio.ensure_future(self._request_with_retries(method, url, None, False, params, timeout))
+        # Retrieve the exception in case every waiter was cancelled
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._inflight[key] = task
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+
+    def _hedge_delay(self, endpoint: str) -> float | None:
+        """Return the delay before hedging a request to an endpoint, None to not hedge it."""
+        if not self._hedge_percentile:
+            return None
+        latency = self.metrics.endpoint(endpoint).recent_latency
+        if len(latency) < HEDGE_MIN_SAMPLES:
+            return None
+        return max(latency.percentile(self._hedge_percentile), MIN_HEDGE_DELAY)
+
+    async def _request_hedged(self, method: str, url: str, params: dict | None, timeout: aiohttp.ClientTimeout) -> dict:
+        """Make an API request, sending a duplicate if it is slower than usual.
+
+        The hedged request is only sent once the original one is slower than
+        the configured percentile of the last successful requests to the
+        endpoint, so it costs about one extra request in a hundred at the 99th
+        percentile. The first successful response is used and the other
+        request is cancelled.
+        """
+        endpoint = urlsplit(url).path
+        original = asyncio.ensure_future(self._request_with_retries(method, url, None, False, params, timeout))
+        if (hedge_delay := self._hedge_delay(endpoint)) is None:
+            return await original
+        try:
+            done, _ = await asyncio.wait({original}, timeout=hedge_delay)
+        except asyncio.CancelledError:
+            original.cancel()
+            raise
+        if done:
+            return original.result()
 
-    async def _request(self, method: str, url: str, data: dict | None = None, is_auth: bool = False) -> dict:
-        """Make an API request."""
+        _LOGGER.debug("No response from %s after %.2f seconds, sending a hedged request", url, hedge_delay)
+        self.metrics.record_hedge(endpoint)
+        hedge = asyncio.ensure_future(self._request_with_retries(method, url, None, False, params, timeout))
+        pending = {original, hedge}
+        try:
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = [request for request in done if request.exception() is None]
+                if succeeded:
+                    if hedge in succeeded and original not in succeeded:
+                        self.metrics.record_hedge_win(endpoint)
+                    return succeeded[0].result()
+                if not pending:
+                    # Both failed, report the original failure
+                    return original.result()
+        finally:
+            for request in pending:
+                request.cancel()
+
+    async def _request_with_retries(
+        self,
+        method: str,
+        url: str,
+        data: dict | None = None,
+        is_auth: bool = False,
+        params: dict | None = None,
+        timeout: aiohttp.ClientTimeout = DEVICE_LIST_TIMEOUT,
+    ) -> dict:
+        """Make an API request within the request budget.
+
+        Rate limited and transient failures are retried with a jittered
+        exponential backoff, honouring the server's Retry-After.
+        """
+        attempt = 0
+        while True:
+            await self._request_budget.acquire()
+            try:
+                return await self._request_once(method, url, data, is_auth, params, timeout)
+            except RaptRateLimitError as err:
+                if err.retry_after is not None:
+                    # Bounded, the budget is shared by all requests of the account
+                    self._request_budget.pause(min(err.retry_after, MAX_RETRY_AFTER))
+                if attempt >= MAX_RETRIES or (err.retry_after or 0) > MAX_RETRY_AFTER:
+                    _LOGGER.debug("Rate limited on %s, giving up after %d attempts", url, attempt + 1)
+                    raise
+                delay = err.retry_after if err.retry_after is not None else backoff_delay(attempt)
+            except RaptConnectionError as err:
+                if attempt >= MAX_RETRIES:
+                    _LOGGER.debug("Request to %s failed after %d attempts: %s", url, attempt + 1, err)
+                    raise
+                delay = backoff_delay(attempt)
+            attempt += 1
+            self.metrics.record_retry(urlsplit(url).path)
+            _LOGGER.debug("Retrying request to %s in %.1f seconds (attempt %d)", url, delay, attempt)
+            await asyncio.sleep(delay)
+
+    async def _request_once(
+        self,
+        method: str,
+        url: str,
+        data: dict | None,
+        is_auth: bool,
+        params: dict | None = None,
+        timeout: aiohttp.ClientTimeout = DEVICE_LIST_TIMEOUT,
+    ) -> dict:
+        """Make a single API request."""
         headers = {}
-        if self._auth_token:
+        if self._auth_token and not is_auth:
             headers["Authorization"] = f"Bearer {self._auth_token}"  # Assuming Bearer token
 
         _LOGGER.debug("Sending %s request to %s", method, url)
+        endpoint = urlsplit(url).path
+        start = time.monotonic()
         try:
             async with self._session.request(
                 method,
                 url,
+                params=params,
                 data=data if is_auth else None,
                 json=data if not is_auth else None,
                 headers=headers,
-                timeout=15,  # Increased timeout
+                timeout=timeout,
             ) as response:
                 response.raise_for_status()  # Raise exception for 4xx/5xx status codes
                 _LOGGER.debug("API Response status: %s", response.status)
-                json_response = await response.json()
-                _LOGGER.debug("API Response data: %s", json_response)
-                return json_response
+                body = await response.read()
+            if not is_auth:  # Never log access tokens
+                self._payload_logger.log(url, body)
+            result = decode_json(body, self._loads)
+            self.metrics.record_response(endpoint, time.monotonic() - start, len(body))
+            return result
         except ClientResponseError as err:
+            self.metrics.record_error(endpoint, time.monotonic() - start, _error_kind(err.status))
             if err.status == 401:  # Unauthorized
                 _LOGGER.error("Authentication error: %s", err)
                 raise RaptAuthError("Authentication failed") from err
+            if err.status == 429:  # Too Many Requests
+                retry_after = parse_retry_after(err.headers.get("Retry-After") if err.headers else None)
+                _LOGGER.debug("Rate limited by RAPT API on %s, retry after %s seconds", url, retry_after)
+                raise RaptRateLimitError(f"Rate limited: {err}", retry_after) from err
+            if err.status in TRANSIENT_STATUS_CODES:
+                _LOGGER.debug("Server error during API request to %s: %s", url, err)
+                raise RaptConnectionError(f"Server error: {err}") from err
             _LOGGER.error("HTTP error during API request to %s: %s", url, err)
             raise RaptApiError(f"Request failed: {err}") from err
         except (ClientError, socket.gaierror, asyncio.TimeoutError) as err:
-            _LOGGER.error("Network error during API request to %s: %s", url, err)
-            raise RaptApiError(f"Communication error: {err}") from err
+            self.metrics.record_error(endpoint, time.monotonic() - start, "network")
+            _LOGGER.debug("Network error during API request to %s: %s", url, err)
+            raise RaptConnectionError(f"Communication error: {err}") from err
+        except ValueError as err:
+            self.metrics.record_error(endpoint, time.monotonic() - start, "invalid_json")
+            _LOGGER.error("Invalid JSON received from %s: %s", url, err)
+            raise RaptApiError(f"Invalid JSON response: {err}") from err
         except Exception as err:
+            self.metrics.record_error(endpoint, time.monotonic() - start, "unexpected")
             _LOGGER.exception("Unexpected error during API request to %s", url)
             raise RaptApiError(f"An unexpected error occurred: {err}") from err
 
+    def restore_token(self, access_token: str, expires: datetime) -> bool:
+        """Reuse a previously acquired access token.
+
+        Returns False if the token has already expired or the current token is
+        valid for longer. A restored token that
+        the API rejects is replaced through the regular re-authentication path.
+        """
+        if expires <= datetime.now(timezone.utc):
+            _LOGGER.debug("Not restoring expired access token")
+            return False
+        if self._token_valid() and self._token_expires and self._token_expires >= expires:
+            _LOGGER.debug("Keeping current access token, it expires later than the restored one")
+            return False
+        self._auth_token = access_token
+        self._token_expires = expires
+        _LOGGER.info("Restored access token. Expires at %s", self._token_expires)
+        if self._renew_token:
+            self._schedule_token_renewal()
+        return True
+
+    @property
+    def token(self) -> tuple[str, datetime] | None:
+        """Return the current access token and its expiry, if it is still valid."""
+        if not self._token_valid() or self._token_expires is None:
+            return None
+        return self._auth_token, self._token_expires
+
+    def add_token_listener(self, listener: Callable[[str, datetime], None]) -> Callable[[], None]:
+        """Register a callback called with each newly acquired token and its expiry."""
+        self._token_listeners.append(listener)
+
+        def remove_listener() -> None:
+            self._token_listeners.remove(listener)
+
+        return remove_listener
+
+    def _token_valid(self) -> bool:
+        """Return True if an access token is available and not expired."""
+        if not self._auth_token:
+            return False
+        return self._token_expires is None or self._token_expires > datetime.now(timezone.utc)
+
     async def authenticate(self) -> bool:
         """Authenticate with the API and store the token."""
+        async with self._auth_lock:
+            return await self._authenticate()
+
+    async def _async_ensure_token(self, rejected_token: str | None = None) -> None:
+        """Make sure a valid token is available.
+
+        Callers racing on a missing, expired or rejected token wait on the same
+        authentication instead of each requesting a new token.
+        """
+        async with self._auth_lock:
+            if self._token_valid() and (rejected_token is None or self._auth_token != rejected_token):
+                # Another caller refreshed the token while we were waiting
+                return
+            await self._authenticate()
+
+    async def _authenticate(self) -> bool:
+        """Request a new access token, the auth lock must be held."""
         _LOGGER.info("Attempting to authenticate with RAPT.io API for user %s", self._username)
-        self._auth_token = None
-        auth_url = f"{RAPT_AUTH_URL}/connect/token"
+        auth_url = f"{self._auth_url}/connect/token"
         auth_data = {
             "client_id": "rapt-user",
             "grant_type": "password",
@@ -85,21 +433,32 @@ class RaptApiClient:
 
         try:
             # Authentication request uses form-urlencoded data
-            response = await self._request("post", auth_url, data=auth_data, is_auth=True)
-            self._auth_token = response.get("access_token")
-            expires_in = response.get("expires_in", 3600)
+            response = await self._request("post", auth_url, data=auth_data, is_auth=True, timeout=AUTH_TIMEOUT)
+            try:
+                response = TOKEN_SCHEMA(response)
+            except vol.Invalid as err:
+                _LOGGER.error("Authentication successful but no valid access token received: %s", err)
+                raise RaptAuthError("Authentication successful but no access token received") from err
+            access_token = response["access_token"]
+            expires_in = response["expires_in"]
+            self._auth_token = access_token
             self._token_expires = datetime.now(timezone.utc) + timedelta(seconds=expires_in - 60)
-            if not self._auth_token:
-                _LOGGER.error("Authentication successful but no access token received: %s", response)
-                raise RaptAuthError("Authentication successful but no access token received")
             _LOGGER.info("Authentication successful, token acquired. Expires at %s", self._token_expires)
+            self.metrics.auth_refreshes += 1
+            for listener in self._token_listeners:
+                listener(self._auth_token, self._token_expires)
+            if self._renew_token:
+                self._schedule_token_renewal()
             return True
         except RaptAuthError as err:
+            self.metrics.auth_failures += 1
             raise err
         except RaptApiError as err:
+            self.metrics.auth_failures += 1
             _LOGGER.error("Authentication failed due to API/network error: %s", err)
             raise RaptAuthError(f"Authentication failed: {err}") from err
         except Exception as err:
+            self.metrics.auth_failures += 1
             _LOGGER.exception("Unexpected error during authentication")
             raise RaptAuthError(f"An unexpected error occurred during authentication: {err}") from err
 
@@ -111,36 +470,70 @@ class RaptApiClient:
     async def _get_brewzillas_internal(self) -> list[dict]:
         """Internal method to fetch BrewZillas."""
         url = f"{self._base_url}/api/BrewZillas/GetBrewZillas"
-        response = await self._request("get", url)
-        if isinstance(response, list):
-            _LOGGER.debug("Received %d BrewZillas", len(response))
-            return response
-        else:
-            _LOGGER.error("Unexpected BrewZilla list format received: %s", response)
-            raise RaptApiError("Unexpected format for BrewZilla list")
+        response = _validate(DEVICE_LIST_SCHEMA, await self._request("get", url, hedge=True), "BrewZilla list")
+        _LOGGER.debug("Received %d BrewZillas", len(response))
+        return response
 
     async def _api_wrapper(self, func, *args, **kwargs):
         """Wrap API calls to handle token refresh."""
         try:
-            if not self._auth_token or (self._token_expires and self._token_expires < datetime.now(timezone.utc)):
+            if not self._token_valid():
                 _LOGGER.info("Token is missing or expired, re-authenticating.")
-                await self.authenticate()
-            return await func(*args, **kwargs)
-        except RaptAuthError:
-            # This might happen if the token is revoked server-side
-            _LOGGER.warning("Authentication failed, attempting to re-authenticate and retry.")
-            await self.authenticate()
-            return await func(*args, **kwargs)
+                await self._async_ensure_token()
+            token = self._auth_token
+            try:
+                return await func(*args, **kwargs)
+            except RaptAuthError:
+                # This might happen if the token is revoked server-side
+                _LOGGER.warning("Authentication failed, attempting to re-authenticate and retry.")
+                await self._async_ensure_token(rejected_token=token)
+                return await func(*args, **kwargs)
         except RaptApiError as err:
-            _LOGGER.error("API error during wrapper call: %s", err)
+            _LOGGER.debug("API error during wrapper call: %s", err)
             raise err
 
+    def _schedule_token_renewal(self) -> None:
+        """Schedule a background token renewal shortly before the token expires."""
+        self._cancel_renewal_timer()
+        remaining = (self._token_expires - datetime.now(timezone.utc)).total_seconds()
+        if remaining <= 0:
+            return
+        # Short-lived tokens are renewed halfway through their lifetime
+        delay = max(remaining - TOKEN_RENEWAL_MARGIN.total_seconds(), remaining / 2)
+        _LOGGER.debug("Scheduling token renewal in %.0f seconds", delay)
+        self._renewal_handle = asyncio.get_running_loop().call_later(delay, self._start_token_renewal)
+
+    def _start_token_renewal(self) -> None:
+        """Start the background token renewal."""
+        self._renewal_handle = None
+        self._renewal_task = asyncio.get_running_loop().create_task(self._async_renew_token())
+
+    async def _async_renew_token(self) -> None:
+        """Renew the access token, leaving on-demand authentication as fallback."""
+        try:
+            await self.authenticate()
+        except RaptApiError as err:
+            _LOGGER.warning("Background token renewal failed, will re-authenticate on next request: %s", err)
+        finally:
+            self._renewal_task = None
+
+    def _cancel_renewal_timer(self) -> None:
+        """Cancel any scheduled token renewal."""
+        if self._renewal_handle:
+            self._renewal_handle.cancel()
+            self._renewal_handle = None
+
+    def stop_token_renewal(self) -> None:
+        """Cancel scheduled and in-flight background token renewals."""
+        self._cancel_renewal_timer()
+        if self._renewal_task:
+            self._renewal_task.cancel()
+            self._renewal_task = None
+
     async def close(self) -> None:
         """Close the underlying session if it wasn't passed in."""
-        if self._session and not isinstance(self._session, aiohttp.ClientSession):
-            # If session was passed in, caller is responsible for closing
-            pass
-        elif self._session:
+        self.stop_token_renewal()
+        if self._session and self._owns_session:
             await self._session.close()
             _LOGGER.debug("Closed internal aiohttp session")
 
@@ -160,13 +553,9 @@ class RaptApiClient:
     async def _get_bonded_devices_internal(self) -> list[dict]:
         """Internal method to fetch Bonded Devices."""
         url = f"{self._base_url}/api/BondedDevices/GetBondedDevices"
-        response = await self._request("get", url)
-        if isinstance(response, list):
-            _LOGGER.debug("Received %d Bonded Devices", len(response))
-            return response
-        else:
-            _LOGGER.error("Unexpected Bonded Device list format received: %s", response)
-            raise RaptApiError("Unexpected format for Bonded Device list")
+        response = _validate(DEVICE_LIST_SCHEMA, await self._request("get", url, hedge=True), "Bonded Device list")
+        _LOGGER.debug("Received %d Bonded Devices", len(response))
+        return response
 
     async def get_hydrometers(self) -> list[dict]:
         """Fetch the list of Hydrometer devices from the API."""
@@ -176,10 +565,36 @@ class RaptApiClient:
     async def _get_hydrometers_internal(self) -> list[dict]:
         """Internal method to fetch Hydrometers."""
         url = f"{self._base_url}/api/Hydrometers/GetHydrometers"
-        response = await self._request("get", url)
-        if isinstance(response, list):
-            _LOGGER.debug("Received %d Hydrometers", len(response))
-            return response
-        else:
-            _LOGGER.error("Unexpected Hydrometer list format received: %s", response)
-            raise RaptApiError("Unexpected format for Hydrometer list")
+        response = _validate(DEVICE_LIST_SCHEMA, await self._request("get", url, hedge=True), "Hydrometer list")
+        _LOGGER.debug("Received %d Hydrometers", len(response))
+        return response
+
+    async def get_brewzilla_telemetry(self, brewzilla_id: str, start: datetime, end: datetime) -> list[dict]:
+        """Fetch the telemetry of a BrewZilla between two dates."""
+        return await self._api_wrapper(
+            self._get_telemetry_internal, "BrewZillas", {"brewZillaId": brewzilla_id}, start, end
+        )
+
+    async def get_bonded_device_telemetry(self, bonded_device_id: str, start: datetime, end: datetime) -> list[dict]:
+        """Fetch the telemetry of a Bonded device between two dates."""
+        return await self._api_wrapper(
+            self._get_telemetry_internal, "BondedDevices", {"bondedDeviceId": bonded_device_id}, start, end
+        )
+
+    async def get_hydrometer_telemetry(self, hydrometer_id: str, start: datetime, end: datetime) -> list[dict]:
+        """Fetch the telemetry of a Hydrometer between two dates."""
+        return await self._api_wrapper(
+            self._get_telemetry_internal, "Hydrometers", {"hydrometerId": hydrometer_id}, start, end
+        )
+
+    async def _get_telemetry_internal(self, resource: str, params: dict, start: datetime, end: datetime) -> list[dict]:
+        """Internal method to fetch device telemetry."""
+        url = f"{self._base_url}/api/{resource}/GetTelemetry"
+        params = {**params, "startDate": start.isoformat(), "endDate": end.isoformat()}
+        response = _validate(
+            TELEMETRY_SCHEMA,
+            await self._request("get", url, params=params, timeout=TELEMETRY_TIMEOUT),
+            f"{resource} telemetry",
+        )
+        _LOGGER.debug("Received %d %s telemetry points", len(response), resource)
+        return response
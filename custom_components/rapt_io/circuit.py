@@ -0,0 +1,92 @@
+"""Per-endpoint circuit breaker for the RAPT.io integration."""
+
+import logging
+from datetime import datetime, timedelta
+
+_LOGGER = logging.getLogger(__name__)
+
+# Consecutive failures opening the circuit
+FAILURE_THRESHOLD = 3
+
+# Delay before probing an open circuit, doubled after each failed probe
+PROBE_INTERVAL = timedelta(minutes=1)
+MAX_PROBE_INTERVAL = timedelta(minutes=15)
+
+
+class CircuitBreaker:
+    """Stop polling an endpoint that keeps failing and probe it at a reduced rate.
+
+    An outage is logged once when the circuit opens and once, with a summary,
+    when the endpoint answers again.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize a closed circuit."""
+        self.name = name
+        self.failures = 0
+        self._outage_start: datetime | None = None
+        self._probe_interval = PROBE_INTERVAL
+        self._next_probe: datetime | None = None
+        self._last_error: str | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while requests to the endpoint are held back."""
+        return self._next_probe is not None
+
+    @property
+    def next_probe(self) -> datetime | None:
+        """Return when the open circuit lets the next request through."""
+        return self._next_probe
+
+    def allow_request(self, now: datetime) -> bool:
+        """Return True if the endpoint may be requested."""
+        return self._next_probe is None or now >= self._next_probe
+
+    def record_success(self, now: datetime) -> None:
+        """Close the circuit."""
+        if self._outage_start is not None:
+            _LOGGER.info(
+                "%s recovered after %d failed requests over %s",
+                self.name,
+                self.failures,
+                now - self._outage_start,
+            )
+        self.failures = 0
+        self._outage_start = None
+        self._probe_interval = PROBE_INTERVAL
+        self._next_probe = None
+        self._last_error = None
+
+    def record_failure(self, now: datetime, error: Exception) -> None:
+        """Count a failure, opening the circuit after repeated failures."""
+        self.failures += 1
+        self._last_error = str(error)
+        if self._outage_start is None:
+            self._outage_start = now
+        if self.is_open:
+            # Failed probe, back off further
+            self._probe_interval = min(self._probe_interval * 2, MAX_PROBE_INTERVAL)
+        elif self.failures < FAILURE_THRESHOLD:
+            _LOGGER.debug("%s failed (%d in a row): %s", self.name, self.failures, error)
+            return
+        else:
+            _LOGGER.warning(
+                "%s is failing (%s), probing it every %s to %s until it recovers",
+                self.name,
+                error,
+                PROBE_INTERVAL,
+                MAX_PROBE_INTERVAL,
+            )
+        self._next_probe = now + self._probe_interval
+
+    @property
+    def state(self) -> dict:
+        """Return the circuit state."""
+        return {
+            "open": self.is_open,
+            "failures": self.failures,
+            "outage_start": self._outage_start.isoformat() if self._outage_start else None,
+            "next_probe": self._next_probe.isoformat() if self._next_probe else None,
+            "last_error": self._last_error,
+        }
@@ -1,6 +1,8 @@
 """Config flow for RAPT.io integration."""
 
+import asyncio
 import logging
+import secrets
 
 import voluptuous as vol
 
@@ -12,12 +14,29 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 # Import your API client and exceptions here later
 from .api import RaptApiClient, RaptApiError, RaptAuthError
 from .const import (
+    CONF_ADAPTIVE_POLLING,
     CONF_API_KEY,
+    CONF_HEDGE_PERCENTILE,
+    CONF_MAX_STALE_AGE,
+    CONF_REQUEST_BUDGET,
     CONF_UPDATE_INTERVAL,
+    CONF_WEBHOOK,
+    CONF_WEBHOOK_SECRET,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_HEDGE_PERCENTILE,
+    DEFAULT_MAX_STALE_AGE,
+    DEFAULT_REQUEST_BUDGET,
     DEFAULT_UPDATE_INTERVAL,
+    DEFAULT_WEBHOOK,
     DOMAIN,
+    ENDPOINT_BONDED_DEVICES,
+    ENDPOINT_BREWZILLAS,
+    ENDPOINT_HYDROMETERS,
+    MAX_HEDGE_PERCENTILE,
+    MIN_REQUEST_BUDGET,
     MIN_UPDATE_INTERVAL,
 )
+from .registry import RaptSetupSeed, account_key, async_get_client_registry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,10 +48,12 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
 )
 
 
-async def validate_input(hass: HomeAssistant, data: dict) -> dict[str, str]:
+async def validate_input(hass: HomeAssistant, data: dict) -> dict:
     """Validate the user input allows us to connect.
 
-    Data has the keys from STEP_USER_DATA_SCHEMA.
+    Data has the keys from STEP_USER_DATA_SCHEMA. The token and the device lists
+    that could be fetched are returned as a seed, so the entry setup doesn't
+    fetch them again.
     """
     api_client = RaptApiClient(
         username=data[CONF_USERNAME],
@@ -41,17 +62,52 @@ async def validate_input(hass: HomeAssistant, data: dict) -> dict[str, str]:
     )
 
     await api_client.authenticate()
-    # After successful auth, fetch devices to check connectivity and get a unique ID
-    devices = await api_client.get_brewzillas()
+    # After successful auth, fetch all devices to check connectivity and get a unique ID.
+    # A list that fails is left to the first update of the coordinator.
+    endpoints = (ENDPOINT_BREWZILLAS, ENDPOINT_BONDED_DEVICES, ENDPOINT_HYDROMETERS)
+    results = await asyncio.gather(
+        api_client.get_brewzillas(),
+        api_client.get_bonded_devices(),
+        api_client.get_hydrometers(),
+        return_exceptions=True,
+    )
+    device_lists = {}
+    errors = []
+    for endpoint, result in zip(endpoints, results, strict=True):
+        if isinstance(result, BaseException):
+            _LOGGER.debug("Failed to fetch the %s device list: %s", endpoint, result)
+            errors.append(result)
+        else:
+            device_lists[endpoint] = result
+    if auth_error := next((err for err in errors if isinstance(err, RaptAuthError)), None):
+        raise auth_error
+    if unexpected := next((err for err in errors if not isinstance(err, RaptApiError)), None):
+        raise unexpected
+
+    devices = [
+        device
+        for endpoint in (ENDPOINT_BREWZILLAS, ENDPOINT_HYDROMETERS, ENDPOINT_BONDED_DEVICES)
+        for device in device_lists.get(endpoint, [])
+        if device.get("id")
+    ]
     if not devices:
+        if errors:
+            # The devices may be in the lists that failed
+            raise errors[0]
         # No devices associated with account
         raise ValueError("no_devices")
 
-    # Use the first device's ID as the unique ID for the config entry
-    # This assumes the user only cares about one Brewzilla, or that one account = one Brewzilla
-    # A more complex integration might allow selecting a device.
+    # Use the first device's ID as the unique ID for the config entry, preferring
+    # a BrewZilla to keep the unique ID of existing BrewZilla accounts
     unique_id = devices[0]["id"]
-    return {"title": f"RAPT.io ({data[CONF_USERNAME]})", "unique_id": unique_id}
+    # The token is only reused if it has not expired yet
+    access_token, token_expires = api_client.token or (None, None)
+    seed = RaptSetupSeed(
+        access_token=access_token,
+        token_expires=token_expires,
+        device_lists=device_lists,
+    )
+    return {"title": f"RAPT.io ({data[CONF_USERNAME]})", "unique_id": unique_id, "seed": seed}
 
 
 class RaptConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -68,11 +124,17 @@ class RaptConfigFlow(ConfigFlow, domain=DOMAIN):
         """Handle the initial step."""
         errors = {}
         if user_input is not None:
+            # Entries of an account share one API client, configured by the first of them
+            account = account_key(user_input[CONF_USERNAME])
+            if any(account_key(entry.data[CONF_USERNAME]) == account for entry in self._async_current_entries()):
+                return self.async_abort(reason="already_configured")
             try:
                 info = await validate_input(self.hass, user_input)
                 await self.async_set_unique_id(info["unique_id"])
                 self._abort_if_unique_id_configured()
 
+                if (seed := info.get("seed")) is not None:
+                    async_get_client_registry(self.hass).async_add_seed(user_input[CONF_USERNAME], seed)
                 return self.async_create_entry(title=info["title"], data=user_input)
             except RaptAuthError as err:
                 _LOGGER.warning("Authentication failed: %s", err)
@@ -113,6 +175,30 @@ class RaptOptionsFlowHandler(OptionsFlow):
                         CONF_UPDATE_INTERVAL,
                         default=self.config_entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
                     ): vol.All(vol.Coerce(int), vol.Range(min=MIN_UPDATE_INTERVAL)),
+                    vol.Optional(
+                        CONF_ADAPTIVE_POLLING,
+                        default=self.config_entry.options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING),
+                    ): bool,
+                    vol.Optional(
+                        CONF_REQUEST_BUDGET,
+                        default=self.config_entry.options.get(CONF_REQUEST_BUDGET, DEFAULT_REQUEST_BUDGET),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=MIN_REQUEST_BUDGET)),
+                    vol.Optional(
+                        CONF_HEDGE_PERCENTILE,
+                        default=self.config_entry.options.get(CONF_HEDGE_PERCENTILE, DEFAULT_HEDGE_PERCENTILE),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=MAX_HEDGE_PERCENTILE)),
+                    vol.Optional(
+                        CONF_MAX_STALE_AGE,
+                        default=self.config_entry.options.get(CONF_MAX_STALE_AGE, DEFAULT_MAX_STALE_AGE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_WEBHOOK,
+                        default=self.config_entry.options.get(CONF_WEBHOOK, DEFAULT_WEBHOOK),
+                    ): bool,
+                    vol.Optional(
+                        CONF_WEBHOOK_SECRET,
+                        default=self.config_entry.options.get(CONF_WEBHOOK_SECRET) or secrets.token_urlsafe(24),
+                    ): vol.All(str, vol.Length(min=16)),
                 }
             ),
         )
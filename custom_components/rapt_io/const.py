@@ -4,7 +4,43 @@ DOMAIN = "rapt_io"
 
 CONF_API_KEY = "api_key"
 
+# hass.data key of the API clients shared between config entries
+DATA_CLIENT_REGISTRY = f"{DOMAIN}_client_registry"
+DATA_POLL_SCHEDULER = f"{DOMAIN}_poll_scheduler"
+DATA_PROFILE_SESSION = f"{DOMAIN}_profile_session"
+
 CONF_UPDATE_INTERVAL = "update_interval"
 DEFAULT_UPDATE_INTERVAL = 60  # seconds
 
 MIN_UPDATE_INTERVAL = 10  # seconds
+
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+DEFAULT_ADAPTIVE_POLLING = True
+
+CONF_REQUEST_BUDGET = "request_budget"
+DEFAULT_REQUEST_BUDGET = 30  # requests per minute
+MIN_REQUEST_BUDGET = 1  # requests per minute
+
+CONF_HEDGE_PERCENTILE = "hedge_percentile"
+DEFAULT_HEDGE_PERCENTILE = 95  # slower list requests are duplicated, 0 disables hedging
+MAX_HEDGE_PERCENTILE = 99.9
+
+CONF_MAX_STALE_AGE = "max_stale_age"
+DEFAULT_MAX_STALE_AGE = 900  # seconds, devices of a failing endpoint are served stale this long
+
+CONF_WEBHOOK = "webhook"
+DEFAULT_WEBHOOK = False
+CONF_WEBHOOK_SECRET = "webhook_secret"
+
+# Polling interval reconciling the device lists while telemetry is pushed to the webhook
+RECONCILE_UPDATE_INTERVAL = 900  # seconds
+
+# Adaptive polling intervals
+ACTIVE_UPDATE_INTERVAL = 15  # seconds, while a device is active
+IDLE_UPDATE_INTERVAL = 600  # seconds, when no device reported recently
+
+# Device list endpoints polled by the coordinator
+ENDPOINT_BREWZILLAS = "brewzillas"
+ENDPOINT_BONDED_DEVICES = "bonded_devices"
+ENDPOINT_HYDROMETERS = "hydrometers"
+ENDPOINTS = (ENDPOINT_BREWZILLAS, ENDPOINT_BONDED_DEVICES, ENDPOINT_HYDROMETERS)
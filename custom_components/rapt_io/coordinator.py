@@ -1,66 +1,485 @@
 """DataUpdateCoordinator for the RAPT.io integration."""
 
+import asyncio
+import contextlib
 import logging
-from datetime import timedelta
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import fields, replace
+from datetime import datetime, timedelta
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 # Import API client and exceptions
-from .api import RaptApiClient, RaptApiError, RaptAuthError
-from .const import DOMAIN
+from .api import RaptApiClient, RaptApiError, RaptAuthError, RaptConnectionError
+from .circuit import CircuitBreaker
+from .const import (
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MAX_STALE_AGE,
+    DOMAIN,
+    ENDPOINT_BONDED_DEVICES,
+    ENDPOINT_BREWZILLAS,
+    ENDPOINT_HYDROMETERS,
+    ENDPOINTS,
+    MIN_UPDATE_INTERVAL,
+)
+from .fermentation import FermentationTracker
+from .history import RaptReading
+from .metrics import LatencyHistogram
+from .models import RaptDevice, RaptHydrometer, parse_devices
+from .polling import AdaptivePollPlanner
+from .scheduler import RaptPollSlot
 
 _LOGGER = logging.getLogger(__name__)
 
-# Define update interval (adjust as needed, consider API rate limits)
+# Endpoints due within this margin are polled in the current cycle
+POLL_TOLERANCE = timedelta(seconds=2)
+
+# Time an update cycle waits for the device lists, slower ones carry over to the next cycle
+POLL_CYCLE_DEADLINE = 20  # seconds
 
 
 class RaptDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching RAPT.io data."""
 
-    def __init__(self, hass: HomeAssistant, client: RaptApiClient, update_interval: int) -> None:
-        """Initialize global RAPT data updater."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: RaptApiClient,
+        update_interval: int,
+        adaptive_polling: bool = DEFAULT_ADAPTIVE_POLLING,
+        max_stale_age: int = DEFAULT_MAX_STALE_AGE,
+        poll_slot: RaptPollSlot | None = None,
+    ) -> None:
+        """Initialize global RAPT data updater.
+
+        The devices of a failing endpoint are served from its last successful
+        response, flagged as stale, for up to max_stale_age seconds. The poll
+        slot, if any, spreads the polls of the config entries of the domain.
+        """
         self.client = client
-        self.devices = []  # Store device list
+        self.poll_slot = poll_slot
+        self.devices: list[RaptDevice] = []  # Store device list
+        # Last successfully fetched device list, its fetch time and next poll time of each endpoint
+        self._endpoint_devices: dict[str, list[RaptDevice]] = {}
+        self._endpoint_fetched: dict[str, datetime] = {}
+        self._next_poll: dict[str, datetime] = {}
+        self._planner = AdaptivePollPlanner(update_interval, adaptive_polling)
+        self.max_stale_age = max_stale_age
+        # Endpoints whose last request failed, with the error
+        self.failed_endpoints: set[str] = set()
+        self._endpoint_errors: dict[str, Exception] = {}
+        # Devices of the cached device list, until they are fetched
+        self._restored_devices: dict[str, RaptDevice] = {}
+        # Device lists obtained elsewhere, e.g. by the config flow, used instead of the next fetch
+        self._seed: dict[str, list[dict]] = {}
+        # Fetches that missed the deadline of their cycle, their result is used by the next cycle
+        self._late_fetches: dict[str, asyncio.Future] = {}
+        # Fermentation of the batch in each hydrometer, fed with its readings
+        self.fermentation: dict[str, FermentationTracker] = {}
+        # Shared secret of the webhook telemetry is pushed to, None without a webhook
+        self.webhook_secret: str | None = None
+        self.breakers = {endpoint: CircuitBreaker(f"RAPT.io {endpoint} endpoint") for endpoint in ENDPOINTS}
+        # Devices whose payload changed (or disappeared) during the last update cycle
+        self.changed_devices: set[str] = set()
+        # Endpoint of each device known to the account, devices of a failing
+        # endpoint stay known (and unavailable) until the endpoint answers again
+        self._known_devices: dict[str, str] = {}
+        # Devices added to and removed from the account during the last update cycle
+        self.new_devices: set[str] = set()
+        self.removed_devices: set[str] = set()
+        # Listeners without a device context are called on every update,
+        # device listeners only when their device changed
+        self._coordinator_listeners: list[CALLBACK_TYPE] = []
+        self._device_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self._notified_update_success = True
+        # Duration of the update cycles, including retries and backoff
+        self.poll_cycle_duration = LatencyHistogram()
+        self.last_poll_cycle_duration: float | None = None
+        # Called with the duration of each update cycle, e.g. by a profiling session
+        self._cycle_listeners: list[Callable[[float], None]] = []
 
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
             update_interval=timedelta(seconds=update_interval),
+            # Skip notifying listeners when no device changed at all
+            always_update=False,
         )
 
-    async def _async_update_data(self) -> dict:
-        """Fetch data from API endpoint.
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE, context: str | None = None) -> Callable[[], None]:
+        """Listen for data updates, for a single device if context is a device ID."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        if context is None:
+            listeners = self._coordinator_listeners
+        else:
+            listeners = self._device_listeners.setdefault(context, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_indexed_listener() -> None:
+            """Remove update listener."""
+            remove_listener()
+            listeners.remove(update_callback)
+            if context is not None and not listeners:
+                del self._device_listeners[context]
+
+        return remove_indexed_listener
+
+    @callback
+    def async_add_cycle_listener(self, listener: Callable[[float], None]) -> Callable[[], None]:
+        """Listen for the end of update cycles, whether they succeeded or not."""
+        self._cycle_listeners.append(listener)
 
-        This is the place to fetch data from your API service.
+        @callback
+        def remove_cycle_listener() -> None:
+            """Remove cycle listener."""
+            self._cycle_listeners.remove(listener)
+
+        return remove_cycle_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update coordinator listeners and the listeners of changed devices.
+
+        All device listeners are updated when the update success state flips.
+        """
+        for update_callback in list(self._coordinator_listeners):
+            update_callback()
+
+        if self.last_update_success != self._notified_update_success:
+            self._notified_update_success = self.last_update_success
+            device_ids = list(self._device_listeners)
+        else:
+            device_ids = self.changed_devices
+        for device_id in device_ids:
+            for update_callback in list(self._device_listeners.get(device_id, ())):
+                update_callback()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the fetches that missed their cycle deadline."""
+        await super().async_shutdown()
+        for fetch in self._late_fetches.values():
+            fetch.cancel()
+        self._late_fetches.clear()
+
+    @callback
+    def async_update_polling(self, update_interval: int, adaptive_polling: bool) -> None:
+        """Apply new polling options, all endpoints are polled on the next cycle."""
+        self._planner.base_interval = update_interval
+        self._planner.adaptive = adaptive_polling
+        self._next_poll.clear()
+        self.update_interval = timedelta(seconds=update_interval)
+
+    @property
+    def endpoint_devices(self) -> dict[str, list[RaptDevice]]:
+        """Return the devices known to each endpoint, including the unavailable ones."""
+        devices: dict[str, list[RaptDevice]] = {}
+        for device_id, endpoint in self._known_devices.items():
+            if (device := (self.data or {}).get(device_id)) is None:
+                device = self._restored_devices.get(device_id)
+            if device is not None:
+                devices.setdefault(endpoint, []).append(device)
+        return devices
+
+    @callback
+    def async_restore(self, endpoint_devices: dict[str, list[RaptDevice]]) -> None:
+        """Know the devices of a cached device list before the first refresh.
+
+        The restored devices are not served as data, their entities restore
+        their last state instead. The first refresh then only reports the
+        devices added or removed since.
+        """
+        for endpoint, devices in endpoint_devices.items():
+            for device in devices:
+                self._known_devices[device.id] = endpoint
+                self._restored_devices[device.id] = device
+        self.devices = [device for devices in endpoint_devices.values() for device in devices]
+
+    @callback
+    def async_seed(self, device_lists: dict[str, list[dict]]) -> None:
+        """Use already fetched device lists instead of fetching them on the next update."""
+        self._seed = dict(device_lists)
+
+    @callback
+    def async_push(self, points: list[tuple[str, dict]]) -> None:
+        """Merge pushed telemetry, (device ID, snapshot fields) pairs, into the device data.
+
+        Points of unknown devices and points older than the current data are
+        ignored, the next poll reconciles them. The poll schedule is unchanged.
+        """
+        data = dict(self.data or {})
+        changed = set()
+        for device_id, values in points:
+            if (device := data.get(device_id)) is None:
+                _LOGGER.debug("Ignoring pushed telemetry of unknown device %s", device_id)
+                continue
+            pushed_at = values.get("last_activity")
+            if pushed_at and device.last_activity and pushed_at < device.last_activity:
+                _LOGGER.debug("Ignoring out of order telemetry of %s", device_id)
+                continue
+            device_fields = {field.name for field in fields(device)}
+            updated = replace(
+                device, stale=False, **{name: value for name, value in values.items() if name in device_fields}
+            )
+            if updated != device:
+                data[device_id] = updated
+                changed.add(device_id)
+        if not changed:
+            return
+        self._endpoint_devices = {
+            endpoint: [data.get(device.id, device) for device in devices]
+            for endpoint, devices in self._endpoint_devices.items()
+        }
+        self.devices = [data.get(device.id, device) for device in self.devices]
+        self.changed_devices = changed
+        self.new_devices = set()
+        self.removed_devices = set()
+        self._track_fermentation(data)
+        self.data = data
+        self.async_update_listeners()
+
+    def _fetchers(self) -> dict[str, Callable[[], Awaitable[list[dict]]]]:
+        """Return the client method fetching the device list of each endpoint."""
+        return {
+            ENDPOINT_BREWZILLAS: self.client.get_brewzillas,
+            ENDPOINT_BONDED_DEVICES: self.client.get_bonded_devices,
+            ENDPOINT_HYDROMETERS: self.client.get_hydrometers,
+        }
+
+    async def async_fetch_raw(self, device_id: str) -> dict | None:
+        """Fetch the raw API payload of a device, e.g. for diagnostics."""
+        for endpoint, fetch in self._fetchers().items():
+            if any(device.id == device_id for device in self._endpoint_devices.get(endpoint, ())):
+                return next((payload for payload in await fetch() if payload.get("id") == device_id), None)
+        return None
+
+    def _update_membership(self, endpoint: str, devices: list[RaptDevice]) -> None:
+        """Record the devices an endpoint answered with, detecting added and removed devices."""
+        device_ids = {device.id for device in devices}
+        removed = {
+            device_id
+            for device_id, known_endpoint in self._known_devices.items()
+            if known_endpoint == endpoint and device_id not in device_ids
+        }
+        for device_id in removed:
+            del self._known_devices[device_id]
+        for device_id in device_ids | removed:
+            self._restored_devices.pop(device_id, None)
+        new = device_ids - self._known_devices.keys()
+        self._known_devices.update(dict.fromkeys(new, endpoint))
+        self.new_devices |= new
+        self.removed_devices |= removed
+        self._planner.forget(removed)
+        for device_id in removed:
+            self.fermentation.pop(device_id, None)
+        if new or removed:
+            _LOGGER.debug("Devices on %s: %d added, %d removed", endpoint, len(new), len(removed))
+
+    def fermentation_tracker(self, device_id: str) -> FermentationTracker:
+        """Return the fermentation tracker of a hydrometer."""
+        if (tracker := self.fermentation.get(device_id)) is None:
+            tracker = self.fermentation[device_id] = FermentationTracker()
+        return tracker
+
+    @callback
+    def async_restore_readings(self, readings: list[RaptReading]) -> None:
+        """Feed the gravity readings stored before a restart to the fermentation trackers.
+
+        Readings are ordered by device and time.
+        """
+        for reading in readings:
+            if reading.gravity is not None:
+                self.fermentation_tracker(reading.device_id).add(reading.time, reading.gravity)
+
+    def _track_fermentation(self, data: dict[str, RaptDevice]) -> None:
+        """Feed the new readings of the changed hydrometers to their fermentation trackers."""
+        for device_id in self.changed_devices:
+            device = data.get(device_id)
+            if isinstance(device, RaptHydrometer) and device.gravity is not None and device.last_activity is not None:
+                self.fermentation_tracker(device_id).add(device.last_activity, device.gravity)
+
+    @callback
+    def _async_update_device_registry(self, previous_data: dict[str, RaptDevice], data: dict[str, RaptDevice]) -> None:
+        """Remove the devices gone from the account and refresh changed device metadata."""
+        if self.config_entry is None:
+            return
+        device_registry = dr.async_get(self.hass)
+        for device_id in self.removed_devices:
+            if device_entry := device_registry.async_get_device(identifiers={(DOMAIN, device_id)}):
+                _LOGGER.info("Removing device %s, it is no longer part of the account", device_entry.name)
+                # Also removes the entities of the device
+                device_registry.async_update_device(device_entry.id, remove_config_entry_id=self.config_entry.entry_id)
+
+        for device_id in self.changed_devices - self.new_devices:
+            device = data.get(device_id)
+            previous = previous_data.get(device_id)
+            if device is None or previous is None:
+                continue
+            if (device.name, device.firmware_version) == (previous.name, previous.firmware_version):
+                continue
+            if device_entry := device_registry.async_get_device(identifiers={(DOMAIN, device_id)}):
+                device_registry.async_update_device(
+                    device_entry.id, name=device.name, sw_version=device.firmware_version
+                )
+
+    async def _async_update_data(self) -> dict[str, RaptDevice]:
+        """Fetch data from API endpoint, timing the update cycle."""
+        async with self.poll_slot or contextlib.nullcontext():
+            start = time.monotonic()
+            try:
+                return await self._async_fetch_devices()
+            finally:
+                self.last_poll_cycle_duration = time.monotonic() - start
+                self.poll_cycle_duration.observe(self.last_poll_cycle_duration)
+                for listener in list(self._cycle_listeners):
+                    listener(self.last_poll_cycle_duration)
+
+    async def _async_fetch_devices(self) -> dict[str, RaptDevice]:
+        """Fetch the device lists.
+
+        Each device list endpoint has its own schedule and only the endpoints
+        that are due are fetched, concurrently. A failing endpoint only affects
+        its own devices, which are served stale until they are too old; the
+        update fails when no endpoint has devices to serve. Endpoints that keep
+        failing are only probed at the rate their circuit breaker allows. Device
+        lists that miss the cycle deadline are served stale and their response
+        is used by the next cycle.
         """
         _LOGGER.debug("Starting data update cycle")
-        try:
-            # 1. Get the list of devices (if not already stored)
-            brewzillas = await self.client.get_brewzillas()
-            bonded_devices = await self.client.get_bonded_devices()
-            hydrometers = await self.client.get_hydrometers()
-            self.devices = brewzillas + bonded_devices + hydrometers
-
-            all_devices_data = {}
-            for device in self.devices:
-                device_id = device.get("id")
-                if device_id:
-                    all_devices_data[device_id] = device
-
-            _LOGGER.debug("Updated data for %d devices", len(all_devices_data))
-            return all_devices_data
-
-        except RaptAuthError as err:
-            # Authentication errors likely require re-configuration
-            _LOGGER.error("Authentication error during update: %s", err)
-            # Trigger re-authentication flow? Or just raise UpdateFailed?
-            # For now, treat as a failure to update.
-            raise UpdateFailed(f"Authentication error: {err}") from err
-        except RaptApiError as err:
-            _LOGGER.error("API error during update: %s", err)
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
-        except Exception as err:
-            _LOGGER.exception("Unexpected error during data update")
+        self.changed_devices = set()
+        self.new_devices = set()
+        self.removed_devices = set()
+        now = dt_util.utcnow()
+        fetchers = self._fetchers()
+        due = {
+            endpoint: fetch
+            for endpoint, fetch in fetchers.items()
+            if endpoint not in self._next_poll or self._next_poll[endpoint] <= now + POLL_TOLERANCE
+        }
+        if not due:
+            # Manually requested refresh
+            due = fetchers
+        for endpoint in list(due):
+            if not (breaker := self.breakers[endpoint]).allow_request(now):
+                # Probed again once its circuit allows it
+                self._next_poll[endpoint] = breaker.next_probe
+                del due[endpoint]
+        due.update((endpoint, fetchers[endpoint]) for endpoint in self._late_fetches)
+        seeded = {endpoint: self._seed.pop(endpoint) for endpoint in due if endpoint in self._seed}
+        results = await self._async_wait_for_fetches(
+            {
+                endpoint: self._late_fetches.pop(endpoint, None) or asyncio.ensure_future(fetch())
+                for endpoint, fetch in due.items()
+                if endpoint not in seeded
+            }
+        )
+        results.update(seeded)
+        self._seed.clear()
+
+        for endpoint in due:
+            if endpoint not in results:
+                # Serve its devices stale, the next cycle uses the late response
+                self.failed_endpoints.add(endpoint)
+                self._endpoint_errors[endpoint] = RaptConnectionError(
+                    f"No response within {POLL_CYCLE_DEADLINE} seconds"
+                )
+                self._next_poll[endpoint] = now
+                continue
+            result = results[endpoint]
+            breaker = self.breakers[endpoint]
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result
+            if isinstance(result, Exception):
+                if not isinstance(result, RaptApiError):
+                    _LOGGER.error("Unexpected error fetching %s", endpoint, exc_info=result)
+                breaker.record_failure(now, result)
+                self.failed_endpoints.add(endpoint)
+                self._endpoint_errors[endpoint] = result
+                self._next_poll[endpoint] = breaker.next_probe or now + timedelta(seconds=self._planner.base_interval)
+            else:
+                breaker.record_success(now)
+                self.failed_endpoints.discard(endpoint)
+                self._endpoint_errors.pop(endpoint, None)
+                devices = parse_devices(result)
+                self._endpoint_devices[endpoint] = devices
+                self._endpoint_fetched[endpoint] = now
+                self._update_membership(endpoint, devices)
+                self._next_poll[endpoint] = now + timedelta(seconds=self._planner.next_interval(devices, now))
+
+        # The next refresh is scheduled from the end of the cycle, not its start
+        completed = dt_util.utcnow()
+        next_poll = min(self._next_poll.values(), default=now + timedelta(seconds=self._planner.base_interval))
+        delay = max((next_poll - completed).total_seconds(), MIN_UPDATE_INTERVAL)
+        if self.poll_slot is not None:
+            delay = self.poll_slot.schedule(completed, delay)
+        self.update_interval = timedelta(seconds=delay)
+        _LOGGER.debug("Next poll in %s", self.update_interval)
+
+        self.devices = [device for endpoint in fetchers for device in self._served_devices(endpoint, now)]
+
+        if not self.devices and self.failed_endpoints.issuperset(fetchers):
+            # The data is kept on failure, drop it so the entities become unavailable
+            self.changed_devices = set(self.data or {})
+            self.data = {}
+            err = next(iter(self._endpoint_errors.values()))
+            if isinstance(err, RaptAuthError):
+                # Authentication errors likely require re-configuration
+                raise UpdateFailed(f"Authentication error: {err}") from err
+            if isinstance(err, RaptApiError):
+                raise UpdateFailed(f"Error communicating with API: {err}") from err
             raise UpdateFailed(f"Unexpected error: {err}") from err
+
+        all_devices_data = {device.id: device for device in self.devices}
+
+        previous_data = self.data or {}
+        self.changed_devices = {
+            device_id for device_id, device in all_devices_data.items() if previous_data.get(device_id) != device
+        }
+        self.changed_devices.update(previous_data.keys() - all_devices_data.keys())
+        self._async_update_device_registry(previous_data, all_devices_data)
+        self._track_fermentation(all_devices_data)
+
+        _LOGGER.debug("Updated data for %d devices, %d changed", len(all_devices_data), len(self.changed_devices))
+        return all_devices_data
+
+    async def _async_wait_for_fetches(
+        self, fetches: dict[str, asyncio.Future]
+    ) -> dict[str, list[dict] | BaseException]:
+        """Return the results of the fetches done within the cycle deadline, keeping the others for the next cycle."""
+        if fetches:
+            await asyncio.wait(fetches.values(), timeout=POLL_CYCLE_DEADLINE)
+        results: dict[str, list[dict] | BaseException] = {}
+        for endpoint, fetch in fetches.items():
+            if not fetch.done():
+                _LOGGER.debug("%s missed the %s seconds poll cycle deadline", endpoint, POLL_CYCLE_DEADLINE)
+                # Retrieve the exception in case the fetch is never used
+                fetch.add_done_callback(lambda done: done.cancelled() or done.exception())
+                self._late_fetches[endpoint] = fetch
+            else:
+                results[endpoint] = fetch.exception() or fetch.result()
+        return results
+
+    def _served_devices(self, endpoint: str, now: datetime) -> list[RaptDevice]:
+        """Return the devices of an endpoint, flagged as stale while it fails."""
+        devices = self._endpoint_devices.get(endpoint, [])
+        if endpoint not in self.failed_endpoints or not devices:
+            return devices
+        if now - self._endpoint_fetched[endpoint] > timedelta(seconds=self.max_stale_age):
+            _LOGGER.debug(
+                "Devices of %s are older than %s seconds, no longer serving them", endpoint, self.max_stale_age
+            )
+            del self._endpoint_devices[endpoint]
+            return []
+        return [device if device.stale else replace(device, stale=True) for device in devices]
+
+    def endpoint_age(self, endpoint: str) -> timedelta | None:
+        """Return the age of the devices served for an endpoint."""
+        if (fetched := self._endpoint_fetched.get(endpoint)) is None:
+            return None
+        return dt_util.utcnow() - fetched
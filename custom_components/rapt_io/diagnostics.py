@@ -0,0 +1,85 @@
+"""Diagnostics support for the RAPT.io integration."""
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntry
+
+from .api import RaptApiError
+from .const import CONF_API_KEY, CONF_WEBHOOK_SECRET, DOMAIN
+from .coordinator import RaptDataUpdateCoordinator
+from .scheduler import async_get_poll_scheduler
+
+# The webhook ID is the push URL, with the secret it allows pushing telemetry. The entry title
+# contains the username and its unique ID is the ID of a device of the account.
+TO_REDACT = {
+    CONF_API_KEY,
+    "username",
+    "access_token",
+    "password",
+    "title",
+    "unique_id",
+    CONF_WEBHOOK_ID,
+    CONF_WEBHOOK_SECRET,
+}
+
+
+def _coordinator_diagnostics(coordinator: RaptDataUpdateCoordinator) -> dict[str, Any]:
+    """Return the state of the coordinator."""
+    next_poll = coordinator.poll_slot.next_poll if coordinator.poll_slot else None
+    return {
+        "last_update_success": coordinator.last_update_success,
+        "update_interval": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+        "failed_endpoints": sorted(coordinator.failed_endpoints),
+        "endpoints": {
+            endpoint: {
+                "age": age.total_seconds() if (age := coordinator.endpoint_age(endpoint)) else None,
+                "circuit": breaker.state,
+            }
+            for endpoint, breaker in coordinator.breakers.items()
+        },
+        "next_scheduled_poll": next_poll.isoformat() if next_poll else None,
+        "last_poll_cycle_duration": coordinator.last_poll_cycle_duration,
+        "poll_cycle_duration": coordinator.poll_cycle_duration.as_dict(),
+        "device_count": len(coordinator.devices),
+    }
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: RaptDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": _coordinator_diagnostics(coordinator),
+        # Next polls of all config entries, to check that they are spread
+        "scheduled_polls": {
+            entry_id: next_poll.isoformat()
+            for entry_id, next_poll in sorted(
+                async_get_poll_scheduler(hass).next_polls.items(), key=lambda item: item[1]
+            )
+        },
+        "api": {
+            "metrics": coordinator.client.metrics.as_dict(),
+            "rate_limit": coordinator.client.rate_limit_state,
+        },
+        "devices": [asdict(device) for device in coordinator.devices],
+    }
+
+
+async def async_get_device_diagnostics(hass: HomeAssistant, entry: ConfigEntry, device: DeviceEntry) -> dict[str, Any]:
+    """Return diagnostics for a device, including its raw API payload."""
+    coordinator: RaptDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    device_id = next((identifier for domain, identifier in device.identifiers if domain == DOMAIN), None)
+    snapshot = coordinator.data.get(device_id) if coordinator.data and device_id else None
+    try:
+        raw = await coordinator.async_fetch_raw(device_id) if snapshot else None
+    except RaptApiError as err:
+        raw = {"error": str(err)}
+    return {
+        "snapshot": asdict(snapshot) if snapshot else None,
+        "raw": async_redact_data(raw, TO_REDACT) if raw else None,
+    }
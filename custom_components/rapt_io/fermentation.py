@@ -0,0 +1,137 @@
+"""Fermentation metrics computed incrementally from hydrometer readings."""
+
+from collections import deque
+from datetime import datetime, timedelta
+
+from .forecast import GravitySeries
+
+# Readings used for the gravity rate
+RATE_WINDOW = timedelta(hours=24)
+# Bound of the reading buffer, a day of readings every 15 minutes with margin
+MAX_READINGS = 128
+# Span of readings required to report a gravity rate
+MIN_RATE_SPAN = timedelta(hours=1)
+
+# A gravity rise larger than this is a new batch, the original gravity is detected again
+NEW_BATCH_RISE = 0.010
+
+# Conversion of the gravity drop to alcohol by volume
+ABV_FACTOR = 131.25
+
+SECONDS_PER_DAY = 86400
+
+
+class FermentationTracker:
+    """Track the fermentation of a hydrometer's batch.
+
+    The original gravity is the highest gravity since the batch started. The
+    gravity rate is the least squares slope of the readings of the last
+    RATE_WINDOW, kept in a bounded ring buffer with running sums so that each
+    reading is processed in constant time. The readings of the batch are
+    also kept in a series, for the fermentation completion forecast.
+    """
+
+    __slots__ = (
+        "original_gravity",
+        "gravity",
+        "last_reading",
+        "series",
+        "_readings",
+        "_origin",
+        "_sum_t",
+        "_sum_g",
+        "_sum_tt",
+        "_sum_tg",
+    )
+
+    def __init__(self) -> None:
+        """Initialize a tracker without readings."""
+        self.original_gravity: float | None = None
+        self.gravity: float | None = None
+        self.last_reading: datetime | None = None
+        # (days since the origin, gravity) pairs
+        self._readings: deque[tuple[float, float]] = deque()
+        self._origin: datetime | None = None
+        self._reset_sums()
+        self.series = GravitySeries()
+
+    def _reset_sums(self) -> None:
+        """Reset the running sums of the readings."""
+        self._sum_t = 0.0
+        self._sum_g = 0.0
+        self._sum_tt = 0.0
+        self._sum_tg = 0.0
+
+    def add(self, when: datetime, gravity: float) -> bool:
+        """Add a reading, return False if it is not newer than the last one."""
+        if self.last_reading is not None and when <= self.last_reading:
+            return False
+        if self.gravity is not None and gravity - self.gravity > NEW_BATCH_RISE:
+            # The hydrometer was put in a new batch
+            self.original_gravity = None
+            self._readings.clear()
+            self.series.clear()
+        if self.original_gravity is None or gravity > self.original_gravity:
+            self.original_gravity = gravity
+        self.gravity = gravity
+        self.last_reading = when
+        self.series.add(when, gravity)
+
+        if not self._readings:
+            # Times are kept relative to the oldest reading for precision
+            self._origin = when
+            self._reset_sums()
+        elif len(self._readings) == MAX_READINGS:
+            self._drop_oldest()
+        t = (when - self._origin).total_seconds() / SECONDS_PER_DAY
+        self._readings.append((t, gravity))
+        self._sum_t += t
+        self._sum_g += gravity
+        self._sum_tt += t * t
+        self._sum_tg += t * gravity
+
+        window_start = t - RATE_WINDOW.total_seconds() / SECONDS_PER_DAY
+        while self._readings[0][0] < window_start:
+            self._drop_oldest()
+        return True
+
+    def _drop_oldest(self) -> None:
+        """Drop the oldest reading from the buffer and the running sums."""
+        t, gravity = self._readings.popleft()
+        self._sum_t -= t
+        self._sum_g -= gravity
+        self._sum_tt -= t * t
+        self._sum_tg -= t * gravity
+
+    def restore_original_gravity(self, original_gravity: float) -> None:
+        """Restore the original gravity detected before a restart."""
+        if self.original_gravity is None or original_gravity > self.original_gravity:
+            self.original_gravity = original_gravity
+
+    @property
+    def abv(self) -> float | None:
+        """Return the alcohol by volume in percent."""
+        if self.original_gravity is None or self.gravity is None:
+            return None
+        return round((self.original_gravity - self.gravity) * ABV_FACTOR, 2)
+
+    @property
+    def apparent_attenuation(self) -> float | None:
+        """Return the apparent attenuation in percent."""
+        if self.original_gravity is None or self.gravity is None or self.original_gravity <= 1:
+            return None
+        return round((self.original_gravity - self.gravity) / (self.original_gravity - 1) * 100, 1)
+
+    @property
+    def gravity_rate(self) -> float | None:
+        """Return the gravity change per day over the rate window, negative while fermenting."""
+        count = len(self._readings)
+        if (
+            count < 2
+            or (self._readings[-1][0] - self._readings[0][0]) * SECONDS_PER_DAY < MIN_RATE_SPAN.total_seconds()
+        ):
+            return None
+        denominator = count * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return None
+        return round((count * self._sum_tg - self._sum_t * self._sum_g) / denominator, 4)
@@ -0,0 +1,127 @@
+"""Fermentation completion forecast fitted on the gravity readings of a batch."""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Decay rates, per day, searched by the fit: from month-long to day-long fermentations
+DECAY_RATES = np.geomspace(0.03, 5.0, 64)
+
+# Readings required before forecasting
+MIN_FORECAST_READINGS = 12
+MIN_FORECAST_SPAN = timedelta(hours=12)
+
+# Fermentation ends when the fitted gravity is within this of the final gravity
+END_TOLERANCE = 0.001
+
+# Capacity of a new series, doubled when full
+INITIAL_CAPACITY = 256
+# Bound of a series, 60 days of readings every 15 minutes; the oldest half is dropped when full
+MAX_SERIES_READINGS = 5760
+
+SECONDS_PER_DAY = 86400
+
+
+@dataclass(frozen=True, slots=True)
+class FermentationForecast:
+    """Fitted gravity decay of a batch, gravity(t) = final_gravity + amplitude * exp(-decay_rate * t)."""
+
+    final_gravity: float
+    end: datetime
+    decay_rate: float
+
+
+class GravitySeries:
+    """Gravity readings of a batch in compact arrays, with a decay fit cached until new readings arrive."""
+
+    __slots__ = ("_times", "_gravities", "_count", "_origin", "_forecast", "_fitted_count")
+
+    def __init__(self) -> None:
+        """Initialize an empty series."""
+        self._times = np.empty(INITIAL_CAPACITY)
+        self._gravities = np.empty(INITIAL_CAPACITY)
+        self._count = 0
+        self._origin: datetime | None = None
+        self._forecast: FermentationForecast | None = None
+        self._fitted_count = 0
+
+    def __len__(self) -> int:
+        """Return the number of readings."""
+        return self._count
+
+    def clear(self) -> None:
+        """Drop all readings, e.g. when a new batch starts."""
+        self._count = 0
+        self._origin = None
+        self._forecast = None
+        self._fitted_count = 0
+
+    def add(self, when: datetime, gravity: float) -> None:
+        """Append a reading, newer than the previous ones."""
+        if self._origin is None:
+            self._origin = when
+        if self._count == len(self._times):
+            if self._count >= MAX_SERIES_READINGS:
+                self._drop_oldest(self._count // 2)
+            else:
+                capacity = min(self._count * 2, MAX_SERIES_READINGS)
+                self._times = np.resize(self._times, capacity)
+                self._gravities = np.resize(self._gravities, capacity)
+        self._times[self._count] = (when - self._origin).total_seconds() / SECONDS_PER_DAY
+        self._gravities[self._count] = gravity
+        self._count += 1
+
+    def _drop_oldest(self, count: int) -> None:
+        """Drop the oldest readings."""
+        kept = self._count - count
+        self._times[:kept] = self._times[count : self._count]
+        self._gravities[:kept] = self._gravities[count : self._count]
+        self._count = kept
+        self._fitted_count = 0
+
+    @property
+    def forecast(self) -> FermentationForecast | None:
+        """Return the forecast, fitted again only if readings were added since the last fit."""
+        if self._fitted_count != self._count:
+            self._forecast = self._fit()
+            self._fitted_count = self._count
+        return self._forecast
+
+    def _fit(self) -> FermentationForecast | None:
+        """Fit the gravity decay by least squares, for all decay rates at once.
+
+        For a given decay rate the model is linear in the final gravity and the
+        amplitude, which are solved in closed form; the decay rate with the
+        smallest residual wins.
+        """
+        if self._count < MIN_FORECAST_READINGS or self._origin is None:
+            return None
+        times = self._times[: self._count]
+        gravities = self._gravities[: self._count]
+        if (times[-1] - times[0]) * SECONDS_PER_DAY < MIN_FORECAST_SPAN.total_seconds():
+            return None
+
+        # One row of decay terms per decay rate
+        decays = np.exp(-np.outer(DECAY_RATES, times))
+        decay_means = decays.mean(axis=1)
+        gravity_mean = gravities.mean()
+        covariances = decays @ gravities / self._count - decay_means * gravity_mean
+        variances = np.einsum("ij,ij->i", decays, decays) / self._count - decay_means**2
+        valid = (variances > 1e-12) & (covariances > 0)
+        if not valid.any():
+            # Gravity is not dropping
+            return None
+        # Residual sum of squares is proportional to var(g) - cov(e, g)² / var(e)
+        explained = np.where(valid, covariances**2 / np.where(valid, variances, 1), -np.inf)
+        best = int(np.argmax(explained))
+        decay_rate = float(DECAY_RATES[best])
+        amplitude = float(covariances[best] / variances[best])
+        final_gravity = float(gravity_mean - amplitude * decay_means[best])
+
+        end_time = np.log(amplitude / END_TOLERANCE) / decay_rate if amplitude > END_TOLERANCE else 0.0
+        return FermentationForecast(
+            final_gravity=round(final_gravity, 4),
+            end=self._origin + timedelta(days=float(end_time)),
+            decay_rate=decay_rate,
+        )
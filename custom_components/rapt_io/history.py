@@ -0,0 +1,177 @@
+"""On-disk telemetry history of the devices of a RAPT.io config entry."""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .models import RaptDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+# Readings older than this are deleted
+HISTORY_RETENTION = timedelta(days=90)
+
+# How often old readings are deleted, with the next write
+PRUNE_INTERVAL = timedelta(hours=1)
+
+# History fed back to the fermentation trackers after a restart
+RESTORED_HISTORY = timedelta(days=30)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS readings (
+    device_id TEXT NOT NULL,
+    time REAL NOT NULL,
+    temperature REAL,
+    gravity REAL,
+    battery INTEGER,
+    PRIMARY KEY (device_id, time)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS readings_time ON readings (time);
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class RaptReading:
+    """Telemetry reading of a device."""
+
+    device_id: str
+    time: datetime
+    temperature: float | None = None
+    gravity: float | None = None
+    battery: int | None = None
+
+
+def history_path(hass: HomeAssistant, entry_id: str) -> str:
+    """Return the path of the history database of a config entry."""
+    return hass.config.path(".storage", f"{DOMAIN}.history.{entry_id}.db")
+
+
+async def async_remove_history(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the history database of a config entry."""
+    path = history_path(hass, entry_id)
+
+    def remove() -> None:
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(path + suffix)
+            except FileNotFoundError:
+                pass
+
+    await hass.async_add_executor_job(remove)
+
+
+class RaptHistoryStore:
+    """Append-only telemetry history of a config entry, in a SQLite database.
+
+    The readings of an update cycle are written in one transaction, and all
+    database access runs in the executor. Readings are indexed by device and
+    time, and deleted once older than the retention period.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, retention: timedelta = HISTORY_RETENTION) -> None:
+        """Initialize the history store."""
+        self._hass = hass
+        self._path = history_path(hass, entry_id)
+        self._retention = retention
+        self._connection: sqlite3.Connection | None = None
+        # The connection is shared by the executor threads
+        self._lock = threading.Lock()
+        self._pending_writes: set[asyncio.Future] = set()
+        self._last_prune: datetime | None = None
+
+    async def async_open(self) -> None:
+        """Open the database, creating it if needed; the history is disabled if it can't be opened."""
+        try:
+            await self._hass.async_add_executor_job(self._open)
+        except (OSError, sqlite3.Error) as err:
+            _LOGGER.warning("Telemetry history disabled, error opening %s: %s", self._path, err)
+
+    def _open(self) -> None:
+        """Open the database."""
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        connection = sqlite3.connect(self._path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        self._connection = connection
+
+    async def async_close(self) -> None:
+        """Wait for pending writes and close the database."""
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes)
+        if self._connection is not None:
+            await self._hass.async_add_executor_job(self._connection.close)
+            self._connection = None
+
+    @callback
+    def async_add(self, devices: Iterable[RaptDevice]) -> None:
+        """Write the latest reading of devices, readings already stored are skipped."""
+        rows = [
+            (
+                device.id,
+                device.last_activity.timestamp(),
+                device.temperature,
+                getattr(device, "gravity", None),
+                getattr(device, "battery", None),
+            )
+            for device in devices
+            if device.last_activity is not None
+        ]
+        if not rows or self._connection is None:
+            return
+        now = dt_util.utcnow()
+        prune_before = None
+        if self._last_prune is None or now - self._last_prune > PRUNE_INTERVAL:
+            self._last_prune = now
+            prune_before = (now - self._retention).timestamp()
+        future = self._hass.async_add_executor_job(self._write, rows, prune_before)
+        self._pending_writes.add(future)
+        future.add_done_callback(self._pending_writes.discard)
+
+    def _write(self, rows: list[tuple], prune_before: float | None) -> None:
+        """Write readings and delete the expired ones."""
+        try:
+            with self._lock, self._connection:
+                self._connection.executemany("INSERT OR IGNORE INTO readings VALUES (?, ?, ?, ?, ?)", rows)
+                if prune_before is not None:
+                    pruned = self._connection.execute("DELETE FROM readings WHERE time < ?", (prune_before,)).rowcount
+                    if pruned:
+                        _LOGGER.debug("Deleted %d readings older than %s", pruned, self._retention)
+        except sqlite3.Error as err:
+            _LOGGER.warning("Error writing telemetry history to %s: %s", self._path, err)
+
+    async def async_get_readings(
+        self, start: datetime, end: datetime | None = None, device_ids: Iterable[str] | None = None
+    ) -> list[RaptReading]:
+        """Return the readings between start and end, ordered by device and time."""
+        if self._connection is None:
+            return []
+        return await self._hass.async_add_executor_job(
+            self._get_readings, start, end, list(device_ids) if device_ids is not None else None
+        )
+
+    def _get_readings(self, start: datetime, end: datetime | None, device_ids: list[str] | None) -> list[RaptReading]:
+        """Query the readings between start and end."""
+        query = "SELECT device_id, time, temperature, gravity, battery FROM readings WHERE time >= ?"
+        parameters: list = [start.timestamp()]
+        if end is not None:
+            query += " AND time < ?"
+            parameters.append(end.timestamp())
+        if device_ids is not None:
+            query += f" AND device_id IN ({', '.join('?' * len(device_ids))})"
+            parameters.extend(device_ids)
+        query += " ORDER BY device_id, time"
+        with self._lock:
+            rows = self._connection.execute(query, parameters).fetchall()
+        return [
+            RaptReading(device_id, dt_util.utc_from_timestamp(time), temperature, gravity, battery)
+            for device_id, time, temperature, gravity, battery in rows
+        ]
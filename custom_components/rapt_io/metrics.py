@@ -0,0 +1,200 @@
+"""Request-level metrics of the RAPT.io API client."""
+
+import math
+from bisect import bisect_left
+from collections import deque
+
+# Upper bounds of the latency histogram buckets, the last bucket is unbounded
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0)
+
+# Latencies of successful requests kept per endpoint, e.g. for the hedge delay
+RECENT_LATENCY_SAMPLES = 100
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in seconds."""
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record a duration."""
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean duration."""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent: float) -> float | None:
+        """Return an upper bound of a percentile, from the bucket it falls in."""
+        if not self.count:
+            return None
+        rank = self.count * percent / 100
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else self.max
+        return self.max
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the observations of another histogram."""
+        self.buckets = [count + other_count for count, other_count in zip(self.buckets, other.buckets)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def as_dict(self) -> dict:
+        """Return the histogram as a dict."""
+        labels = [f"le_{bound}" for bound in LATENCY_BUCKETS] + ["le_inf"]
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": self.max,
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class RecentLatencies:
+    """Latencies of the last successful requests, with exact percentiles."""
+
+    __slots__ = ("_samples",)
+
+    def __init__(self, size: int = RECENT_LATENCY_SAMPLES) -> None:
+        """Initialize an empty window."""
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        """Return the number of latencies in the window."""
+        return len(self._samples)
+
+    def observe(self, seconds: float) -> None:
+        """Record a latency, dropping the oldest one when the window is full."""
+        self._samples.append(seconds)
+
+    def percentile(self, percent: float) -> float | None:
+        """Return a percentile of the latencies in the window, by nearest rank."""
+        if not self._samples:
+            return None
+        samples = sorted(self._samples)
+        return samples[max(math.ceil(len(samples) * percent / 100) - 1, 0)]
+
+
+class EndpointMetrics:
+    """Counters of the requests sent to an API endpoint."""
+
+    __slots__ = ("requests", "errors", "retries", "hedges", "hedge_wins", "bytes_received", "latency", "recent_latency")
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.requests = 0
+        self.errors: dict[str, int] = {}
+        self.retries = 0
+        # Duplicate requests sent after a slow response, and those answering first
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.bytes_received = 0
+        self.latency = LatencyHistogram()
+        # Successful requests only, so that timeouts don't inflate it
+        self.recent_latency = RecentLatencies()
+
+    def as_dict(self) -> dict:
+        """Return the counters as a dict."""
+        return {
+            "requests": self.requests,
+            "errors": dict(self.errors),
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "bytes_received": self.bytes_received,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class ApiMetrics:
+    """Metrics of an API client, collected with a few integer updates per request."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self.auth_refreshes = 0
+        self.auth_failures = 0
+
+    def endpoint(self, endpoint: str) -> EndpointMetrics:
+        """Return the metrics of an endpoint."""
+        if (metrics := self.endpoints.get(endpoint)) is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+        return metrics
+
+    def record_response(self, endpoint: str, seconds: float, size: int) -> None:
+        """Record a successful request."""
+        metrics = self.endpoint(endpoint)
+        metrics.requests += 1
+        metrics.bytes_received += size
+        metrics.latency.observe(seconds)
+        metrics.recent_latency.observe(seconds)
+
+    def record_error(self, endpoint: str, seconds: float, kind: str) -> None:
+        """Record a failed request, kind being e.g. "server" or "network"."""
+        metrics = self.endpoint(endpoint)
+        metrics.requests += 1
+        metrics.errors[kind] = metrics.errors.get(kind, 0) + 1
+        metrics.latency.observe(seconds)
+
+    def record_retry(self, endpoint: str) -> None:
+        """Record a retried request."""
+        self.endpoint(endpoint).retries += 1
+
+    def record_hedge(self, endpoint: str) -> None:
+        """Record a hedged request."""
+        self.endpoint(endpoint).hedges += 1
+
+    def record_hedge_win(self, endpoint: str) -> None:
+        """Record a hedged request answering before the original one."""
+        self.endpoint(endpoint).hedge_wins += 1
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests sent to all endpoints."""
+        return sum(metrics.requests for metrics in self.endpoints.values())
+
+    @property
+    def errors(self) -> int:
+        """Return the number of failed requests to all endpoints."""
+        return sum(sum(metrics.errors.values()) for metrics in self.endpoints.values())
+
+    @property
+    def bytes_received(self) -> int:
+        """Return the number of bytes received from all endpoints."""
+        return sum(metrics.bytes_received for metrics in self.endpoints.values())
+
+    def latency(self) -> LatencyHistogram:
+        """Return the latency histogram of all endpoints."""
+        histogram = LatencyHistogram()
+        for metrics in self.endpoints.values():
+            histogram.merge(metrics.latency)
+        return histogram
+
+    def as_dict(self) -> dict:
+        """Return the metrics as a dict."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes_received": self.bytes_received,
+            "auth_refreshes": self.auth_refreshes,
+            "auth_failures": self.auth_failures,
+            "endpoints": {endpoint: metrics.as_dict() for endpoint, metrics in self.endpoints.items()},
+        }
@@ -0,0 +1,147 @@
+"""Typed snapshots of RAPT.io device payloads."""
+
+import logging
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_activity_time(payload: dict) -> datetime | None:
+    """Return the last activity time of a device payload in UTC."""
+    value = payload.get("lastActivityTime")
+    if not value:
+        return None
+    parsed = dt_util.parse_datetime(value)
+    return dt_util.as_utc(parsed) if parsed else None
+
+
+def _as_float(value: Any) -> float | None:
+    """Return a payload value as float, None if it is missing or not numeric."""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_int(value: Any) -> int | None:
+    """Return a payload value rounded to an int, None if it is missing or not numeric."""
+    number = _as_float(value)
+    return round(number) if number is not None else None
+
+
+def _as_str(value: Any) -> str | None:
+    """Return a short, frequently repeated payload string, interned."""
+    return sys.intern(value) if isinstance(value, str) else None
+
+
+@dataclass(frozen=True, slots=True)
+class RaptDevice:
+    """Snapshot of the fields of a device payload used by the integration.
+
+    Snapshots compare by value, so the coordinator can tell which devices
+    changed between two polls. The raw payload is not kept, it can be fetched
+    on demand with RaptDataUpdateCoordinator.async_fetch_raw.
+    """
+
+    id: str
+    device_type: str | None = None
+    name: str | None = None
+    firmware_version: str | None = None
+    last_activity: datetime | None = None
+    status: str | None = None
+    temperature: float | None = None
+    # Served from the last successful response while the endpoint fails
+    stale: bool = False
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "RaptDevice":
+        """Create a snapshot from a device payload."""
+        return cls(
+            id=payload["id"],
+            device_type=_as_str(payload.get("deviceType")),
+            name=payload.get("name"),
+            firmware_version=_as_str(payload.get("firmwareVersion")),
+            last_activity=parse_activity_time(payload),
+            status=_as_str(payload.get("status")),
+            temperature=_as_float(payload.get("temperature")),
+            **cls._type_fields(payload),
+        )
+
+    @staticmethod
+    def _type_fields(payload: dict) -> dict[str, Any]:
+        """Return the fields specific to the device type."""
+        return {}
+
+
+@dataclass(frozen=True, slots=True)
+class RaptBrewZilla(RaptDevice):
+    """Snapshot of a BrewZilla."""
+
+
+@dataclass(frozen=True, slots=True)
+class RaptHydrometer(RaptDevice):
+    """Snapshot of a RAPT Pill hydrometer."""
+
+    gravity: float | None = None
+    battery: int | None = None
+
+    @staticmethod
+    def _type_fields(payload: dict) -> dict[str, Any]:
+        """Return the fields specific to the device type."""
+        return {"gravity": _as_float(payload.get("gravity")), "battery": _as_int(payload.get("battery"))}
+
+
+@dataclass(frozen=True, slots=True)
+class RaptTemperatureDevice(RaptDevice):
+    """Snapshot of a bonded BLE thermometer."""
+
+    battery: int | None = None
+
+    @staticmethod
+    def _type_fields(payload: dict) -> dict[str, Any]:
+        """Return the fields specific to the device type."""
+        return {"battery": _as_int(payload.get("battery"))}
+
+
+DEVICE_MODELS: dict[str, type[RaptDevice]] = {
+    "BrewZilla": RaptBrewZilla,
+    "Hydrometer": RaptHydrometer,
+    "BLETemperature": RaptTemperatureDevice,
+}
+
+
+def parse_telemetry_point(point: dict) -> tuple[str, dict[str, Any]]:
+    """Return the device ID of a pushed telemetry point and the snapshot fields it updates.
+
+    RAPT webhook templates can name the device ID "id" or "deviceId" and the
+    time of the reading "createdOn" or "lastActivityTime".
+    """
+    device_id = point.get("id") or point["deviceId"]
+    values = {
+        "last_activity": parse_activity_time(
+            {"lastActivityTime": point.get("createdOn") or point.get("lastActivityTime")}
+        ),
+        "temperature": _as_float(point.get("temperature")),
+        "gravity": _as_float(point.get("gravity")),
+        "battery": _as_int(point.get("battery")),
+    }
+    return device_id, {field: value for field, value in values.items() if value is not None}
+
+
+def parse_devices(payloads: list[dict]) -> list[RaptDevice]:
+    """Parse a device list response into snapshots, skipping payloads without an ID."""
+    devices = []
+    for payload in payloads:
+        if not isinstance(payload, dict) or not payload.get("id"):
+            _LOGGER.debug("Skipping device payload without an ID")
+            continue
+        model = DEVICE_MODELS.get(payload.get("deviceType"), RaptDevice)
+        devices.append(model.from_payload(payload))
+    return devices
@@ -0,0 +1,61 @@
+"""Decoding, validation and logging of RAPT.io API response bodies."""
+
+import itertools
+import json
+import logging
+from collections.abc import Callable
+from typing import Any
+
+import voluptuous as vol
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Decoder of response bodies, orjson when installed (it ships with Home Assistant)
+json_loads: Callable[[bytes], Any] = orjson.loads if orjson is not None else json.loads
+
+# Only every Nth response body is logged, the first one always is
+PAYLOAD_LOG_SAMPLE_RATE = 10
+# Logged response bodies are truncated to this size
+PAYLOAD_LOG_MAX_BYTES = 2048
+
+# Schemas are compiled once and only check the shape the integration relies on
+TOKEN_SCHEMA = vol.Schema(
+    {vol.Required("access_token"): str, vol.Optional("expires_in", default=3600): vol.Coerce(int)},
+    extra=vol.ALLOW_EXTRA,
+)
+DEVICE_LIST_SCHEMA = vol.Schema(
+    [vol.Schema({vol.Optional("id"): vol.Any(str, None)}, extra=vol.ALLOW_EXTRA)],
+)
+# Telemetry responses can hold thousands of points, only the container types are checked
+TELEMETRY_SCHEMA = vol.Schema([dict])
+
+
+def decode_json(body: bytes, loads: Callable[[bytes], Any] = json_loads) -> Any:
+    """Decode a JSON response body, an empty body decodes to None."""
+    if not body:
+        return None
+    return loads(body)
+
+
+class PayloadLogger:
+    """Log sampled, size-capped response bodies at debug level."""
+
+    def __init__(self, logger: logging.Logger, sample_rate: int = PAYLOAD_LOG_SAMPLE_RATE) -> None:
+        """Initialize the payload logger."""
+        self._logger = logger
+        self._sample_rate = sample_rate
+        self._counter = itertools.count()
+
+    def log(self, url: str, body: bytes) -> None:
+        """Log a response body, skipped unless debug logging is enabled."""
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return
+        if next(self._counter) % self._sample_rate:
+            return
+        text = body[:PAYLOAD_LOG_MAX_BYTES].decode("utf-8", "replace")
+        if len(body) > PAYLOAD_LOG_MAX_BYTES:
+            text = f"{text}... ({len(body)} bytes)"
+        self._logger.debug("API response from %s: %s", url, text)
@@ -0,0 +1,108 @@
+"""Adaptive poll planning for the RAPT.io integration."""
+
+import logging
+from datetime import datetime, timedelta
+
+from .const import ACTIVE_UPDATE_INTERVAL, IDLE_UPDATE_INTERVAL, MIN_UPDATE_INTERVAL
+from .models import RaptDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+# Device statuses that do not warrant fast polling
+IDLE_STATUSES = {"", "idle", "offline", "disconnected", "unknown"}
+
+# Devices that reported within this window are considered recently active
+RECENT_ACTIVITY_WINDOW = timedelta(minutes=30)
+
+# Delay after a device's expected report before polling for it
+REPORT_GRACE = 20  # seconds
+
+# Upper bound for polls timed on a device's reporting cadence
+MAX_REPORT_WAIT = 3600  # seconds
+
+# Weight of a new observation in the reporting cadence moving average
+CADENCE_SMOOTHING = 0.3
+
+# Report gaps longer than this factor of the cadence are treated as missed reports
+MISSED_REPORT_FACTOR = 1.5
+
+
+class AdaptivePollPlanner:
+    """Compute per-endpoint poll intervals from device activity.
+
+    Endpoints with an active device are polled at the active interval. Otherwise
+    polls are timed to land just after the next expected device report, based on
+    the observed reporting cadence, and stretch to the idle interval when no
+    device reported recently.
+    """
+
+    def __init__(self, base_interval: int, adaptive: bool = True) -> None:
+        """Initialize the planner."""
+        self.base_interval = base_interval
+        self.adaptive = adaptive
+        self._last_activity: dict[str, datetime] = {}
+        self._cadence: dict[str, float] = {}
+
+    @property
+    def active_interval(self) -> int:
+        """Return the poll interval for endpoints with an active device."""
+        return max(MIN_UPDATE_INTERVAL, min(ACTIVE_UPDATE_INTERVAL, self.base_interval))
+
+    @property
+    def idle_interval(self) -> int:
+        """Return the poll interval for endpoints without recent activity."""
+        return max(IDLE_UPDATE_INTERVAL, self.base_interval)
+
+    def next_interval(self, devices: list[RaptDevice], now: datetime) -> float:
+        """Record the devices of a successful poll and return the delay until the next one."""
+        if not self.adaptive:
+            return self.base_interval
+
+        active = False
+        recently_active = False
+        next_report: datetime | None = None
+        for device in devices:
+            if device.status is not None and device.status.lower() not in IDLE_STATUSES:
+                active = True
+            if (last_activity := self._observe(device)) is None:
+                continue
+            if now - last_activity < RECENT_ACTIVITY_WINDOW:
+                recently_active = True
+            if (cadence := self._cadence.get(device.id)) is not None:
+                expected = last_activity + timedelta(seconds=cadence + REPORT_GRACE)
+                if expected > now and (next_report is None or expected < next_report):
+                    next_report = expected
+
+        if active:
+            return self.active_interval
+        if next_report is not None:
+            delay = (next_report - now).total_seconds()
+            return min(max(delay, MIN_UPDATE_INTERVAL), MAX_REPORT_WAIT)
+        if recently_active:
+            return self.base_interval
+        return self.idle_interval
+
+    def forget(self, device_ids: set[str]) -> None:
+        """Drop the activity history of devices removed from the account."""
+        for device_id in device_ids:
+            self._last_activity.pop(device_id, None)
+            self._cadence.pop(device_id, None)
+
+    def _observe(self, device: RaptDevice) -> datetime | None:
+        """Update the reporting cadence of a device, return its last activity time."""
+        device_id = device.id
+        if (last_activity := device.last_activity) is None:
+            return None
+        previous = self._last_activity.get(device_id)
+        self._last_activity[device_id] = last_activity
+        if previous is None or last_activity <= previous:
+            return last_activity
+
+        gap = (last_activity - previous).total_seconds()
+        cadence = self._cadence.get(device_id)
+        if cadence is None:
+            self._cadence[device_id] = gap
+        elif gap <= cadence * MISSED_REPORT_FACTOR:
+            self._cadence[device_id] = cadence + CADENCE_SMOOTHING * (gap - cadence)
+        _LOGGER.debug("Device %s reporting cadence: %.0f seconds", device_id, self._cadence[device_id])
+        return last_activity
@@ -0,0 +1,225 @@
+"""On-demand profiling of the update cycles of the RAPT.io config entries."""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+import voluptuous as vol
+
+from homeassistant.components import persistent_notification
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_PROFILE_SESSION, DOMAIN
+from .coordinator import RaptDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_PROFILE = "profile"
+ATTR_CYCLES = "cycles"
+ATTR_TRACE_MEMORY = "trace_memory"
+
+DEFAULT_PROFILE_CYCLES = 3
+MAX_PROFILE_CYCLES = 50
+
+# A session is reported after this long even if fewer cycles ran, e.g. while telemetry is pushed
+PROFILE_TIMEOUT = timedelta(hours=1)
+
+# Stack frames kept per traced allocation
+TRACEMALLOC_FRAMES = 5
+
+# Functions and allocation sites listed in the report
+REPORT_TOP = 40
+
+# Functions of the integration the report breaks the update cycles down into
+HOT_PATHS = ("_request", "_async_update_data", "_handle_coordinator_update")
+
+PACKAGE_DIR = os.path.dirname(__file__)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=DEFAULT_PROFILE_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PROFILE_CYCLES)
+        ),
+        vol.Optional(ATTR_TRACE_MEMORY, default=True): cv.boolean,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def async_handle_profile(call: ServiceCall) -> None:
+        """Profile the next update cycles of all loaded config entries."""
+        if DATA_PROFILE_SESSION in hass.data:
+            raise HomeAssistantError("A RAPT.io profiling session is already running")
+        coordinators: list[RaptDataUpdateCoordinator] = list(hass.data.get(DOMAIN, {}).values())
+        if not coordinators:
+            raise ServiceValidationError("No RAPT.io config entry is loaded")
+        session = RaptProfileSession(hass, coordinators, call.data[ATTR_CYCLES], call.data[ATTR_TRACE_MEMORY])
+        session.async_start()
+        hass.data[DATA_PROFILE_SESSION] = session
+
+    async_register_admin_service(hass, DOMAIN, SERVICE_PROFILE, async_handle_profile, schema=PROFILE_SCHEMA)
+
+
+class RaptProfileSession:
+    """CPU and memory profile of a number of update cycles, written to a report in the config directory.
+
+    The profiler runs on the event loop thread from the start of the session
+    until the last cycle has updated its entities, so the report covers the API
+    requests, the response decoding, the coordinator merge and the entity
+    state writes; nothing is traced outside of a session. The wall time of the
+    cycles is reported next to their CPU time, the difference is time spent
+    waiting on the RAPT API or on other tasks.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinators: list[RaptDataUpdateCoordinator],
+        cycles: int,
+        trace_memory: bool,
+    ) -> None:
+        """Initialize the session."""
+        self._hass = hass
+        self._coordinators = coordinators
+        self._cycles = cycles
+        self._trace_memory = trace_memory
+        self._profile = cProfile.Profile()
+        self._cycle_durations: list[float] = []
+        self._unsubscribes: list[Callable[[], None]] = []
+        self._started: datetime | None = None
+        self._started_tracing = False
+        self._start_snapshot: tracemalloc.Snapshot | None = None
+        self._finished = False
+
+    @callback
+    def async_start(self) -> None:
+        """Start profiling."""
+        try:
+            self._profile.enable()
+        except ValueError as err:
+            # Another profiler, e.g. the one of the profiler integration, is running
+            raise HomeAssistantError(f"Cannot start profiling: {err}") from err
+        if self._trace_memory:
+            if tracemalloc.is_tracing():
+                self._start_snapshot = tracemalloc.take_snapshot()
+            else:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                self._started_tracing = True
+        self._started = dt_util.utcnow()
+        for coordinator in self._coordinators:
+            self._unsubscribes.append(coordinator.async_add_cycle_listener(self._async_cycle_done))
+        self._unsubscribes.append(async_call_later(self._hass, PROFILE_TIMEOUT, self._async_timeout))
+        _LOGGER.info("Profiling the next %d RAPT.io update cycles", self._cycles)
+
+    @callback
+    def _async_cycle_done(self, duration: float) -> None:
+        """Count an update cycle, finish once the last one has updated its entities."""
+        self._cycle_durations.append(duration)
+        if len(self._cycle_durations) == self._cycles:
+            # Entities are updated right after the cycle returns, in the same task step
+            self._hass.loop.call_soon(self._async_finish)
+
+    @callback
+    def _async_timeout(self, _now: datetime) -> None:
+        """Finish the session with the cycles that ran so far."""
+        _LOGGER.warning(
+            "Only %d of %d RAPT.io update cycles ran within %s",
+            len(self._cycle_durations),
+            self._cycles,
+            PROFILE_TIMEOUT,
+        )
+        self._async_finish()
+
+    @callback
+    def _async_finish(self) -> None:
+        """Stop profiling and write the report."""
+        if self._finished:
+            return
+        self._finished = True
+        self._profile.disable()
+        for unsubscribe in self._unsubscribes:
+            unsubscribe()
+        self._hass.async_create_task(self._async_write_report(), f"{DOMAIN} profile report")
+
+    async def _async_write_report(self) -> None:
+        """Write the report in the executor, then end the session."""
+        path = self._hass.config.path(f"{DOMAIN}_profile_{self._started:%Y%m%d%H%M%S}")
+        try:
+            await self._hass.async_add_executor_job(self._write_report, path)
+        except OSError as err:
+            _LOGGER.error("Error writing the RAPT.io profile to %s: %s", path, err)
+        else:
+            _LOGGER.info("RAPT.io profile written to %s.txt", path)
+            persistent_notification.async_create(
+                self._hass,
+                f"The profile of {len(self._cycle_durations)} update cycles was written to `{path}.txt`, "
+                f"with the raw cProfile data in `{path}.prof`.",
+                title="RAPT.io profile",
+                notification_id=f"{DOMAIN}_profile",
+            )
+        finally:
+            self._hass.data.pop(DATA_PROFILE_SESSION, None)
+
+    def _write_report(self, path: str) -> None:
+        """Write the text report and the raw cProfile data."""
+        snapshot = None
+        if self._trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            if self._started_tracing:
+                tracemalloc.stop()
+
+        report = io.StringIO()
+        report.write(f"RAPT.io profile started {self._started.isoformat()}\n")
+        report.write(f"Update cycles: {len(self._cycle_durations)} of {self._cycles}\n")
+        report.write(f"Wall time of the cycles: {sum(self._cycle_durations):.3f} s\n\n")
+
+        stats = pstats.Stats(self._profile, stream=report)
+        report.write("Hot paths, CPU time on the event loop (coroutine calls count each resumption):\n")
+        for (filename, line, name), (_, calls, own, cumulative, _) in sorted(stats.stats.items()):
+            if name in HOT_PATHS and filename.startswith(PACKAGE_DIR):
+                report.write(
+                    f"  {name} ({os.path.basename(filename)}:{line}): {calls} calls, "
+                    f"{own:.3f} s own, {cumulative:.3f} s cumulative\n"
+                )
+        report.write("\n")
+
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+        report.write("Integration functions by cumulative time:\n")
+        stats.print_stats(re.escape(PACKAGE_DIR), REPORT_TOP)
+        report.write("Functions called by the hot paths:\n")
+        stats.print_callees(rf"\(({'|'.join(HOT_PATHS)})\)")
+        report.write("All functions by cumulative time:\n")
+        stats.print_stats(REPORT_TOP)
+
+        if snapshot is not None:
+            report.write(f"Peak traced memory: {peak / 1024:.1f} KiB\n\n")
+            if self._start_snapshot is not None:
+                allocations = snapshot.compare_to(self._start_snapshot, "lineno")
+            else:
+                allocations = snapshot.statistics("lineno")
+            report.write("Memory allocated during the session, by line:\n")
+            for statistic in allocations[:REPORT_TOP]:
+                report.write(f"  {statistic}\n")
+            report.write("\nMemory allocated by the integration, by line:\n")
+            package_snapshot = snapshot.filter_traces([tracemalloc.Filter(True, os.path.join(PACKAGE_DIR, "*"))])
+            for statistic in package_snapshot.statistics("lineno")[:REPORT_TOP]:
+                report.write(f"  {statistic}\n")
+
+        self._profile.dump_stats(f"{path}.prof")
+        with open(f"{path}.txt", "w", encoding="utf-8") as report_file:
+            report_file.write(report.getvalue())
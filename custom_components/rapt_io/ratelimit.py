@@ -0,0 +1,94 @@
+"""Client-side request rate limiting for the RAPT.io API."""
+
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# Exponential backoff parameters for retried requests
+BACKOFF_BASE = 1.0  # seconds
+BACKOFF_MAX = 30.0  # seconds
+
+
+def backoff_delay(attempt: int) -> float:
+    """Return a jittered exponential backoff delay for a retry attempt (0-based)."""
+    # Full jitter spreads the retries of concurrent callers
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the delay in seconds requested by a Retry-After header value."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class RequestBudget:
+    """Token bucket limiting the request rate of an account.
+
+    The bucket holds up to one minute worth of requests and refills
+    continuously. A rate limit reported by the server pauses it entirely.
+    """
+
+    def __init__(self, requests_per_minute: int) -> None:
+        """Initialize the request budget."""
+        self._lock = asyncio.Lock()
+        self._requests_per_minute = requests_per_minute
+        self._rate = requests_per_minute / 60
+        self._capacity = float(requests_per_minute)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def set_rate(self, requests_per_minute: int) -> None:
+        """Change the request budget."""
+        self._refill(time.monotonic())
+        self._requests_per_minute = requests_per_minute
+        self._rate = requests_per_minute / 60
+        self._capacity = float(requests_per_minute)
+        self._tokens = min(self._tokens, self._capacity)
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accumulated since the last refill."""
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent, callers are served in order."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all requests for the given time, e.g. after a 429 response."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    @property
+    def state(self) -> dict:
+        """Return the current budget state."""
+        now = time.monotonic()
+        self._refill(now)
+        return {
+            "requests_per_minute": self._requests_per_minute,
+            "available": round(self._tokens, 2),
+            "paused_for": round(max(self._paused_until - now, 0.0), 2),
+            "waiting": self._lock.locked(),
+        }
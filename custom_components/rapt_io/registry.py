@@ -0,0 +1,146 @@
+"""Registry of RAPT.io API clients shared between config entries."""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_USERNAME, EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util.ssl import get_default_context
+
+from .api import RaptApiClient
+from .const import (
+    CONF_API_KEY,
+    CONF_HEDGE_PERCENTILE,
+    CONF_REQUEST_BUDGET,
+    DATA_CLIENT_REGISTRY,
+    DEFAULT_HEDGE_PERCENTILE,
+    DEFAULT_REQUEST_BUDGET,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Setup seeds older than this are discarded
+SEED_MAX_AGE = 300  # seconds
+
+
+@dataclass
+class RaptSetupSeed:
+    """Token and device lists obtained by the config flow, reused by the entry setup."""
+
+    # None when the token had already expired
+    access_token: str | None
+    token_expires: datetime | None
+    # Device list payloads keyed by endpoint
+    device_lists: dict[str, list[dict]]
+    created: float = field(default_factory=time.monotonic)
+
+
+def account_key(username: str) -> str:
+    """Return the key identifying the account of a username."""
+    return username.strip().lower()
+
+
+def _client_settings(entry: ConfigEntry) -> tuple[str, int, float]:
+    """Return the API key, request budget and hedge percentile of the entry's client."""
+    return (
+        entry.data[CONF_API_KEY],
+        entry.options.get(CONF_REQUEST_BUDGET, DEFAULT_REQUEST_BUDGET),
+        entry.options.get(CONF_HEDGE_PERCENTILE, DEFAULT_HEDGE_PERCENTILE),
+    )
+
+
+@callback
+def async_get_client_registry(hass: HomeAssistant) -> "RaptClientRegistry":
+    """Return the client registry, creating it on first use."""
+    if DATA_CLIENT_REGISTRY not in hass.data:
+        hass.data[DATA_CLIENT_REGISTRY] = RaptClientRegistry(hass)
+    return hass.data[DATA_CLIENT_REGISTRY]
+
+
+class RaptClientRegistry:
+    """Share one API client, and so one token and request budget, per account.
+
+    A client is created for the first config entry of an account and closed
+    when the last config entry using it is released. Each client has its own
+    HTTP session, with connections to the RAPT hosts kept alive between polls.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the registry."""
+        self._hass = hass
+        self._clients: dict[str, RaptApiClient] = {}
+        self._entries: dict[str, set[str]] = {}
+        self._settings: dict[str, tuple[str, int, float]] = {}
+        self._seeds: dict[str, RaptSetupSeed] = {}
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, self._async_close_clients)
+
+    @callback
+    def async_add_seed(self, username: str, seed: RaptSetupSeed) -> None:
+        """Keep the config flow results of an account for the setup of its entry."""
+        self._seeds[account_key(username)] = seed
+
+    @callback
+    def async_pop_seed(self, entry: ConfigEntry) -> RaptSetupSeed | None:
+        """Return the config flow results of the entry's account, if still fresh."""
+        seed = self._seeds.pop(account_key(entry.data[CONF_USERNAME]), None)
+        if seed is None or time.monotonic() - seed.created > SEED_MAX_AGE:
+            return None
+        return seed
+
+    @callback
+    def async_acquire(self, entry: ConfigEntry) -> RaptApiClient:
+        """Return the client of the entry's account.
+
+        The client is created with the API key and options of the first entry of
+        the account, those of the entries sharing it are ignored.
+        """
+        key = account_key(entry.data[CONF_USERNAME])
+        settings = _client_settings(entry)
+        if (client := self._clients.get(key)) is None:
+            api_key, request_budget, hedge_percentile = settings
+            client = RaptApiClient(
+                username=entry.data[CONF_USERNAME],
+                api_key=api_key,
+                # Certificates are verified with the SSL context of Home Assistant
+                ssl_context=get_default_context(),
+                renew_token=True,
+                request_budget=request_budget,
+                hedge_percentile=hedge_percentile,
+            )
+            self._clients[key] = client
+            self._settings[key] = settings
+        elif settings != self._settings[key]:
+            _LOGGER.warning(
+                "Config entry %s shares the API client of %s with another entry, its API key, request budget "
+                "and hedging options are ignored; remove the duplicate entry of the account",
+                entry.entry_id,
+                key,
+            )
+        else:
+            _LOGGER.debug("Sharing API client of %s with config entry %s", key, entry.entry_id)
+        self._entries.setdefault(key, set()).add(entry.entry_id)
+        return client
+
+    async def async_release(self, entry: ConfigEntry) -> None:
+        """Release the entry's client, closing it when no other entry uses it."""
+        key = account_key(entry.data[CONF_USERNAME])
+        entries = self._entries.get(key, set())
+        entries.discard(entry.entry_id)
+        if entries:
+            return
+        self._entries.pop(key, None)
+        self._settings.pop(key, None)
+        if (client := self._clients.pop(key, None)) is not None:
+            await client.close()
+            _LOGGER.debug("Closed RAPT.io API client of %s", key)
+
+    async def _async_close_clients(self, event: Event) -> None:
+        """Close the clients still open when Home Assistant stops."""
+        for client in self._clients.values():
+            await client.close()
+        self._clients.clear()
+        self._entries.clear()
+        self._settings.clear()
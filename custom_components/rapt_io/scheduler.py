@@ -0,0 +1,119 @@
+"""Scheduling of the polls of all RAPT.io config entries."""
+
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_POLL_SCHEDULER
+
+_LOGGER = logging.getLogger(__name__)
+
+# Polls of different config entries are kept at least this far apart
+MIN_POLL_SPACING = timedelta(seconds=5)
+
+# Random delay added to each poll, as a fraction of the poll interval
+POLL_JITTER = 0.1
+MAX_POLL_JITTER = 30  # seconds
+
+# Random delay of the first poll of entries set up from their cached devices, e.g. at startup
+FIRST_POLL_JITTER = 10  # seconds
+
+# Config entries polling at the same time
+MAX_CONCURRENT_POLLS = 2
+
+
+@callback
+def async_get_poll_scheduler(hass: HomeAssistant) -> "RaptPollScheduler":
+    """Return the poll scheduler, creating it on first use."""
+    if DATA_POLL_SCHEDULER not in hass.data:
+        hass.data[DATA_POLL_SCHEDULER] = RaptPollScheduler()
+    return hass.data[DATA_POLL_SCHEDULER]
+
+
+class RaptPollSlot:
+    """Poll schedule of a config entry, used as a context manager around its update cycles."""
+
+    def __init__(self, scheduler: "RaptPollScheduler", entry_id: str) -> None:
+        """Initialize the slot."""
+        self._scheduler = scheduler
+        self.entry_id = entry_id
+
+    @property
+    def next_poll(self) -> datetime | None:
+        """Return when the entry is scheduled to poll next."""
+        return self._scheduler.next_polls.get(self.entry_id)
+
+    def schedule(self, now: datetime, delay: float, max_jitter: float | None = None) -> float:
+        """Return the delay of the next poll, jittered and spread from the polls of other entries."""
+        return self._scheduler.schedule(self.entry_id, now, delay, max_jitter)
+
+    async def async_wait_first_poll(self, now: datetime, max_jitter: float = 0) -> None:
+        """Wait until the first poll of the entry, spread from the first polls of the other entries."""
+        if (delay := self.schedule(now, 0, max_jitter)) > 0:
+            _LOGGER.debug("Delaying first poll of %s by %.1f seconds", self.entry_id, delay)
+            await asyncio.sleep(delay)
+
+    @callback
+    def async_unregister(self) -> None:
+        """Stop scheduling the polls of the entry."""
+        self._scheduler.async_unregister(self.entry_id)
+
+    async def __aenter__(self) -> None:
+        """Wait until fewer than the maximum number of entries are polling."""
+        await self._scheduler.semaphore.acquire()
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Let the next entry poll."""
+        self._scheduler.semaphore.release()
+
+
+class RaptPollScheduler:
+    """Spread the polls of all config entries over time and cap how many run at once.
+
+    Without it, entries with the same interval poll in lockstep after a restart,
+    bursting requests at the RAPT API and at the event loop.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_POLLS) -> None:
+        """Initialize the scheduler."""
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self._next_polls: dict[str, datetime] = {}
+        self._entries: set[str] = set()
+
+    @property
+    def next_polls(self) -> dict[str, datetime]:
+        """Return the next scheduled poll of each config entry."""
+        return dict(self._next_polls)
+
+    @callback
+    def async_register(self, entry_id: str) -> RaptPollSlot:
+        """Register a config entry and return its slot."""
+        self._entries.add(entry_id)
+        return RaptPollSlot(self, entry_id)
+
+    @callback
+    def async_unregister(self, entry_id: str) -> None:
+        """Unregister a config entry."""
+        self._entries.discard(entry_id)
+        self._next_polls.pop(entry_id, None)
+
+    def schedule(self, entry_id: str, now: datetime, delay: float, max_jitter: float | None = None) -> float:
+        """Schedule the next poll of an entry, return its delay in seconds.
+
+        A random jitter, by default a fraction of the delay, is added to the
+        requested delay, then the poll is pushed back until it is at least
+        MIN_POLL_SPACING away from the polls of the other entries.
+        """
+        if max_jitter is None:
+            max_jitter = min(delay * POLL_JITTER, MAX_POLL_JITTER)
+        target = now + timedelta(seconds=delay + random.uniform(0, max_jitter))
+        for other_poll in sorted(poll for other, poll in self._next_polls.items() if other != entry_id):
+            if other_poll - MIN_POLL_SPACING < target < other_poll + MIN_POLL_SPACING:
+                target = other_poll + MIN_POLL_SPACING
+        if entry_id in self._entries:
+            self._next_polls[entry_id] = target
+        _LOGGER.debug("Scheduled next poll of %s at %s", entry_id, target)
+        return (target - now).total_seconds()
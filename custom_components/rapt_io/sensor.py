@@ -1,21 +1,28 @@
 """Platform for RAPT.io sensor integration."""
 
 import logging
+from collections.abc import Callable
+from datetime import datetime
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfInformation, UnitOfTemperature, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import RaptDataUpdateCoordinator
+from .fermentation import FermentationTracker
+from .models import RaptBrewZilla, RaptDevice, RaptHydrometer, RaptTemperatureDevice
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,55 +37,112 @@ async def async_setup_entry(
 
     coordinator: RaptDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities_to_add = []
-
-    # Enumerate devices from coordinator's device list
-    for device in coordinator.devices:
-        device_id = device.get("id")
-        if device_id:
-            device_type = device.get("deviceType")
-            if device_type == "BrewZilla":
-                entities_to_add.append(RaptTemperatureSensor(coordinator, device))
-                entities_to_add.append(RaptStatusSensor(coordinator, device))
-            elif device_type == "Hydrometer":
-                entities_to_add.append(RaptTemperatureSensor(coordinator, device))
-                entities_to_add.append(RaptGravitySensor(coordinator, device))
-                entities_to_add.append(RaptBatterySensor(coordinator, device))
-            elif device_type == "BLETemperature":
-                entities_to_add.append(RaptTemperatureSensor(coordinator, device))
-                entities_to_add.append(RaptBatterySensor(coordinator, device))
-            else:
-                _LOGGER.warning("Unsupported device type: %s", device_type)
-
-    if entities_to_add:
-        async_add_entities(entities_to_add)
-    else:
-        _LOGGER.warning("No entities added for config entry %s", entry.entry_id)
-
-
-class RaptBaseSensor(CoordinatorEntity, SensorEntity):
-    """Base class for RAPT sensors."""
+    entities_to_add = [entity for device in coordinator.devices for entity in _create_entities(coordinator, device)]
+    if not entities_to_add:
+        _LOGGER.warning("No device entities added for config entry %s", entry.entry_id)
+    # Disabled by default, they describe how the RAPT.io cloud is behaving
+    entities_to_add.extend(
+        sensor_class(coordinator, entry.entry_id)
+        for sensor_class in (
+            RaptApiRequestsSensor,
+            RaptApiErrorsSensor,
+            RaptApiLatencySensor,
+            RaptApiBytesReceivedSensor,
+            RaptPollCycleDurationSensor,
+            RaptNextPollSensor,
+        )
+    )
+    async_add_entities(entities_to_add)
+
+    @callback
+    def async_add_new_devices() -> None:
+        """Add the entities of devices added to the account since the last update."""
+        new_entities = [
+            entity
+            for device_id in coordinator.new_devices
+            if (device := coordinator.data.get(device_id)) is not None
+            for entity in _create_entities(coordinator, device)
+        ]
+        if new_entities:
+            _LOGGER.info("Adding %d entities for new RAPT.io devices", len(new_entities))
+            async_add_entities(new_entities)
+
+    entry.async_on_unload(coordinator.async_add_listener(async_add_new_devices))
+
+
+def _create_entities(coordinator: RaptDataUpdateCoordinator, device: RaptDevice) -> list["RaptBaseSensor"]:
+    """Return the sensors of a device."""
+    if isinstance(device, RaptBrewZilla):
+        return [RaptTemperatureSensor(coordinator, device), RaptStatusSensor(coordinator, device)]
+    if isinstance(device, RaptHydrometer):
+        return [
+            RaptTemperatureSensor(coordinator, device),
+            RaptGravitySensor(coordinator, device),
+            RaptBatterySensor(coordinator, device),
+            RaptOriginalGravitySensor(coordinator, device),
+            RaptAbvSensor(coordinator, device),
+            RaptAttenuationSensor(coordinator, device),
+            RaptGravityRateSensor(coordinator, device),
+            RaptPredictedFinalGravitySensor(coordinator, device),
+            RaptFermentationEndSensor(coordinator, device),
+        ]
+    if isinstance(device, RaptTemperatureDevice):
+        return [RaptTemperatureSensor(coordinator, device), RaptBatterySensor(coordinator, device)]
+    _LOGGER.warning("Unsupported device type: %s", device.device_type)
+    return []
+
+
+class RaptBaseSensor(CoordinatorEntity, RestoreSensor):
+    """Base class for RAPT sensors.
+
+    Until the first refresh delivers its device's data, a sensor shows its
+    state from before the restart, flagged as stale.
+    """
 
     _attr_has_entity_name = True
 
-    def __init__(self, coordinator: RaptDataUpdateCoordinator, device: dict) -> None:
+    def __init__(self, coordinator: RaptDataUpdateCoordinator, device: RaptDevice) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._device_id = device["id"]
+        self._device_id = device.id
+        # Only get notified when this device's data changes
+        super().__init__(coordinator, context=self._device_id)
+        # Entities of a cached device list have no data before the first refresh
+        self._device_data: RaptDevice | None = (coordinator.data or {}).get(self._device_id)
+        self._restored_value: StateType = None
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, self._device_id)},
-            name=device.get("name"),
+            name=device.name,
             manufacturer="RAPT",
-            model=device.get("deviceType"),
-            sw_version=device.get("firmwareVersion"),
-            hw_version=device.get("id"),
+            model=device.device_type,
+            sw_version=device.firmware_version,
+            hw_version=device.id,
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Restore the last state when the device has no data yet."""
+        await super().async_added_to_hass()
+        if self._device_data is None and (last_data := await self.async_get_last_sensor_data()) is not None:
+            self._restored_value = last_data.native_value
+
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
         # Override CoordinatorEntity's default to check if *this* device has data
-        return self._device_id in self.coordinator.data
+        return self._device_data is not None or self._restored_value is not None
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        """Flag values served from the last successful poll or restored from before the restart."""
+        stale = self._device_data.stale if self._device_data is not None else self._restored_value is not None
+        return {"stale": True} if stale else None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle an update of this device's data."""
+        self._device_data = (self.coordinator.data or {}).get(self._device_id)
+        if self._device_data is not None:
+            self._restored_value = None
+        self.async_write_ha_state()
 
 
 class RaptTemperatureSensor(RaptBaseSensor):
@@ -91,7 +155,7 @@ class RaptTemperatureSensor(RaptBaseSensor):
     _attr_suggested_display_precision = 1
     # _attr_entity_registry_enabled_default = False # Optional: Disable by default
 
-    def __init__(self, coordinator: RaptDataUpdateCoordinator, device: dict) -> None:
+    def __init__(self, coordinator: RaptDataUpdateCoordinator, device: RaptDevice) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, device)
 
@@ -103,10 +167,9 @@ class RaptTemperatureSensor(RaptBaseSensor):
     @property
     def native_value(self) -> float | None:
         """Return the state of the sensor."""
-        # Access temperature from coordinator data
-        if self.coordinator.data and self._device_id in self.coordinator.data:
-            return self.coordinator.data[self._device_id].get("temperature")
-        return None
+        if self._device_data:
+            return self._device_data.temperature
+        return self._restored_value
 
 
 class RaptStatusSensor(RaptBaseSensor):
@@ -120,7 +183,7 @@ class RaptStatusSensor(RaptBaseSensor):
     # Define options if using ENUM
     # _attr_options = ["Mashing", "Boiling", "Fermenting", "Idle", "Error"]
 
-    def __init__(self, coordinator: RaptDataUpdateCoordinator, device: dict) -> None:
+    def __init__(self, coordinator: RaptDataUpdateCoordinator, device: RaptDevice) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, device)
 
@@ -132,10 +195,9 @@ class RaptStatusSensor(RaptBaseSensor):
     @property
     def native_value(self) -> str | None:
         """Return the state of the sensor."""
-        # Access status from coordinator data
-        if self.coordinator.data and self._device_id in self.coordinator.data:
-            return self.coordinator.data[self._device_id].get("status")
-        return None
+        if self._device_data:
+            return self._device_data.status
+        return self._restored_value
 
 
 class RaptGravitySensor(RaptBaseSensor):
@@ -146,7 +208,7 @@ class RaptGravitySensor(RaptBaseSensor):
     _attr_native_unit_of_measurement = "SG"
     _attr_suggested_display_precision = 3
 
-    def __init__(self, coordinator: RaptDataUpdateCoordinator, device: dict) -> None:
+    def __init__(self, coordinator: RaptDataUpdateCoordinator, device: RaptDevice) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, device)
 
@@ -158,9 +220,9 @@ class RaptGravitySensor(RaptBaseSensor):
     @property
     def native_value(self) -> float | None:
         """Return the state of the sensor."""
-        if self.coordinator.data and self._device_id in self.coordinator.data:
-            return self.coordinator.data[self._device_id].get("gravity")
-        return None
+        if self._device_data:
+            return self._device_data.gravity
+        return self._restored_value
 
 
 class RaptBatterySensor(RaptBaseSensor):
@@ -171,7 +233,7 @@ class RaptBatterySensor(RaptBaseSensor):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = PERCENTAGE
 
-    def __init__(self, coordinator: RaptDataUpdateCoordinator, device: dict) -> None:
+    def __init__(self, coordinator: RaptDataUpdateCoordinator, device: RaptDevice) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, device)
 
@@ -183,6 +245,219 @@ class RaptBatterySensor(RaptBaseSensor):
     @property
     def native_value(self) -> int | None:
         """Return the state of the sensor."""
-        if self.coordinator.data and self._device_id in self.coordinator.data:
-            return self.coordinator.data[self._device_id].get("battery")
-        return None
+        if self._device_data:
+            return self._device_data.battery
+        return self._restored_value
+
+
+class RaptFermentationSensor(RaptBaseSensor):
+    """Base class for the fermentation metrics of a hydrometer, computed by the coordinator."""
+
+    _key: str
+    # Metric of the fermentation tracker exposed by the sensor
+    _value_fn: Callable[[FermentationTracker], float | datetime | None]
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique ID to use for this entity."""
+        return f"{DOMAIN}_{self._device_id}_{self._key}"
+
+    @property
+    def native_value(self) -> StateType | datetime:
+        """Return the state of the sensor."""
+        if self._device_data:
+            tracker = self.coordinator.fermentation.get(self._device_id)
+            return self._value_fn(tracker) if tracker else None
+        return self._restored_value
+
+
+class RaptOriginalGravitySensor(RaptFermentationSensor):
+    """Original gravity of the batch, detected from the gravity readings."""
+
+    _attr_name = "Original gravity"
+    _attr_icon = "mdi:gauge-full"
+    _attr_native_unit_of_measurement = "SG"
+    _attr_suggested_display_precision = 3
+    _key = "original_gravity"
+    _value_fn = staticmethod(lambda tracker: tracker.original_gravity)
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the original gravity detected before the restart."""
+        await super().async_added_to_hass()
+        if (last_data := await self.async_get_last_sensor_data()) is not None and isinstance(
+            last_data.native_value, int | float
+        ):
+            self.coordinator.fermentation_tracker(self._device_id).restore_original_gravity(
+                float(last_data.native_value)
+            )
+
+
+class RaptAbvSensor(RaptFermentationSensor):
+    """Alcohol by volume of the batch."""
+
+    _attr_name = "Alcohol by volume"
+    _attr_icon = "mdi:glass-mug-variant"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_suggested_display_precision = 1
+    _key = "abv"
+    _value_fn = staticmethod(lambda tracker: tracker.abv)
+
+
+class RaptAttenuationSensor(RaptFermentationSensor):
+    """Apparent attenuation of the batch."""
+
+    _attr_name = "Apparent attenuation"
+    _attr_icon = "mdi:percent"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_suggested_display_precision = 0
+    _key = "apparent_attenuation"
+    _value_fn = staticmethod(lambda tracker: tracker.apparent_attenuation)
+
+
+class RaptGravityRateSensor(RaptFermentationSensor):
+    """Gravity change per day over the last day."""
+
+    _attr_name = "Gravity rate"
+    _attr_icon = "mdi:trending-down"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "SG/d"
+    _attr_suggested_display_precision = 4
+    _key = "gravity_rate"
+    _value_fn = staticmethod(lambda tracker: tracker.gravity_rate)
+
+
+class RaptPredictedFinalGravitySensor(RaptFermentationSensor):
+    """Final gravity of the batch, predicted from the gravity decay."""
+
+    _attr_name = "Predicted final gravity"
+    _attr_icon = "mdi:gauge-low"
+    _attr_native_unit_of_measurement = "SG"
+    _attr_suggested_display_precision = 3
+    _key = "predicted_final_gravity"
+    _value_fn = staticmethod(lambda tracker: forecast.final_gravity if (forecast := tracker.series.forecast) else None)
+
+
+class RaptFermentationEndSensor(RaptFermentationSensor):
+    """Estimated end of the fermentation, from the gravity decay."""
+
+    _attr_name = "Estimated fermentation end"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:flag-checkered"
+    _key = "fermentation_end"
+    _value_fn = staticmethod(lambda tracker: forecast.end if (forecast := tracker.series.forecast) else None)
+
+
+class RaptApiDiagnosticSensor(SensorEntity):
+    """Base class for sensors exposing the API client metrics.
+
+    They are polled by the platform rather than updated by the coordinator,
+    which skips notifying its listeners when no device changed.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _key: str
+
+    def __init__(self, coordinator: RaptDataUpdateCoordinator, entry_id: str) -> None:
+        """Initialize the sensor."""
+        self.coordinator = coordinator
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_{self._key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"{entry_id}_api")},
+            name="RAPT.io API",
+            manufacturer="RAPT",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+
+class RaptApiRequestsSensor(RaptApiDiagnosticSensor):
+    """Number of requests sent to the RAPT.io API."""
+
+    _attr_name = "API requests"
+    _attr_icon = "mdi:cloud-upload"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _key = "api_requests"
+
+    @property
+    def native_value(self) -> int:
+        """Return the state of the sensor."""
+        return self.coordinator.client.metrics.requests
+
+
+class RaptApiErrorsSensor(RaptApiDiagnosticSensor):
+    """Number of failed requests to the RAPT.io API."""
+
+    _attr_name = "API errors"
+    _attr_icon = "mdi:cloud-alert"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _key = "api_errors"
+
+    @property
+    def native_value(self) -> int:
+        """Return the state of the sensor."""
+        return self.coordinator.client.metrics.errors
+
+
+class RaptApiLatencySensor(RaptApiDiagnosticSensor):
+    """95th percentile latency of the RAPT.io API requests."""
+
+    _attr_name = "API latency p95"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_suggested_display_precision = 2
+    _key = "api_latency_p95"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self.coordinator.client.metrics.latency().percentile(95)
+
+
+class RaptApiBytesReceivedSensor(RaptApiDiagnosticSensor):
+    """Size of the responses received from the RAPT.io API."""
+
+    _attr_name = "API bytes received"
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+    _key = "api_bytes_received"
+
+    @property
+    def native_value(self) -> int:
+        """Return the state of the sensor."""
+        return self.coordinator.client.metrics.bytes_received
+
+
+class RaptPollCycleDurationSensor(RaptApiDiagnosticSensor):
+    """Duration of the last update cycle."""
+
+    _attr_name = "Poll cycle duration"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_suggested_display_precision = 2
+    _key = "poll_cycle_duration"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self.coordinator.last_poll_cycle_duration
+
+
+class RaptNextPollSensor(RaptApiDiagnosticSensor):
+    """Time of the next poll scheduled for the config entry."""
+
+    _attr_name = "Next poll"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:calendar-clock"
+    _key = "next_poll"
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return the state of the sensor."""
+        return self.coordinator.poll_slot.next_poll if self.coordinator.poll_slot else None
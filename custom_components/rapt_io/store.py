@@ -0,0 +1,115 @@
+"""Persistent storage for the RAPT.io integration."""
+
+import logging
+from datetime import datetime
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .models import DEVICE_MODELS, RaptDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Delay before writing a refreshed token, coalesces back-to-back refreshes
+TOKEN_SAVE_DELAY = 1  # seconds
+
+# Delay before writing a changed device list
+DEVICE_CACHE_SAVE_DELAY = 10  # seconds
+
+
+class RaptTokenStore:
+    """Persist the access token of a config entry across restarts."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the token store."""
+        self._store: Store[dict] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.token.{entry_id}", private=True)
+
+    async def async_load(self) -> tuple[str, datetime] | None:
+        """Return the stored token and its expiry, if any."""
+        data = await self._store.async_load()
+        if not data:
+            return None
+        access_token = data.get("access_token")
+        expires = dt_util.parse_datetime(data.get("expires") or "")
+        if not access_token or expires is None:
+            _LOGGER.debug("Ignoring incomplete stored token")
+            return None
+        return access_token, expires
+
+    @callback
+    def async_save(self, access_token: str, expires: datetime) -> None:
+        """Schedule saving a refreshed token."""
+        self._store.async_delay_save(
+            lambda: {"access_token": access_token, "expires": expires.isoformat()},
+            TOKEN_SAVE_DELAY,
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the stored token."""
+        await self._store.async_remove()
+
+
+class RaptDeviceCache:
+    """Persist the device list of a config entry, to create its entities before the first refresh.
+
+    Only the device identity is cached (endpoint, ID, type, name and firmware);
+    the last sensor values are restored by the entities themselves.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the device cache."""
+        self._store: Store[dict] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.devices.{entry_id}")
+        self._saved: list[tuple] | None = None
+
+    async def async_load(self) -> dict[str, list[RaptDevice]] | None:
+        """Return the cached devices of each endpoint, if any."""
+        data = await self._store.async_load()
+        if not data:
+            return None
+        endpoint_devices: dict[str, list[RaptDevice]] = {}
+        for item in data.get("devices", []):
+            if not item.get("id") or not item.get("endpoint"):
+                continue
+            model = DEVICE_MODELS.get(item.get("device_type"), RaptDevice)
+            device = model(
+                id=item["id"],
+                device_type=item.get("device_type"),
+                name=item.get("name"),
+                firmware_version=item.get("firmware_version"),
+            )
+            endpoint_devices.setdefault(item["endpoint"], []).append(device)
+        self._saved = self._identity(endpoint_devices)
+        return endpoint_devices
+
+    @callback
+    def async_save(self, endpoint_devices: dict[str, list[RaptDevice]]) -> None:
+        """Schedule saving the device list, if the device identities changed."""
+        identity = self._identity(endpoint_devices)
+        if identity == self._saved:
+            return
+        self._saved = identity
+        self._store.async_delay_save(
+            lambda: {
+                "devices": [
+                    dict(zip(("endpoint", "id", "device_type", "name", "firmware_version"), item)) for item in identity
+                ]
+            },
+            DEVICE_CACHE_SAVE_DELAY,
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the cached device list."""
+        await self._store.async_remove()
+
+    @staticmethod
+    def _identity(endpoint_devices: dict[str, list[RaptDevice]]) -> list[tuple]:
+        """Return the cached fields of the devices."""
+        return [
+            (endpoint, device.id, device.device_type, device.name, device.firmware_version)
+            for endpoint, devices in endpoint_devices.items()
+            for device in devices
+        ]
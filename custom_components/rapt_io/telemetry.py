@@ -0,0 +1,170 @@
+"""Import RAPT.io telemetry history into Home Assistant long-term statistics."""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import PERCENTAGE, UnitOfTemperature
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .api import RaptApiError
+from .const import DOMAIN
+from .coordinator import RaptDataUpdateCoordinator
+from .models import RaptDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# How often new telemetry is imported
+TELEMETRY_SYNC_INTERVAL = timedelta(hours=1)
+
+# History imported for devices seen for the first time
+INITIAL_BACKFILL = timedelta(days=7)
+
+# Longest time range requested in a single telemetry call
+MAX_TELEMETRY_WINDOW = timedelta(days=7)
+
+# Telemetry fields imported per device type: (field, name, unit)
+TELEMETRY_FIELDS: dict[str, tuple[tuple[str, str, str], ...]] = {
+    "BrewZilla": (("temperature", "Temperature", UnitOfTemperature.CELSIUS),),
+    "Hydrometer": (
+        ("temperature", "Temperature", UnitOfTemperature.CELSIUS),
+        ("gravity", "Gravity", "SG"),
+        ("battery", "Battery", PERCENTAGE),
+    ),
+    "BLETemperature": (
+        ("temperature", "Temperature", UnitOfTemperature.CELSIUS),
+        ("battery", "Battery", PERCENTAGE),
+    ),
+}
+
+
+def _telemetry_store(hass: HomeAssistant, entry_id: str) -> Store[dict]:
+    """Return the store holding the telemetry sync state of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.telemetry.{entry_id}")
+
+
+async def async_remove_telemetry_state(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the telemetry sync state of a config entry."""
+    await _telemetry_store(hass, entry_id).async_remove()
+
+
+def statistic_id(device_id: str, field: str) -> str:
+    """Return the external statistic ID of a device telemetry field."""
+    return f"{DOMAIN}:{slugify(device_id)}_{field}"
+
+
+def hourly_statistics(points: list[dict], field: str) -> list[StatisticData]:
+    """Aggregate telemetry points into hourly mean/min/max statistics."""
+    buckets: dict[datetime, list[float]] = {}
+    for point in points:
+        value = point.get(field)
+        created_on = point.get("createdOn")
+        if value is None or not created_on or (timestamp := dt_util.parse_datetime(created_on)) is None:
+            continue
+        hour = dt_util.as_utc(timestamp).replace(minute=0, second=0, microsecond=0)
+        buckets.setdefault(hour, []).append(float(value))
+    return [
+        StatisticData(start=hour, mean=sum(values) / len(values), min=min(values), max=max(values))
+        for hour, values in sorted(buckets.items())
+    ]
+
+
+class RaptTelemetrySync:
+    """Incrementally import device telemetry into recorder statistics.
+
+    Only complete hours are imported. The end of the last imported hour is
+    remembered per device, so each sync only fetches newer telemetry and a sync
+    after downtime backfills the whole gap in one pass.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, coordinator: RaptDataUpdateCoordinator) -> None:
+        """Initialize the telemetry sync."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._store = _telemetry_store(hass, entry_id)
+        self._last_imported: dict[str, datetime] | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_sync(self, _now: datetime | None = None) -> None:
+        """Import the telemetry of all devices up to the last complete hour."""
+        if self._lock.locked():
+            _LOGGER.debug("Telemetry sync already running")
+            return
+        async with self._lock:
+            if self._last_imported is None:
+                self._last_imported = await self._async_load()
+            end = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+            await asyncio.gather(*(self._async_sync_device(device, end) for device in self._coordinator.devices))
+            self._store.async_delay_save(self._data_to_save, 10)
+
+    async def _async_sync_device(self, device: RaptDevice, end: datetime) -> None:
+        """Import the telemetry of a device up to end."""
+        device_id = device.id
+        fields = TELEMETRY_FIELDS.get(device.device_type)
+        fetch = self._telemetry_fetcher(device.device_type)
+        if not fields or fetch is None:
+            return
+
+        start = self._last_imported.get(device_id, end - INITIAL_BACKFILL)
+        points: list[dict] = []
+        window_start = start
+        while window_start < end:
+            window_end = min(window_start + MAX_TELEMETRY_WINDOW, end)
+            try:
+                points.extend(await fetch(device_id, window_start, window_end))
+            except RaptApiError as err:
+                _LOGGER.warning("Failed to fetch telemetry of %s: %s", device.name or device_id, err)
+                break
+            window_start = window_end
+        if window_start <= start:
+            return
+
+        for field, name, unit in fields:
+            statistics = [
+                statistic
+                for statistic in hourly_statistics(points, field)
+                if start <= statistic["start"] < window_start
+            ]
+            if not statistics:
+                continue
+            metadata = StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=f"{device.name or device_id} {name}",
+                source=DOMAIN,
+                statistic_id=statistic_id(device_id, field),
+                unit_of_measurement=unit,
+            )
+            async_add_external_statistics(self._hass, metadata, statistics)
+        _LOGGER.debug("Imported telemetry of %s from %s to %s", device_id, start, window_start)
+        self._last_imported[device_id] = window_start
+
+    def _telemetry_fetcher(self, device_type: str | None) -> Callable[..., Awaitable[list[dict]]] | None:
+        """Return the client method fetching the telemetry of a device type."""
+        client = self._coordinator.client
+        return {
+            "BrewZilla": client.get_brewzilla_telemetry,
+            "Hydrometer": client.get_hydrometer_telemetry,
+            "BLETemperature": client.get_bonded_device_telemetry,
+        }.get(device_type)
+
+    async def _async_load(self) -> dict[str, datetime]:
+        """Load the last imported time of each device."""
+        data = await self._store.async_load() or {}
+        last_imported = {}
+        for device_id, value in data.get("last_imported", {}).items():
+            if (timestamp := dt_util.parse_datetime(value)) is not None:
+                last_imported[device_id] = timestamp
+        return last_imported
+
+    def _data_to_save(self) -> dict:
+        """Return the data to persist."""
+        return {"last_imported": {device_id: value.isoformat() for device_id, value in self._last_imported.items()}}
@@ -0,0 +1,77 @@
+"""Ingestion of RAPT.io telemetry pushed to a Home Assistant webhook."""
+
+import hmac
+import logging
+from collections.abc import Callable
+from http import HTTPStatus
+
+import voluptuous as vol
+from aiohttp import web
+
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant, callback
+
+from .const import CONF_WEBHOOK_SECRET, DOMAIN
+from .coordinator import RaptDataUpdateCoordinator
+from .models import parse_telemetry_point
+from .payload import decode_json
+
+_LOGGER = logging.getLogger(__name__)
+
+# Header carrying the shared secret, it can also be passed as the "secret" query parameter
+WEBHOOK_SECRET_HEADER = "X-Rapt-Secret"
+
+
+def _has_device_id(point: dict) -> dict:
+    """Check that a telemetry point names its device."""
+    if not point.get("id") and not point.get("deviceId"):
+        raise vol.Invalid("telemetry point without a device ID")
+    return point
+
+
+# A push holds one telemetry point or a list of them
+TELEMETRY_POINT_SCHEMA = vol.All(
+    vol.Schema({vol.Optional("id"): str, vol.Optional("deviceId"): str}, extra=vol.ALLOW_EXTRA), _has_device_id
+)
+WEBHOOK_SCHEMA = vol.Schema(vol.Any([TELEMETRY_POINT_SCHEMA], TELEMETRY_POINT_SCHEMA))
+
+
+@callback
+def async_register_webhook(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: RaptDataUpdateCoordinator
+) -> Callable[[], None]:
+    """Register the webhook of a config entry, return a callback unregistering it."""
+    webhook_id = entry.data[CONF_WEBHOOK_ID]
+    secret = entry.options[CONF_WEBHOOK_SECRET].encode()
+
+    async def async_handle_webhook(hass: HomeAssistant, webhook_id: str, request: web.Request) -> web.Response:
+        """Merge pushed telemetry into the coordinator data."""
+        provided = request.headers.get(WEBHOOK_SECRET_HEADER) or request.query.get("secret", "")
+        if not hmac.compare_digest(provided.encode(), secret):
+            _LOGGER.warning("Rejected RAPT.io webhook push with an invalid secret from %s", request.remote)
+            return web.Response(status=HTTPStatus.UNAUTHORIZED)
+
+        try:
+            points = WEBHOOK_SCHEMA(decode_json(await request.read()))
+        except (ValueError, vol.Invalid) as err:
+            _LOGGER.warning("Rejected invalid RAPT.io webhook push: %s", err)
+            return web.Response(status=HTTPStatus.BAD_REQUEST)
+
+        coordinator.async_push(
+            [parse_telemetry_point(point) for point in ([points] if isinstance(points, dict) else points)]
+        )
+        return web.Response(status=HTTPStatus.OK)
+
+    webhook.async_register(
+        hass, DOMAIN, "RAPT.io", webhook_id, async_handle_webhook, allowed_methods=[web.hdrs.METH_POST]
+    )
+    _LOGGER.info("Receiving RAPT.io telemetry pushes at %s", webhook.async_generate_path(webhook_id))
+
+    @callback
+    def async_unregister_webhook() -> None:
+        """Unregister the webhook."""
+        webhook.async_unregister(hass, webhook_id)
+
+    return async_unregister_webhook
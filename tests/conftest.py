@@ -41,9 +41,17 @@ def skip_notifications_fixture() -> Generator:
         yield
 
 
+# This fixture points the config directory at a temporary directory, so that the history database
+# created by each config entry setup doesn't end up in the shared testing config of the plugin.
+@pytest.fixture(name="config_dir")
+def config_dir_fixture(hass, tmp_path) -> None:
+    """Use a temporary config directory."""
+
+
 @pytest.fixture(autouse=True)
 def rapt_io_fixture(
     skip_notifications: Any,
+    config_dir: Any,
     enable_custom_integrations: Any,  # noqa: F811
     hass: Any,
 ) -> None:
@@ -0,0 +1,198 @@
+"""Local stand-in for the api.rapt.io and id.rapt.io services.
+
+Serves the token, device list and telemetry endpoints used by RaptApiClient
+for a configurable number of accounts and devices, with optional latency,
+server errors, rate limiting and short-lived tokens.
+"""
+
+import asyncio
+import random
+import secrets
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+
+DEVICE_TYPES = ("BrewZilla", "BLETemperature", "Hydrometer")
+
+LIST_ROUTES = {
+    "/api/BrewZillas/GetBrewZillas": "BrewZilla",
+    "/api/BondedDevices/GetBondedDevices": "BLETemperature",
+    "/api/Hydrometers/GetHydrometers": "Hydrometer",
+}
+
+TELEMETRY_ROUTES = {
+    "/api/BrewZillas/GetTelemetry": "brewZillaId",
+    "/api/BondedDevices/GetTelemetry": "bondedDeviceId",
+    "/api/Hydrometers/GetTelemetry": "hydrometerId",
+}
+
+
+@dataclass
+class MockRaptConfig:
+    """Behaviour of the mock RAPT services."""
+
+    accounts: int = 1
+    devices_per_account: int = 3
+    # Response latency, uniformly drawn between latency and latency + latency_jitter
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    # Fraction of API requests answered with a 503
+    error_rate: float = 0.0
+    # Fraction of API requests answered with a 429
+    rate_limit_rate: float = 0.0
+    retry_after: int = 0
+    # Lifetime of issued access tokens
+    token_lifetime: int = 3600
+    # Telemetry points per device and hour
+    telemetry_per_hour: int = 4
+
+
+@dataclass
+class MockRaptServer:
+    """aiohttp application serving the mock RAPT endpoints."""
+
+    config: MockRaptConfig = field(default_factory=MockRaptConfig)
+    requests: Counter = field(default_factory=Counter)
+
+    def __post_init__(self) -> None:
+        """Create the accounts and their devices."""
+        self._tokens: dict[str, tuple[str, float]] = {}
+        self._devices: dict[str, list[dict]] = {}
+        now = datetime.now(timezone.utc)
+        for account in range(self.config.accounts):
+            username = self.username(account)
+            self._devices[username] = [
+                {
+                    "id": f"{username}-device-{index}",
+                    "name": f"Device {account}.{index}",
+                    "deviceType": DEVICE_TYPES[index % len(DEVICE_TYPES)],
+                    "firmwareVersion": "1.0.0",
+                    "lastActivityTime": now.isoformat(),
+                    "status": "Idle",
+                    "temperature": 20.0,
+                    "gravity": 1.050,
+                    "battery": 100,
+                }
+                for index in range(self.config.devices_per_account)
+            ]
+        # Statuses answered to the next API requests, before any random failure
+        self._scripted_failures: deque[int] = deque()
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+
+    @staticmethod
+    def username(account: int) -> str:
+        """Return the username of an account."""
+        return f"user{account}@example.com"
+
+    @property
+    def total_requests(self) -> int:
+        """Return the number of requests served."""
+        return sum(self.requests.values())
+
+    async def start(self) -> str:
+        """Start serving on a random local port and return the base URL."""
+        app = web.Application()
+        app.router.add_post("/connect/token", self._handle_token)
+        for path in LIST_ROUTES:
+            app.router.add_get(path, self._handle_list)
+        for path in TELEMETRY_ROUTES:
+            app.router.add_get(path, self._handle_telemetry)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def advance_devices(self) -> None:
+        """Simulate a new report from every device."""
+        now = datetime.now(timezone.utc).isoformat()
+        for devices in self._devices.values():
+            for device in devices:
+                device["lastActivityTime"] = now
+                device["temperature"] = round(device["temperature"] + random.uniform(-0.2, 0.2), 2)
+                device["gravity"] = round(device["gravity"] - 0.0005, 4)
+
+    def fail_next(self, *statuses: int) -> None:
+        """Answer the next API requests with the given statuses, 429 or 503."""
+        self._scripted_failures.extend(statuses)
+
+    async def _delay(self) -> None:
+        """Apply the configured latency."""
+        if self.config.latency or self.config.latency_jitter:
+            await asyncio.sleep(self.config.latency + random.uniform(0, self.config.latency_jitter))
+
+    async def _handle_token(self, request: web.Request) -> web.Response:
+        """Issue an access token for a known account."""
+        self.requests[request.path] += 1
+        await self._delay()
+        form = await request.post()
+        username = form.get("username")
+        if form.get("grant_type") != "password" or username not in self._devices:
+            return web.json_response({"error": "invalid_grant"}, status=400)
+        token = secrets.token_hex(16)
+        self._tokens[token] = (username, time.monotonic() + self.config.token_lifetime)
+        return web.json_response(
+            {"access_token": token, "expires_in": self.config.token_lifetime, "token_type": "Bearer"}
+        )
+
+    def _authorize(self, request: web.Request) -> str | None:
+        """Return the account of a valid bearer token."""
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        username, expires = self._tokens.get(token, (None, 0.0))
+        if username is None or expires < time.monotonic():
+            return None
+        return username
+
+    def _injected_failure(self) -> web.Response | None:
+        """Return a rate limit or server error response, if one is due."""
+        status = self._scripted_failures.popleft() if self._scripted_failures else None
+        roll = random.random()
+        if status == 429 or (status is None and roll < self.config.rate_limit_rate):
+            return web.Response(status=429, headers={"Retry-After": str(self.config.retry_after)})
+        if status == 503 or (status is None and roll < self.config.rate_limit_rate + self.config.error_rate):
+            return web.Response(status=503)
+        return None
+
+    async def _handle_list(self, request: web.Request) -> web.Response:
+        """Return the devices of a type for the authorized account."""
+        self.requests[request.path] += 1
+        await self._delay()
+        if (username := self._authorize(request)) is None:
+            return web.Response(status=401)
+        if (failure := self._injected_failure()) is not None:
+            return failure
+        device_type = LIST_ROUTES[request.path]
+        return web.json_response([device for device in self._devices[username] if device["deviceType"] == device_type])
+
+    async def _handle_telemetry(self, request: web.Request) -> web.Response:
+        """Return generated telemetry of a device between two dates."""
+        self.requests[request.path] += 1
+        await self._delay()
+        if (username := self._authorize(request)) is None:
+            return web.Response(status=401)
+        if (failure := self._injected_failure()) is not None:
+            return failure
+        device_id = request.query.get(TELEMETRY_ROUTES[request.path])
+        if device_id not in {device["id"] for device in self._devices[username]}:
+            return web.Response(status=404)
+        start = datetime.fromisoformat(request.query["startDate"])
+        end = datetime.fromisoformat(request.query["endDate"])
+        step = timedelta(hours=1) / self.config.telemetry_per_hour
+        points = []
+        timestamp = start
+        while timestamp < end:
+            points.append({"createdOn": timestamp.isoformat(), "temperature": 20.0, "gravity": 1.050, "battery": 100})
+            timestamp += step
+        return web.json_response(points)
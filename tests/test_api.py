@@ -1,9 +1,29 @@
 """Tests for the RAPT.io API client."""
 
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+
 import pytest
-from unittest.mock import patch, AsyncMock
+from unittest.mock import patch, AsyncMock, MagicMock
+
+from aiohttp import ClientResponseError
 
-from custom_components.rapt_io.api import RaptApiClient, RaptApiError, RaptAuthError
+from custom_components.rapt_io.api import (
+    DNS_CACHE_TTL,
+    HEDGE_MIN_SAMPLES,
+    KEEPALIVE_TIMEOUT,
+    MAX_RETRIES,
+    MAX_RETRY_AFTER,
+    TELEMETRY_TIMEOUT,
+    RaptApiClient,
+    RaptApiError,
+    RaptAuthError,
+    RaptConnectionError,
+)
+from custom_components.rapt_io.payload import PAYLOAD_LOG_MAX_BYTES, PayloadLogger
+from custom_components.rapt_io.ratelimit import RequestBudget
 
 
 async def test_api_client_authentication(hass):
@@ -75,3 +95,287 @@ async def test_api_client_request_error(hass):
         client._auth_token = "test_token"  # Simulate authentication
         with pytest.raises(RaptApiError):
             await client.get_brewzillas()
+
+
+async def test_api_client_concurrent_requests_authenticate_once(hass):
+    """Test that concurrent requests share a single authentication."""
+
+    async def fake_request(method, url, data=None, is_auth=False, **kwargs):
+        if is_auth:
+            await asyncio.sleep(0)
+            return {"access_token": "test_token", "expires_in": 3600}
+        return []
+
+    with patch(
+        "custom_components.rapt_io.api.RaptApiClient._request",
+        new_callable=AsyncMock,
+        side_effect=fake_request,
+    ) as mock_request:
+        client = RaptApiClient(
+            username="test_username",
+            api_key="test_api_key",
+            session=hass.helpers.aiohttp_client.async_get_clientsession(),
+        )
+        await asyncio.gather(
+            client.get_brewzillas(),
+            client.get_bonded_devices(),
+            client.get_hydrometers(),
+        )
+        auth_calls = [call for call in mock_request.call_args_list if call.kwargs.get("is_auth")]
+        assert len(auth_calls) == 1
+        assert client._auth_token == "test_token"
+
+
+async def test_api_client_restored_token_skips_authentication(hass):
+    """Test that a restored, unexpired token is used without authenticating."""
+    with patch(
+        "custom_components.rapt_io.api.RaptApiClient._request",
+        new_callable=AsyncMock,
+        return_value=[],
+    ) as mock_request:
+        client = RaptApiClient(
+            username="test_username",
+            api_key="test_api_key",
+            session=hass.helpers.aiohttp_client.async_get_clientsession(),
+        )
+        assert client.restore_token("stored_token", datetime.now(timezone.utc) + timedelta(minutes=30))
+        await client.get_brewzillas()
+        mock_request.assert_called_once()
+        assert not mock_request.call_args.kwargs.get("is_auth")
+
+
+async def test_api_client_expired_token_not_restored(hass):
+    """Test that an expired stored token is ignored."""
+    client = RaptApiClient(
+        username="test_username",
+        api_key="test_api_key",
+        session=hass.helpers.aiohttp_client.async_get_clientsession(),
+    )
+    assert not client.restore_token("stored_token", datetime.now(timezone.utc) - timedelta(minutes=1))
+    assert client._auth_token is None
+
+
+def _mock_response(status: int, payload=None, headers=None) -> MagicMock:
+    """Return a mocked aiohttp response context manager."""
+    response = MagicMock()
+    response.status = status
+    response.headers = headers or {}
+    if status >= 400:
+        response.raise_for_status.side_effect = ClientResponseError(
+            MagicMock(), (), status=status, headers=response.headers
+        )
+    response.read = AsyncMock(return_value=json.dumps(payload).encode() if payload is not None else b"")
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=response)
+    context.__aexit__ = AsyncMock(return_value=False)
+    return context
+
+
+async def test_api_client_retries_rate_limited_request():
+    """Test that a 429 response is retried after the Retry-After delay."""
+    session = MagicMock()
+    session.request.side_effect = [
+        _mock_response(429, headers={"Retry-After": "0"}),
+        _mock_response(200, payload=[{"id": "brewzilla_1"}]),
+    ]
+    client = RaptApiClient(username="test_username", api_key="test_api_key", session=session)
+    client._auth_token = "test_token"
+
+    brewzillas = await client.get_brewzillas()
+
+    assert brewzillas == [{"id": "brewzilla_1"}]
+    assert session.request.call_count == 2
+
+
+async def test_api_client_bounds_pause_of_long_retry_after():
+    """Test that a Retry-After too long to wait for fails the request and pauses the budget at most MAX_RETRY_AFTER."""
+    session = MagicMock()
+    session.request.side_effect = [_mock_response(429, headers={"Retry-After": "86400"})]
+    client = RaptApiClient(username="test_username", api_key="test_api_key", session=session)
+    client._auth_token = "test_token"
+
+    with pytest.raises(RaptApiError):
+        await client.get_brewzillas()
+
+    assert session.request.call_count == 1
+    assert 0 < client.rate_limit_state["paused_for"] <= MAX_RETRY_AFTER
+
+
+async def test_api_client_gives_up_on_persistent_server_errors():
+    """Test that transient server errors are retried a bounded number of times."""
+    session = MagicMock()
+    session.request.side_effect = [_mock_response(503) for _ in range(MAX_RETRIES + 1)]
+    client = RaptApiClient(username="test_username", api_key="test_api_key", session=session)
+    client._auth_token = "test_token"
+
+    with patch("custom_components.rapt_io.api.backoff_delay", return_value=0), pytest.raises(RaptConnectionError):
+        await client.get_brewzillas()
+    assert session.request.call_count == MAX_RETRIES + 1
+
+
+def test_request_budget_state():
+    """Test that the request budget reports its state."""
+    budget = RequestBudget(6)
+    budget.pause(30)
+
+    state = budget.state
+    assert state["requests_per_minute"] == 6
+    assert state["available"] == 6
+    assert 0 < state["paused_for"] <= 30
+
+
+async def test_api_client_deduplicates_inflight_requests(hass):
+    """Test that identical concurrent GET requests share one HTTP request."""
+
+    async def slow_response(*args):
+        await asyncio.sleep(0)
+        return [{"id": "brewzilla_1"}]
+
+    with patch(
+        "custom_components.rapt_io.api.RaptApiClient._request_once",
+        new_callable=AsyncMock,
+        side_effect=slow_response,
+    ) as mock_request:
+        client = RaptApiClient(
+            username="test_username",
+            api_key="test_api_key",
+            session=hass.helpers.aiohttp_client.async_get_clientsession(),
+        )
+        client._auth_token = "test_token"  # Simulate authentication
+        first, second = await asyncio.gather(client.get_brewzillas(), client.get_brewzillas())
+
+        assert first == second == [{"id": "brewzilla_1"}]
+        mock_request.assert_called_once()
+
+
+async def test_api_client_rejects_invalid_responses():
+    """Test that undecodable or unexpectedly shaped responses raise an API error."""
+    session = MagicMock()
+    invalid_json = _mock_response(200)
+    invalid_json.__aenter__.return_value.read = AsyncMock(return_value=b"<html>")
+    session.request.side_effect = [invalid_json, _mock_response(200, payload={"id": "brewzilla_1"})]
+    client = RaptApiClient(username="test_username", api_key="test_api_key", session=session)
+    client._auth_token = "test_token"
+
+    with pytest.raises(RaptApiError, match="Invalid JSON"):
+        await client.get_brewzillas()
+    with pytest.raises(RaptApiError, match="Unexpected format"):
+        await client.get_brewzillas()
+
+
+def test_payload_logger_samples_and_truncates(caplog):
+    """Test that response bodies are only logged at debug level, sampled and size-capped."""
+    logger = logging.getLogger("custom_components.rapt_io.test_payload")
+    payload_logger = PayloadLogger(logger, sample_rate=2)
+    body = b"x" * (PAYLOAD_LOG_MAX_BYTES + 1)
+
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        payload_logger.log("https://api.rapt.io", body)
+    assert not caplog.records
+
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        for _ in range(3):
+            payload_logger.log("https://api.rapt.io", body)
+    assert len(caplog.records) == 2
+    assert caplog.records[0].getMessage().endswith(f"... ({len(body)} bytes)")
+
+
+async def test_api_client_owns_tuned_session():
+    """Test that a client without a session creates a keep-alive, DNS caching session and closes it."""
+    ssl_context = MagicMock()
+    with (
+        patch("custom_components.rapt_io.api.aiohttp.TCPConnector") as mock_connector,
+        patch("custom_components.rapt_io.api.aiohttp.ClientSession") as mock_session,
+    ):
+        mock_session.return_value.close = AsyncMock()
+        client = RaptApiClient(username="test_username", api_key="test_api_key", ssl_context=ssl_context)
+
+        await client.close()
+
+    connector_kwargs = mock_connector.call_args.kwargs
+    assert connector_kwargs["ssl"] is ssl_context
+    assert connector_kwargs["keepalive_timeout"] == KEEPALIVE_TIMEOUT
+    assert connector_kwargs["ttl_dns_cache"] == DNS_CACHE_TTL
+    mock_session.assert_called_once_with(connector=mock_connector.return_value)
+    mock_session.return_value.close.assert_awaited_once()
+
+
+async def test_api_client_leaves_passed_session_open():
+    """Test that a session passed to the client is not closed by it."""
+    session = MagicMock()
+    session.close = AsyncMock()
+    client = RaptApiClient(username="test_username", api_key="test_api_key", session=session)
+
+    await client.close()
+
+    session.close.assert_not_called()
+
+
+async def test_api_client_telemetry_timeout():
+    """Test that telemetry requests use their own timeout."""
+    session = MagicMock()
+    session.request.return_value = _mock_response(200, payload=[])
+    client = RaptApiClient(username="test_username", api_key="test_api_key", session=session)
+    client._auth_token = "test_token"
+    client._token_expires = datetime.now(timezone.utc) + timedelta(hours=1)
+
+    now = datetime.now(timezone.utc)
+    await client.get_hydrometer_telemetry("pill", now - timedelta(hours=1), now)
+
+    assert session.request.call_args.kwargs["timeout"] is TELEMETRY_TIMEOUT
+
+
+async def test_api_client_hedges_slow_request():
+    """Test that a request slower than the hedge percentile is duplicated and the first response wins."""
+    never = asyncio.Event()
+    slow_response = _mock_response(200, payload=[{"id": "slow"}])
+    slow_response.__aenter__.return_value.read = AsyncMock(side_effect=never.wait)
+    session = MagicMock()
+    session.request.side_effect = [slow_response, _mock_response(200, payload=[{"id": "brewzilla_1"}])]
+    client = RaptApiClient(username="test_username", api_key="test_api_key", session=session, hedge_percentile=95)
+    client._auth_token = "test_token"
+    endpoint = "/api/BrewZillas/GetBrewZillas"
+    for _ in range(HEDGE_MIN_SAMPLES):
+        client.metrics.record_response(endpoint, 0.05, 100)
+
+    brewzillas = await client.get_brewzillas()
+
+    assert brewzillas == [{"id": "brewzilla_1"}]
+    assert session.request.call_count == 2
+    assert client.metrics.endpoints[endpoint].hedges == 1
+    assert client.metrics.endpoints[endpoint].hedge_wins == 1
+
+
+async def test_api_client_does_not_hedge_telemetry():
+    """Test that slow telemetry downloads are never duplicated."""
+
+    async def slow_read():
+        await asyncio.sleep(0.3)
+        return b"[]"
+
+    slow_response = _mock_response(200)
+    slow_response.__aenter__.return_value.read = AsyncMock(side_effect=slow_read)
+    session = MagicMock()
+    session.request.return_value = slow_response
+    client = RaptApiClient(username="test_username", api_key="test_api_key", session=session, hedge_percentile=95)
+    client._auth_token = "test_token"
+    client._token_expires = datetime.now(timezone.utc) + timedelta(hours=1)
+    for _ in range(HEDGE_MIN_SAMPLES):
+        client.metrics.record_response("/api/Hydrometers/GetTelemetry", 0.05, 100)
+
+    now = datetime.now(timezone.utc)
+    assert await client.get_hydrometer_telemetry("pill", now - timedelta(hours=1), now) == []
+
+    assert session.request.call_count == 1
+
+
+async def test_api_client_does_not_hedge_without_latency_history():
+    """Test that requests are not hedged before enough latency samples were observed."""
+    session = MagicMock()
+    session.request.return_value = _mock_response(200, payload=[])
+    client = RaptApiClient(username="test_username", api_key="test_api_key", session=session, hedge_percentile=95)
+    client._auth_token = "test_token"
+
+    await client.get_brewzillas()
+
+    assert session.request.call_count == 1
@@ -0,0 +1,128 @@
+"""Load benchmarks of the RAPT.io request path against a local mock RAPT API.
+
+Skipped unless RAPT_BENCHMARK is set. The load is controlled with the
+RAPT_BENCHMARK_ACCOUNTS, RAPT_BENCHMARK_DEVICES, RAPT_BENCHMARK_CYCLES and
+RAPT_BENCHMARK_LATENCY (seconds) environment variables:
+
+    RAPT_BENCHMARK=1 pytest tests/test_benchmark.py
+"""
+
+import asyncio
+import os
+import statistics
+import time
+import tracemalloc
+
+import aiohttp
+import pytest
+
+from custom_components.rapt_io.api import RaptApiClient
+from custom_components.rapt_io.coordinator import RaptDataUpdateCoordinator
+
+from .rapt_mock_server import MockRaptConfig, MockRaptServer
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("RAPT_BENCHMARK"), reason="set RAPT_BENCHMARK=1 to run the load benchmarks"
+)
+
+ACCOUNTS = int(os.environ.get("RAPT_BENCHMARK_ACCOUNTS", "10"))
+DEVICES = int(os.environ.get("RAPT_BENCHMARK_DEVICES", "9"))
+CYCLES = int(os.environ.get("RAPT_BENCHMARK_CYCLES", "20"))
+LATENCY = float(os.environ.get("RAPT_BENCHMARK_LATENCY", "0.05"))
+
+
+def _report(capsys: pytest.CaptureFixture, name: str, latencies: list[float], requests: int, peak_memory: int) -> None:
+    """Write the latency percentiles, request count and memory use of a run to the terminal."""
+    quantiles = statistics.quantiles(latencies, n=100)
+    with capsys.disabled():
+        print(
+            f"\n{name}: {ACCOUNTS} accounts x {DEVICES} devices, {len(latencies)} poll cycles\n"
+            f"  latency p50={quantiles[49] * 1000:.1f}ms p95={quantiles[94] * 1000:.1f}ms "
+            f"p99={quantiles[98] * 1000:.1f}ms max={max(latencies) * 1000:.1f}ms\n"
+            f"  requests per cycle={requests / len(latencies):.2f}\n"
+            f"  peak traced memory={peak_memory / 1024:.0f} KiB"
+        )
+
+
+@pytest.fixture(name="mock_server")
+async def mock_server_fixture(socket_enabled):
+    """Start the mock RAPT API."""
+    server = MockRaptServer(
+        MockRaptConfig(
+            accounts=ACCOUNTS,
+            devices_per_account=DEVICES,
+            latency=LATENCY,
+            latency_jitter=LATENCY,
+            error_rate=0.01,
+            token_lifetime=120,
+        )
+    )
+    await server.start()
+    yield server
+    await server.stop()
+
+
+async def _timed(coro) -> float:
+    """Return the time taken to await a coroutine."""
+    start = time.perf_counter()
+    await coro
+    return time.perf_counter() - start
+
+
+def _clients(server: MockRaptServer, session: aiohttp.ClientSession) -> list[RaptApiClient]:
+    """Return one API client per mock account."""
+    return [
+        RaptApiClient(
+            username=server.username(account),
+            api_key="secret",
+            session=session,
+            request_budget=600,
+            base_url=server.base_url,
+            auth_url=server.base_url,
+        )
+        for account in range(ACCOUNTS)
+    ]
+
+
+async def test_benchmark_client_poll_cycle(mock_server, capsys):
+    """Measure the poll cycle of RaptApiClient alone, all accounts polling concurrently."""
+    async with aiohttp.ClientSession() as session:
+        clients = _clients(mock_server, session)
+        latencies = []
+        tracemalloc.start()
+        for _ in range(CYCLES):
+            mock_server.advance_devices()
+            latencies.extend(
+                await asyncio.gather(
+                    *(
+                        _timed(
+                            asyncio.gather(
+                                client.get_brewzillas(), client.get_bonded_devices(), client.get_hydrometers()
+                            )
+                        )
+                        for client in clients
+                    )
+                )
+            )
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    _report(capsys, "RaptApiClient", latencies, mock_server.total_requests, peak)
+
+
+async def test_benchmark_coordinator_poll_cycle(hass, mock_server, capsys):
+    """Measure the poll cycle of RaptDataUpdateCoordinator, all accounts polling concurrently."""
+    async with aiohttp.ClientSession() as session:
+        coordinators = [RaptDataUpdateCoordinator(hass, client, 60) for client in _clients(mock_server, session)]
+        latencies = []
+        tracemalloc.start()
+        for _ in range(CYCLES):
+            mock_server.advance_devices()
+            latencies.extend(
+                await asyncio.gather(*(_timed(coordinator.async_refresh()) for coordinator in coordinators))
+            )
+            assert all(coordinator.last_update_success for coordinator in coordinators)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    _report(capsys, "RaptDataUpdateCoordinator", latencies, mock_server.total_requests, peak)
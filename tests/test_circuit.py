@@ -0,0 +1,30 @@
+"""Tests for the RAPT.io circuit breaker."""
+
+import logging
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.rapt_io.circuit import FAILURE_THRESHOLD, PROBE_INTERVAL, CircuitBreaker
+
+
+def test_circuit_opens_after_repeated_failures(caplog):
+    """Test that the circuit opens, probes at a reduced rate and logs the outage once."""
+    breaker = CircuitBreaker("hydrometers")
+    now = dt_util.utcnow()
+
+    with caplog.at_level(logging.INFO):
+        for _ in range(FAILURE_THRESHOLD):
+            assert breaker.allow_request(now)
+            breaker.record_failure(now, TimeoutError("timeout"))
+        assert breaker.is_open
+        assert not breaker.allow_request(now + PROBE_INTERVAL / 2)
+
+        probe = now + PROBE_INTERVAL
+        assert breaker.allow_request(probe)
+        breaker.record_failure(probe, TimeoutError("timeout"))
+        assert breaker.next_probe == probe + PROBE_INTERVAL * 2
+
+        breaker.record_success(probe + timedelta(minutes=5))
+    assert not breaker.is_open
+    assert [record.levelno for record in caplog.records] == [logging.WARNING, logging.INFO]
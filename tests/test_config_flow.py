@@ -5,9 +5,10 @@ from unittest.mock import patch
 from homeassistant import config_entries
 from homeassistant.data_entry_flow import FlowResultType
 from homeassistant.const import CONF_USERNAME
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.rapt_io.const import CONF_API_KEY, DOMAIN
-from custom_components.rapt_io.api import RaptAuthError, RaptApiError
+from custom_components.rapt_io.api import RaptAuthError, RaptApiError, RaptConnectionError
 
 
 async def test_form(hass):
@@ -80,3 +81,148 @@ async def test_form_cannot_connect(hass):
 
     assert result2["type"] == FlowResultType.FORM
     assert result2["errors"] == {"base": "cannot_connect"}
+
+
+async def test_form_hydrometer_only_account_seeds_setup(hass):
+    """Test that an account without BrewZilla is accepted and setup reuses the fetched devices."""
+    hydrometers = [{"id": "pill_1", "name": "My RAPT Pill", "deviceType": "Hydrometer", "gravity": 1.050}]
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+
+    with (
+        patch(
+            "custom_components.rapt_io.api.RaptApiClient._request",
+            return_value={"access_token": "test_token", "expires_in": 3600},
+        ),
+        patch("custom_components.rapt_io.api.RaptApiClient.get_brewzillas", return_value=[]) as mock_brewzillas,
+        patch("custom_components.rapt_io.api.RaptApiClient.get_bonded_devices", return_value=[]),
+        patch("custom_components.rapt_io.api.RaptApiClient.get_hydrometers", return_value=hydrometers),
+    ):
+        result2 = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                CONF_USERNAME: "test_username",
+                CONF_API_KEY: "test_api_key",
+            },
+        )
+        await hass.async_block_till_done()
+
+        assert result2["type"] == FlowResultType.CREATE_ENTRY
+        assert result2["result"].unique_id == "pill_1"
+        # The entry setup neither authenticates nor fetches the devices again
+        assert mock_brewzillas.call_count == 1
+        assert hass.states.get("sensor.my_rapt_pill_gravity").state == "1.05"
+
+
+async def test_form_short_lived_token_still_seeds_devices(hass):
+    """Test that a token that has already expired is not reused, while the device lists are."""
+    hydrometers = [{"id": "pill_1", "name": "My RAPT Pill", "deviceType": "Hydrometer", "gravity": 1.050}]
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+
+    with (
+        patch(
+            "custom_components.rapt_io.api.RaptApiClient._request",
+            return_value={"access_token": "test_token", "expires_in": 30},
+        ),
+        patch("custom_components.rapt_io.api.RaptApiClient.get_brewzillas", return_value=[]) as mock_brewzillas,
+        patch("custom_components.rapt_io.api.RaptApiClient.get_bonded_devices", return_value=[]),
+        patch("custom_components.rapt_io.api.RaptApiClient.get_hydrometers", return_value=hydrometers),
+    ):
+        result2 = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                CONF_USERNAME: "test_username",
+                CONF_API_KEY: "test_api_key",
+            },
+        )
+        await hass.async_block_till_done()
+
+        assert result2["type"] == FlowResultType.CREATE_ENTRY
+        assert mock_brewzillas.call_count == 1
+        assert hass.states.get("sensor.my_rapt_pill_gravity").state == "1.05"
+
+
+async def test_form_failed_device_list_is_fetched_by_setup(hass):
+    """Test that a device list failing during onboarding doesn't abort it and is fetched by the setup."""
+    hydrometers = [{"id": "pill_1", "name": "My RAPT Pill", "deviceType": "Hydrometer", "gravity": 1.050}]
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+
+    with (
+        patch(
+            "custom_components.rapt_io.api.RaptApiClient._request",
+            return_value={"access_token": "test_token", "expires_in": 3600},
+        ),
+        patch("custom_components.rapt_io.api.RaptApiClient.get_brewzillas", return_value=[]) as mock_brewzillas,
+        patch(
+            "custom_components.rapt_io.api.RaptApiClient.get_bonded_devices",
+            side_effect=[RaptConnectionError("Timeout"), []],
+        ) as mock_bonded_devices,
+        patch("custom_components.rapt_io.api.RaptApiClient.get_hydrometers", return_value=hydrometers),
+    ):
+        result2 = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                CONF_USERNAME: "test_username",
+                CONF_API_KEY: "test_api_key",
+            },
+        )
+        await hass.async_block_till_done()
+
+        assert result2["type"] == FlowResultType.CREATE_ENTRY
+        assert mock_brewzillas.call_count == 1
+        assert mock_bonded_devices.call_count == 2
+        assert hass.states.get("sensor.my_rapt_pill_gravity").state == "1.05"
+
+
+async def test_form_device_list_auth_error(hass):
+    """Test that an authentication error of a device list is reported over the connection errors."""
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+
+    with (
+        patch(
+            "custom_components.rapt_io.api.RaptApiClient._request",
+            return_value={"access_token": "test_token", "expires_in": 3600},
+        ),
+        patch(
+            "custom_components.rapt_io.api.RaptApiClient.get_brewzillas",
+            side_effect=RaptConnectionError("Timeout"),
+        ),
+        patch(
+            "custom_components.rapt_io.api.RaptApiClient.get_bonded_devices",
+            side_effect=RaptConnectionError("Timeout"),
+        ),
+        patch("custom_components.rapt_io.api.RaptApiClient.get_hydrometers", side_effect=RaptAuthError("Expired")),
+    ):
+        result2 = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                CONF_USERNAME: "test_username",
+                CONF_API_KEY: "test_api_key",
+            },
+        )
+
+    assert result2["type"] == FlowResultType.FORM
+    assert result2["errors"] == {"base": "invalid_auth"}
+
+
+async def test_form_account_already_configured(hass):
+    """Test that a second entry of an account, which would share its API client, is rejected."""
+    MockConfigEntry(
+        domain=DOMAIN,
+        title="RAPT.io",
+        data={CONF_USERNAME: "test_username", CONF_API_KEY: "test_api_key"},
+        unique_id="test_device_id",
+    ).add_to_hass(hass)
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+
+    with patch("custom_components.rapt_io.config_flow.validate_input") as mock_validate:
+        result2 = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                CONF_USERNAME: " Test_Username",
+                CONF_API_KEY: "other_api_key",
+            },
+        )
+
+    assert result2["type"] == FlowResultType.ABORT
+    assert result2["reason"] == "already_configured"
+    mock_validate.assert_not_called()
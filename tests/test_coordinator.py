@@ -0,0 +1,343 @@
+"""Tests for the RAPT.io data update coordinator."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from custom_components.rapt_io.api import RaptApiError
+from custom_components.rapt_io.circuit import FAILURE_THRESHOLD
+from custom_components.rapt_io.coordinator import RaptDataUpdateCoordinator
+from custom_components.rapt_io.models import parse_telemetry_point
+from custom_components.rapt_io.scheduler import RaptPollScheduler
+
+
+def _mock_client(brewzillas=None, bonded_devices=None, hydrometers=None) -> MagicMock:
+    """Return a mocked API client serving the given device lists."""
+    client = MagicMock()
+    client.get_brewzillas = AsyncMock(return_value=brewzillas or [])
+    client.get_bonded_devices = AsyncMock(return_value=bonded_devices or [])
+    client.get_hydrometers = AsyncMock(return_value=hydrometers or [])
+    return client
+
+
+async def test_update_fetches_all_device_types(hass):
+    """Test that a cycle merges the devices of all endpoints."""
+    client = _mock_client(
+        brewzillas=[{"id": "bz", "deviceType": "BrewZilla"}],
+        bonded_devices=[{"id": "ble", "deviceType": "BLETemperature"}],
+        hydrometers=[{"id": "pill", "deviceType": "Hydrometer"}],
+    )
+    coordinator = RaptDataUpdateCoordinator(hass, client, 60)
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert set(coordinator.data) == {"bz", "ble", "pill"}
+    assert coordinator.failed_endpoints == set()
+
+
+async def test_update_tolerates_partial_failure(hass):
+    """Test that a failing endpoint only drops its own devices."""
+    client = _mock_client(
+        brewzillas=[{"id": "bz", "deviceType": "BrewZilla"}],
+        bonded_devices=[{"id": "ble", "deviceType": "BLETemperature"}],
+    )
+    client.get_hydrometers.side_effect = RaptApiError("timeout")
+    coordinator = RaptDataUpdateCoordinator(hass, client, 60)
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert set(coordinator.data) == {"bz", "ble"}
+    assert coordinator.failed_endpoints == {"hydrometers"}
+
+
+async def test_update_fails_when_all_endpoints_fail(hass):
+    """Test that the update fails when no endpoint answers."""
+    client = _mock_client()
+    client.get_brewzillas.side_effect = RaptApiError("down")
+    client.get_bonded_devices.side_effect = RaptApiError("down")
+    client.get_hydrometers.side_effect = RaptApiError("down")
+    coordinator = RaptDataUpdateCoordinator(hass, client, 60)
+
+    await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+
+
+async def test_update_tracks_changed_devices(hass):
+    """Test that only devices with a different payload are reported as changed."""
+    client = _mock_client(
+        hydrometers=[
+            {"id": "pill_1", "deviceType": "Hydrometer", "gravity": 1.050},
+            {"id": "pill_2", "deviceType": "Hydrometer", "gravity": 1.040},
+        ],
+    )
+    coordinator = RaptDataUpdateCoordinator(hass, client, 60)
+
+    await coordinator.async_refresh()
+    assert coordinator.changed_devices == {"pill_1", "pill_2"}
+
+    client.get_hydrometers.return_value = [
+        {"id": "pill_1", "deviceType": "Hydrometer", "gravity": 1.050},
+        {"id": "pill_2", "deviceType": "Hydrometer", "gravity": 1.038},
+    ]
+    await coordinator.async_refresh()
+    assert coordinator.changed_devices == {"pill_2"}
+
+    client.get_hydrometers.return_value = [{"id": "pill_1", "deviceType": "Hydrometer", "gravity": 1.050}]
+    await coordinator.async_refresh()
+    assert coordinator.changed_devices == {"pill_2"}
+
+
+async def test_update_only_notifies_changed_device_listeners(hass):
+    """Test that device listeners are only called when their device changed."""
+    client = _mock_client(
+        hydrometers=[
+            {"id": "pill_1", "deviceType": "Hydrometer", "gravity": 1.050},
+            {"id": "pill_2", "deviceType": "Hydrometer", "gravity": 1.040},
+        ],
+    )
+    coordinator = RaptDataUpdateCoordinator(hass, client, 60)
+    await coordinator.async_refresh()
+
+    coordinator_listener = MagicMock()
+    pill_1_listener = MagicMock()
+    pill_2_listener = MagicMock()
+    unsub = [
+        coordinator.async_add_listener(coordinator_listener),
+        coordinator.async_add_listener(pill_1_listener, "pill_1"),
+        coordinator.async_add_listener(pill_2_listener, "pill_2"),
+    ]
+
+    client.get_hydrometers.return_value = [
+        {"id": "pill_1", "deviceType": "Hydrometer", "gravity": 1.050},
+        {"id": "pill_2", "deviceType": "Hydrometer", "gravity": 1.038},
+    ]
+    await coordinator.async_refresh()
+
+    coordinator_listener.assert_called_once()
+    pill_1_listener.assert_not_called()
+    pill_2_listener.assert_called_once()
+
+    for remove_listener in unsub:
+        remove_listener()
+    assert coordinator._device_listeners == {}
+
+
+async def test_fetch_raw_payload_on_demand(hass):
+    """Test that the raw payload of a device is fetched from its endpoint."""
+    payload = {"id": "pill", "deviceType": "Hydrometer", "gravity": 1.050, "unusedField": "value"}
+    client = _mock_client(hydrometers=[payload])
+    coordinator = RaptDataUpdateCoordinator(hass, client, 60)
+    await coordinator.async_refresh()
+
+    assert coordinator.data["pill"].gravity == 1.050
+    assert await coordinator.async_fetch_raw("pill") == payload
+    assert await coordinator.async_fetch_raw("unknown") is None
+    assert client.get_hydrometers.call_count == 2
+
+
+async def test_update_tracks_device_membership(hass):
+    """Test that added and removed devices are detected per endpoint."""
+    client = _mock_client(
+        bonded_devices=[{"id": "ble", "deviceType": "BLETemperature"}],
+        hydrometers=[{"id": "pill_1", "deviceType": "Hydrometer"}],
+    )
+    coordinator = RaptDataUpdateCoordinator(hass, client, 60)
+
+    await coordinator.async_refresh()
+    assert coordinator.new_devices == {"ble", "pill_1"}
+
+    client.get_hydrometers.return_value = [{"id": "pill_2", "deviceType": "Hydrometer"}]
+    await coordinator.async_refresh()
+    assert coordinator.new_devices == {"pill_2"}
+    assert coordinator.removed_devices == {"pill_1"}
+
+    # Devices of a failing endpoint are served stale, not removed
+    client.get_bonded_devices.side_effect = RaptApiError("timeout")
+    await coordinator.async_refresh()
+    assert coordinator.new_devices == set()
+    assert coordinator.removed_devices == set()
+    assert coordinator.data["ble"].stale
+
+    client.get_bonded_devices.side_effect = None
+    await coordinator.async_refresh()
+    assert coordinator.new_devices == set()
+    assert not coordinator.data["ble"].stale
+
+
+async def test_failing_endpoint_served_stale_until_max_age(hass):
+    """Test that devices of a failing endpoint are served stale, then dropped."""
+    client = _mock_client(hydrometers=[{"id": "pill", "deviceType": "Hydrometer", "gravity": 1.050}])
+    coordinator = RaptDataUpdateCoordinator(hass, client, 60, max_stale_age=300)
+    await coordinator.async_refresh()
+
+    client.get_hydrometers.side_effect = RaptApiError("timeout")
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.data["pill"].stale
+    assert coordinator.data["pill"].gravity == 1.050
+    assert coordinator.changed_devices == {"pill"}
+
+    coordinator._endpoint_fetched["hydrometers"] -= timedelta(seconds=301)
+    await coordinator.async_refresh()
+    assert "pill" not in coordinator.data
+
+
+async def test_full_outage_past_max_age_drops_data(hass):
+    """Test that the devices are dropped, and their listeners updated, once all endpoints failed for too long."""
+    client = _mock_client(
+        brewzillas=[{"id": "bz", "deviceType": "BrewZilla"}],
+        hydrometers=[{"id": "pill", "deviceType": "Hydrometer", "gravity": 1.050}],
+    )
+    coordinator = RaptDataUpdateCoordinator(hass, client, 60, max_stale_age=300)
+    await coordinator.async_refresh()
+    listener = MagicMock()
+    coordinator.async_add_listener(listener, "pill")
+
+    client.get_brewzillas.side_effect = RaptApiError("down")
+    client.get_bonded_devices.side_effect = RaptApiError("down")
+    client.get_hydrometers.side_effect = RaptApiError("down")
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.data["pill"].stale
+
+    for endpoint in coordinator._endpoint_fetched:
+        coordinator._endpoint_fetched[endpoint] -= timedelta(seconds=301)
+    listener.reset_mock()
+    await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    assert coordinator.data == {}
+    listener.assert_called()
+
+
+async def test_open_circuit_skips_endpoint(hass):
+    """Test that an endpoint is not requested while its circuit is open."""
+    client = _mock_client()
+    client.get_hydrometers.side_effect = RaptApiError("timeout")
+    coordinator = RaptDataUpdateCoordinator(hass, client, 60)
+
+    for _ in range(FAILURE_THRESHOLD + 2):
+        await coordinator.async_refresh()
+
+    assert coordinator.breakers["hydrometers"].is_open
+    assert client.get_hydrometers.call_count == FAILURE_THRESHOLD
+    assert client.get_brewzillas.call_count == FAILURE_THRESHOLD + 2
+
+
+async def test_options_change_during_full_outage(hass):
+    """Test that the polls are rescheduled at the next probe when all circuits are open."""
+    client = _mock_client()
+    client.get_brewzillas.side_effect = RaptApiError("down")
+    client.get_bonded_devices.side_effect = RaptApiError("down")
+    client.get_hydrometers.side_effect = RaptApiError("down")
+    coordinator = RaptDataUpdateCoordinator(hass, client, 60)
+    for _ in range(FAILURE_THRESHOLD):
+        await coordinator.async_refresh()
+    assert all(breaker.is_open for breaker in coordinator.breakers.values())
+
+    # The schedule is reset while no endpoint may be requested
+    coordinator.async_update_polling(30, adaptive_polling=False)
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+
+    assert client.get_hydrometers.call_count == FAILURE_THRESHOLD
+    # Next poll at the probe of the circuits, not at the update interval
+    assert coordinator.update_interval > timedelta(seconds=30)
+
+
+async def test_seeded_device_lists_are_not_fetched(hass):
+    """Test that seeded device lists replace the next fetch of their endpoints."""
+    client = _mock_client()
+    coordinator = RaptDataUpdateCoordinator(hass, client, 60)
+    coordinator.async_seed({"hydrometers": [{"id": "pill", "deviceType": "Hydrometer"}]})
+
+    await coordinator.async_refresh()
+
+    assert set(coordinator.data) == {"pill"}
+    client.get_hydrometers.assert_not_called()
+    client.get_brewzillas.assert_called_once()
+
+
+async def test_push_merges_telemetry(hass):
+    """Test that pushed telemetry updates known devices and skips stale or unknown points."""
+    client = _mock_client(
+        hydrometers=[
+            {"id": "pill", "deviceType": "Hydrometer", "gravity": 1.050, "lastActivityTime": "2024-01-01T10:00:00Z"}
+        ],
+    )
+    coordinator = RaptDataUpdateCoordinator(hass, client, 60)
+    await coordinator.async_refresh()
+    listener = MagicMock()
+    coordinator.async_add_listener(listener)
+
+    coordinator.async_push(
+        [
+            parse_telemetry_point({"id": "pill", "gravity": 1.042, "createdOn": "2024-01-01T11:00:00Z"}),
+            parse_telemetry_point({"id": "unknown", "gravity": 1.000}),
+        ]
+    )
+
+    assert coordinator.data["pill"].gravity == 1.042
+    assert coordinator.changed_devices == {"pill"}
+    assert "unknown" not in coordinator.data
+    listener.assert_called_once()
+
+    coordinator.async_push(
+        [parse_telemetry_point({"deviceId": "pill", "gravity": 1.060, "createdOn": "2024-01-01T09:00:00Z"})]
+    )
+
+    assert coordinator.data["pill"].gravity == 1.042
+    listener.assert_called_once()
+
+
+async def test_slow_endpoint_carries_over_to_next_cycle(hass):
+    """Test that a device list missing the cycle deadline is served stale, then used by the next cycle."""
+    client = _mock_client(hydrometers=[{"id": "pill", "deviceType": "Hydrometer", "gravity": 1.050}])
+    coordinator = RaptDataUpdateCoordinator(hass, client, 60)
+    await coordinator.async_refresh()
+
+    release = asyncio.Event()
+
+    async def slow_hydrometers():
+        await release.wait()
+        return [{"id": "pill", "deviceType": "Hydrometer", "gravity": 1.040}]
+
+    client.get_hydrometers.side_effect = slow_hydrometers
+    with patch("custom_components.rapt_io.coordinator.POLL_CYCLE_DEADLINE", 0.01):
+        await coordinator.async_refresh()
+
+        assert coordinator.last_update_success
+        assert coordinator.data["pill"].stale
+        assert coordinator.data["pill"].gravity == 1.050
+
+        release.set()
+        await coordinator.async_refresh()
+
+    assert not coordinator.data["pill"].stale
+    assert coordinator.data["pill"].gravity == 1.040
+    assert client.get_hydrometers.call_count == 2
+
+
+async def test_next_poll_scheduled_from_cycle_end(hass):
+    """Test that the next poll is recorded from the end of a slow cycle, like the refresh is scheduled."""
+
+    async def slow_hydrometers():
+        await asyncio.sleep(0.2)
+        return [{"id": "pill", "deviceType": "Hydrometer"}]
+
+    client = _mock_client()
+    client.get_hydrometers.side_effect = slow_hydrometers
+    poll_slot = RaptPollScheduler().async_register("entry")
+    coordinator = RaptDataUpdateCoordinator(hass, client, 60, poll_slot=poll_slot)
+    start = dt_util.utcnow()
+
+    await coordinator.async_refresh()
+
+    assert poll_slot.next_poll - coordinator.update_interval >= start + timedelta(seconds=0.2)
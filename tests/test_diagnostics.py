@@ -0,0 +1,61 @@
+"""Tests for the RAPT.io diagnostics."""
+
+from unittest.mock import patch
+
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.rapt_io.const import CONF_API_KEY, CONF_WEBHOOK, CONF_WEBHOOK_SECRET, DOMAIN
+from custom_components.rapt_io.diagnostics import async_get_config_entry_diagnostics
+
+
+async def test_config_entry_diagnostics(hass: HomeAssistant, config_entry):
+    """Test that diagnostics expose the client metrics with credentials redacted."""
+    hydrometer = {"id": "pill", "name": "My RAPT Pill", "deviceType": "Hydrometer", "gravity": 1.050}
+
+    with (
+        patch("custom_components.rapt_io.RaptApiClient.get_brewzillas", return_value=[]),
+        patch("custom_components.rapt_io.RaptApiClient.get_bonded_devices", return_value=[]),
+        patch("custom_components.rapt_io.RaptApiClient.get_hydrometers", return_value=[hydrometer]),
+    ):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+
+    assert diagnostics["entry"]["data"] == {"username": REDACTED, "api_key": REDACTED}
+    assert diagnostics["entry"]["title"] == REDACTED
+    assert diagnostics["entry"]["unique_id"] == REDACTED
+    assert "test_device_id" not in str(diagnostics)
+    assert diagnostics["coordinator"]["last_update_success"]
+    assert diagnostics["coordinator"]["poll_cycle_duration"]["count"] == 1
+    assert "metrics" in diagnostics["api"]
+    assert diagnostics["devices"][0]["gravity"] == 1.050
+
+
+async def test_config_entry_diagnostics_redact_webhook(hass: HomeAssistant):
+    """Test that the webhook ID and secret, which allow pushing telemetry, are redacted."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="RAPT.io",
+        data={"username": "test_username", CONF_API_KEY: "test_api_key", CONF_WEBHOOK_ID: "test_webhook_id"},
+        options={CONF_WEBHOOK: False, CONF_WEBHOOK_SECRET: "test_webhook_secret"},
+        unique_id="webhook_device_id",
+    )
+    entry.add_to_hass(hass)
+
+    with (
+        patch("custom_components.rapt_io.RaptApiClient.get_brewzillas", return_value=[]),
+        patch("custom_components.rapt_io.RaptApiClient.get_bonded_devices", return_value=[]),
+        patch("custom_components.rapt_io.RaptApiClient.get_hydrometers", return_value=[]),
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["data"][CONF_WEBHOOK_ID] == REDACTED
+    assert diagnostics["entry"]["options"][CONF_WEBHOOK_SECRET] == REDACTED
+    assert "test_webhook_secret" not in str(diagnostics)
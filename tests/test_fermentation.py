@@ -0,0 +1,59 @@
+"""Tests for the RAPT.io fermentation metrics."""
+
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.rapt_io.fermentation import MAX_READINGS, FermentationTracker
+
+
+def test_metrics_follow_the_gravity_readings():
+    """Test the original gravity, ABV, attenuation and gravity rate of a steady fermentation."""
+    tracker = FermentationTracker()
+    start = dt_util.utcnow()
+
+    # Gravity drops by 10 points per day, read every 15 minutes for two days
+    for index in range(2 * 96):
+        tracker.add(start + timedelta(minutes=15 * index), 1.050 - 0.010 * index / 96)
+
+    assert tracker.original_gravity == 1.050
+    assert tracker.gravity_rate == -0.01
+    assert tracker.abv == round((1.050 - tracker.gravity) * 131.25, 2)
+    assert tracker.apparent_attenuation == round((1.050 - tracker.gravity) / 0.050 * 100, 1)
+    assert len(tracker._readings) <= MAX_READINGS
+
+
+def test_old_and_repeated_readings_are_ignored():
+    """Test that a reading not newer than the last one is ignored."""
+    tracker = FermentationTracker()
+    now = dt_util.utcnow()
+
+    assert tracker.add(now, 1.050)
+    assert not tracker.add(now, 1.040)
+    assert not tracker.add(now - timedelta(hours=1), 1.060)
+    assert tracker.gravity == 1.050
+    assert tracker.gravity_rate is None
+
+
+def test_new_batch_resets_original_gravity():
+    """Test that a gravity rise starts a new batch."""
+    tracker = FermentationTracker()
+    now = dt_util.utcnow()
+    tracker.add(now, 1.060)
+    tracker.add(now + timedelta(days=7), 1.010)
+
+    tracker.add(now + timedelta(days=8), 1.045)
+
+    assert tracker.original_gravity == 1.045
+    assert tracker.abv == 0
+
+
+def test_restored_original_gravity():
+    """Test that the original gravity from before a restart is kept."""
+    tracker = FermentationTracker()
+    tracker.restore_original_gravity(1.055)
+
+    tracker.add(dt_util.utcnow(), 1.020)
+
+    assert tracker.original_gravity == 1.055
+    assert tracker.abv == round(0.035 * 131.25, 2)
@@ -0,0 +1,65 @@
+"""Tests for the RAPT.io fermentation completion forecast."""
+
+import math
+from datetime import timedelta
+
+import numpy as np
+from homeassistant.util import dt as dt_util
+
+from custom_components.rapt_io.forecast import END_TOLERANCE, MAX_SERIES_READINGS, MIN_FORECAST_READINGS, GravitySeries
+
+
+def test_forecast_fits_gravity_decay():
+    """Test that the final gravity and fermentation end are recovered from noisy readings."""
+    series = GravitySeries()
+    start = dt_util.utcnow()
+    noise = np.random.default_rng(0).normal(0, 0.0005, 4 * 96)
+    # Four days of readings every 15 minutes, from 1.050 towards 1.010
+    for index in range(4 * 96):
+        days = index / 96
+        series.add(start + timedelta(days=days), 1.010 + 0.040 * math.exp(-0.6 * days) + noise[index])
+
+    forecast = series.forecast
+
+    assert forecast is not None
+    assert abs(forecast.final_gravity - 1.010) < 0.001
+    expected_end = start + timedelta(days=math.log(0.040 / END_TOLERANCE) / 0.6)
+    assert abs(forecast.end - expected_end) < timedelta(hours=12)
+
+
+def test_forecast_is_only_fitted_on_new_readings():
+    """Test that the fit is cached until a reading is added."""
+    series = GravitySeries()
+    start = dt_util.utcnow()
+    for index in range(96):
+        series.add(start + timedelta(hours=index / 4), 1.050 - 0.0002 * index)
+
+    forecast = series.forecast
+    assert series.forecast is forecast
+
+    series.add(start + timedelta(days=1), 1.030)
+    assert series.forecast is not forecast
+
+
+def test_no_forecast_without_enough_readings_or_gravity_drop():
+    """Test that a short or flat series has no forecast."""
+    series = GravitySeries()
+    start = dt_util.utcnow()
+    for index in range(MIN_FORECAST_READINGS - 1):
+        series.add(start + timedelta(hours=index * 2), 1.050 - 0.001 * index)
+    assert series.forecast is None
+
+    series.clear()
+    for index in range(96):
+        series.add(start + timedelta(hours=index / 4), 1.050 + 0.0001 * index)
+    assert series.forecast is None
+
+
+def test_series_is_bounded():
+    """Test that the oldest readings are dropped once the series is full."""
+    series = GravitySeries()
+    start = dt_util.utcnow()
+    for index in range(MAX_SERIES_READINGS + 1):
+        series.add(start + timedelta(minutes=15 * index), 1.010)
+
+    assert len(series) <= MAX_SERIES_READINGS
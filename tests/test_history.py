@@ -0,0 +1,73 @@
+"""Tests for the RAPT.io telemetry history."""
+
+import os
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.rapt_io.history import RaptHistoryStore, async_remove_history, history_path
+from custom_components.rapt_io.models import RaptBrewZilla, RaptHydrometer
+
+
+async def test_readings_are_stored_and_queried_by_range(hass):
+    """Test that readings are written once and returned by time range and device."""
+    store = RaptHistoryStore(hass, "entry")
+    await store.async_open()
+    start = dt_util.utcnow().replace(microsecond=0) - timedelta(hours=3)
+
+    for hour, gravity in enumerate((1.050, 1.045, 1.040)):
+        store.async_add(
+            [
+                RaptHydrometer(id="pill", last_activity=start + timedelta(hours=hour), gravity=gravity),
+                RaptBrewZilla(id="bz", last_activity=start + timedelta(hours=hour), temperature=20.0 + hour),
+            ]
+        )
+    # Same reading served again by the next poll
+    store.async_add([RaptHydrometer(id="pill", last_activity=start, gravity=1.050)])
+    await hass.async_block_till_done()
+
+    readings = await store.async_get_readings(start + timedelta(hours=1), device_ids=["pill"])
+    assert [(reading.time, reading.gravity) for reading in readings] == [
+        (start + timedelta(hours=1), 1.045),
+        (start + timedelta(hours=2), 1.040),
+    ]
+    assert len(await store.async_get_readings(start, start + timedelta(hours=1))) == 2
+
+    await store.async_close()
+    await async_remove_history(hass, "entry")
+
+
+async def test_expired_readings_are_deleted(hass):
+    """Test that readings older than the retention period are deleted."""
+    store = RaptHistoryStore(hass, "entry", retention=timedelta(days=1))
+    await store.async_open()
+    now = dt_util.utcnow()
+
+    store.async_add(
+        [
+            RaptHydrometer(id="old", last_activity=now - timedelta(days=2), gravity=1.050),
+            RaptHydrometer(id="pill", last_activity=now, gravity=1.040),
+        ]
+    )
+    await hass.async_block_till_done()
+
+    readings = await store.async_get_readings(now - timedelta(days=7))
+    assert [reading.device_id for reading in readings] == ["pill"]
+
+    await store.async_close()
+    await async_remove_history(hass, "entry")
+    assert not await hass.async_add_executor_job(os.path.exists, history_path(hass, "entry"))
+
+
+async def test_history_disabled_when_database_cannot_be_opened(hass, tmp_path, caplog):
+    """Test that the history is disabled, with a warning, when its database can't be opened."""
+    # A file where the storage directory should be
+    (tmp_path / ".storage").write_text("")
+    store = RaptHistoryStore(hass, "entry")
+    await store.async_open()
+
+    assert "Telemetry history disabled" in caplog.text
+    store.async_add([RaptHydrometer(id="pill", last_activity=dt_util.utcnow(), gravity=1.050)])
+    await hass.async_block_till_done()
+    assert await store.async_get_readings(dt_util.utcnow() - timedelta(days=1)) == []
+    await store.async_close()
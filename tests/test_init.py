@@ -0,0 +1,127 @@
+"""Tests for the RAPT.io integration setup."""
+
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import State
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, mock_restore_cache_with_extra_data
+
+from custom_components.rapt_io.api import RaptConnectionError
+from custom_components.rapt_io.const import CONF_API_KEY, DOMAIN
+from custom_components.rapt_io.scheduler import async_get_poll_scheduler
+
+DEVICE_LIST_PATCHES = (
+    "custom_components.rapt_io.RaptApiClient.get_brewzillas",
+    "custom_components.rapt_io.RaptApiClient.get_bonded_devices",
+    "custom_components.rapt_io.RaptApiClient.get_hydrometers",
+)
+
+
+async def test_entries_of_same_account_share_client(hass, config_entry):
+    """Test that config entries of the same account share one API client."""
+    other_entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="RAPT.io",
+        data={"username": "Test_Username", CONF_API_KEY: "test_api_key"},
+        unique_id="other_device_id",
+    )
+    other_entry.add_to_hass(hass)
+
+    with (
+        patch(DEVICE_LIST_PATCHES[0], return_value=[]),
+        patch(DEVICE_LIST_PATCHES[1], return_value=[]),
+        patch(DEVICE_LIST_PATCHES[2], return_value=[]),
+        patch("custom_components.rapt_io.RaptApiClient.close") as mock_close,
+    ):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        assert await hass.config_entries.async_setup(other_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinators = hass.data[DOMAIN]
+        assert coordinators[config_entry.entry_id].client is coordinators[other_entry.entry_id].client
+
+        assert await hass.config_entries.async_unload(config_entry.entry_id)
+        mock_close.assert_not_called()
+
+        assert await hass.config_entries.async_unload(other_entry.entry_id)
+        mock_close.assert_called_once()
+
+
+async def test_shared_client_ignores_options_of_other_entries(hass, config_entry, caplog):
+    """Test that a warning is logged when another entry of the account has its own API key or options."""
+    other_entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="RAPT.io",
+        data={"username": "test_username", CONF_API_KEY: "other_api_key"},
+        unique_id="other_device_id",
+    )
+    other_entry.add_to_hass(hass)
+
+    with (
+        patch(DEVICE_LIST_PATCHES[0], return_value=[]),
+        patch(DEVICE_LIST_PATCHES[1], return_value=[]),
+        patch(DEVICE_LIST_PATCHES[2], return_value=[]),
+    ):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        assert await hass.config_entries.async_setup(other_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert f"Config entry {other_entry.entry_id} shares the API client of test_username" in caplog.text
+
+
+async def test_setup_from_cached_devices_while_rapt_is_down(hass, hass_storage, config_entry):
+    """Test that entities of cached devices restore their state without waiting on RAPT."""
+    hass_storage[f"{DOMAIN}.devices.{config_entry.entry_id}"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.devices.{config_entry.entry_id}",
+        "data": {
+            "devices": [
+                {
+                    "endpoint": "hydrometers",
+                    "id": "pill",
+                    "device_type": "Hydrometer",
+                    "name": "My RAPT Pill",
+                    "firmware_version": "1.0",
+                }
+            ]
+        },
+    }
+    mock_restore_cache_with_extra_data(
+        hass,
+        [(State("sensor.my_rapt_pill_gravity", "1.05"), {"native_value": 1.05, "native_unit_of_measurement": "SG"})],
+    )
+
+    with (
+        patch(DEVICE_LIST_PATCHES[0], side_effect=RaptConnectionError("down")),
+        patch(DEVICE_LIST_PATCHES[1], side_effect=RaptConnectionError("down")),
+        patch(DEVICE_LIST_PATCHES[2], side_effect=RaptConnectionError("down")),
+    ):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert config_entry.state is ConfigEntryState.LOADED
+    state = hass.states.get("sensor.my_rapt_pill_gravity")
+    assert state.state == "1.05"
+    assert state.attributes["stale"] is True
+
+
+async def test_setup_without_cached_devices_is_not_delayed(hass, config_entry):
+    """Test that the first refresh awaited by the setup doesn't wait for its poll to be spread."""
+    scheduler = async_get_poll_scheduler(hass)
+    scheduler.async_register("other_entry")
+    scheduler.schedule("other_entry", dt_util.utcnow(), 0, 0)
+
+    with (
+        patch(DEVICE_LIST_PATCHES[0], return_value=[]),
+        patch(DEVICE_LIST_PATCHES[1], return_value=[]),
+        patch(DEVICE_LIST_PATCHES[2], return_value=[]),
+        patch("custom_components.rapt_io.scheduler.asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+    ):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    mock_sleep.assert_not_called()
+    assert config_entry.state is ConfigEntryState.LOADED
+    assert scheduler.next_polls[config_entry.entry_id] > scheduler.next_polls["other_entry"]
@@ -0,0 +1,55 @@
+"""Tests for the RAPT.io API client metrics."""
+
+from custom_components.rapt_io.metrics import ApiMetrics, LatencyHistogram, RecentLatencies
+
+
+def test_latency_histogram_percentiles():
+    """Test that percentiles are reported as the upper bound of their bucket."""
+    histogram = LatencyHistogram()
+    for seconds in (0.01, 0.02, 0.03, 0.2, 20.0):
+        histogram.observe(seconds)
+
+    assert histogram.count == 5
+    assert histogram.percentile(50) == 0.05
+    assert histogram.percentile(80) == 0.25
+    assert histogram.percentile(100) == 20.0
+    assert histogram.as_dict()["buckets"]["le_inf"] == 1
+
+
+def test_api_metrics_aggregate_endpoints():
+    """Test that request outcomes are counted per endpoint and in total."""
+    metrics = ApiMetrics()
+    metrics.record_response("/api/Hydrometers/GetHydrometers", 0.1, 512)
+    metrics.record_error("/api/Hydrometers/GetHydrometers", 15.0, "network")
+    metrics.record_retry("/api/Hydrometers/GetHydrometers")
+    metrics.record_response("/api/BrewZillas/GetBrewZillas", 0.2, 256)
+
+    assert metrics.requests == 3
+    assert metrics.errors == 1
+    assert metrics.bytes_received == 768
+    assert metrics.latency().count == 3
+    hydrometers = metrics.as_dict()["endpoints"]["/api/Hydrometers/GetHydrometers"]
+    assert hydrometers["errors"] == {"network": 1}
+    assert hydrometers["retries"] == 1
+
+
+def test_recent_latencies_percentiles():
+    """Test that recent latencies give exact percentiles over a bounded window."""
+    latencies = RecentLatencies(size=10)
+    for seconds in (5.0, 5.0):
+        latencies.observe(seconds)
+    for index in range(1, 11):
+        latencies.observe(index / 10)
+
+    assert len(latencies) == 10
+    assert latencies.percentile(50) == 0.5
+    assert latencies.percentile(95) == 1.0
+
+
+def test_recent_latencies_ignore_errors():
+    """Test that failed requests don't count towards the recent latency."""
+    metrics = ApiMetrics()
+    metrics.record_response("/api/Hydrometers/GetHydrometers", 0.3, 512)
+    metrics.record_error("/api/Hydrometers/GetHydrometers", 15.0, "network")
+
+    assert metrics.endpoint("/api/Hydrometers/GetHydrometers").recent_latency.percentile(100) == 0.3
@@ -0,0 +1,77 @@
+"""Tests of the RAPT.io request path against the local mock RAPT API."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+
+from custom_components.rapt_io.api import RaptApiClient
+
+from .rapt_mock_server import MockRaptConfig, MockRaptServer
+
+BREWZILLAS_PATH = "/api/BrewZillas/GetBrewZillas"
+
+
+@pytest.fixture(name="mock_server")
+async def mock_server_fixture(socket_enabled):
+    """Start the mock RAPT API with one account of three devices."""
+    server = MockRaptServer(MockRaptConfig())
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture(name="session")
+async def session_fixture():
+    """Return an HTTP session."""
+    async with aiohttp.ClientSession() as session:
+        yield session
+
+
+def _client(server: MockRaptServer, session: aiohttp.ClientSession) -> RaptApiClient:
+    """Return an API client of the mock account."""
+    return RaptApiClient(
+        username=server.username(0),
+        api_key="secret",
+        session=session,
+        base_url=server.base_url,
+        auth_url=server.base_url,
+    )
+
+
+async def test_device_lists_and_telemetry(mock_server, session):
+    """Test that the client authenticates once and fetches the device lists and telemetry."""
+    client = _client(mock_server, session)
+
+    brewzillas = await client.get_brewzillas()
+    hydrometers = await client.get_hydrometers()
+
+    assert [device["deviceType"] for device in brewzillas] == ["BrewZilla"]
+    assert [device["deviceType"] for device in hydrometers] == ["Hydrometer"]
+    now = datetime.now(timezone.utc)
+    telemetry = await client.get_hydrometer_telemetry(hydrometers[0]["id"], now - timedelta(hours=2), now)
+    assert telemetry
+    assert mock_server.requests["/connect/token"] == 1
+
+
+async def test_rate_limited_request_is_retried(mock_server, session):
+    """Test that a 429 response is retried after its Retry-After delay."""
+    client = _client(mock_server, session)
+    await client.authenticate()
+    mock_server.fail_next(429)
+
+    assert len(await client.get_brewzillas()) == 1
+    assert mock_server.requests[BREWZILLAS_PATH] == 2
+    assert client.metrics.endpoint(BREWZILLAS_PATH).retries == 1
+
+
+async def test_server_error_is_retried(mock_server, session):
+    """Test that a 503 response is retried with a backoff."""
+    client = _client(mock_server, session)
+    await client.authenticate()
+    mock_server.fail_next(503, 503)
+
+    with patch("custom_components.rapt_io.api.backoff_delay", return_value=0):
+        assert len(await client.get_brewzillas()) == 1
+    assert mock_server.requests[BREWZILLAS_PATH] == 3
@@ -0,0 +1,47 @@
+"""Tests for the RAPT.io device snapshots."""
+
+from datetime import datetime, timezone
+
+from custom_components.rapt_io.models import RaptDevice, RaptHydrometer, parse_devices
+
+
+def test_parse_devices_builds_typed_snapshots():
+    """Test that payloads are parsed into snapshots of their device type."""
+    devices = parse_devices(
+        [
+            {
+                "id": "pill",
+                "name": "My RAPT Pill",
+                "deviceType": "Hydrometer",
+                "lastActivityTime": "2024-03-01T12:00:00+01:00",
+                "temperature": "20.5",
+                "gravity": 1.052,
+                "battery": 89.6,
+                "unusedField": [1, 2, 3],
+            },
+            {"id": "other", "deviceType": "Unknown"},
+            {"name": "No ID"},
+        ]
+    )
+
+    assert devices == [
+        RaptHydrometer(
+            "pill",
+            device_type="Hydrometer",
+            name="My RAPT Pill",
+            last_activity=datetime(2024, 3, 1, 11, 0, tzinfo=timezone.utc),
+            temperature=20.5,
+            gravity=1.052,
+            battery=90,
+        ),
+        RaptDevice("other", device_type="Unknown"),
+    ]
+    assert not hasattr(devices[0], "__dict__")
+
+
+def test_snapshots_compare_by_value():
+    """Test that unchanged payloads produce equal snapshots."""
+    payload = {"id": "pill", "deviceType": "Hydrometer", "gravity": 1.050}
+
+    assert parse_devices([payload]) == parse_devices([dict(payload)])
+    assert parse_devices([payload]) != parse_devices([{**payload, "gravity": 1.048}])
@@ -0,0 +1,47 @@
+"""Tests for the RAPT.io adaptive poll planner."""
+
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.rapt_io.const import ACTIVE_UPDATE_INTERVAL, IDLE_UPDATE_INTERVAL
+from custom_components.rapt_io.models import RaptDevice
+from custom_components.rapt_io.polling import REPORT_GRACE, AdaptivePollPlanner
+
+
+def test_active_device_uses_active_interval():
+    """Test that an active BrewZilla shortens the interval."""
+    planner = AdaptivePollPlanner(60)
+    now = dt_util.utcnow()
+    devices = [RaptDevice("bz", status="Mashing", last_activity=now)]
+
+    assert planner.next_interval(devices, now) == ACTIVE_UPDATE_INTERVAL
+
+
+def test_idle_devices_use_idle_interval():
+    """Test that devices without recent activity stretch the interval."""
+    planner = AdaptivePollPlanner(60)
+    now = dt_util.utcnow()
+    devices = [RaptDevice("bz", status="Idle", last_activity=now - timedelta(hours=3))]
+
+    assert planner.next_interval(devices, now) == IDLE_UPDATE_INTERVAL
+
+
+def test_poll_lands_after_expected_report():
+    """Test that polls are timed after the observed reporting cadence."""
+    planner = AdaptivePollPlanner(60)
+    start = dt_util.utcnow()
+    first_report = start - timedelta(minutes=15)
+
+    planner.next_interval([RaptDevice("pill", last_activity=first_report)], start)
+    interval = planner.next_interval([RaptDevice("pill", last_activity=start)], start)
+
+    assert interval == 15 * 60 + REPORT_GRACE
+
+
+def test_non_adaptive_uses_base_interval():
+    """Test that adaptive polling can be disabled."""
+    planner = AdaptivePollPlanner(60, adaptive=False)
+    now = dt_util.utcnow()
+
+    assert planner.next_interval([RaptDevice("bz", status="Mashing")], now) == 60
@@ -0,0 +1,69 @@
+"""Tests for the RAPT.io profiling service."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.rapt_io.const import DATA_PROFILE_SESSION, DOMAIN
+from custom_components.rapt_io.profiler import SERVICE_PROFILE
+
+DEVICE_LIST_PATCHES = (
+    "custom_components.rapt_io.RaptApiClient.get_brewzillas",
+    "custom_components.rapt_io.RaptApiClient.get_bonded_devices",
+    "custom_components.rapt_io.RaptApiClient.get_hydrometers",
+)
+
+
+async def test_profile_writes_report_after_cycles(hass, config_entry, tmp_path):
+    """Test that the profile of the requested update cycles is written to the config directory."""
+
+    with (
+        patch(DEVICE_LIST_PATCHES[0], return_value=[]),
+        patch(DEVICE_LIST_PATCHES[1], return_value=[]),
+        patch(DEVICE_LIST_PATCHES[2], return_value=[]),
+    ):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+        await hass.services.async_call(DOMAIN, SERVICE_PROFILE, {"cycles": 2}, blocking=True)
+        assert DATA_PROFILE_SESSION in hass.data
+
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert DATA_PROFILE_SESSION in hass.data
+
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert DATA_PROFILE_SESSION not in hass.data
+    reports = [name for name in os.listdir(tmp_path) if name.startswith(f"{DOMAIN}_profile_")]
+    assert sorted(os.path.splitext(name)[1] for name in reports) == [".prof", ".txt"]
+    report = (tmp_path / next(name for name in reports if name.endswith(".txt"))).read_text()
+    assert "Update cycles: 2 of 2" in report
+    assert "_async_update_data (coordinator.py" in report
+    assert "Memory allocated by the integration" in report
+
+
+async def test_profile_rejects_concurrent_sessions(hass, config_entry):
+    """Test that a single profiling session runs at a time."""
+
+    with (
+        patch(DEVICE_LIST_PATCHES[0], return_value=[]),
+        patch(DEVICE_LIST_PATCHES[1], return_value=[]),
+        patch(DEVICE_LIST_PATCHES[2], return_value=[]),
+    ):
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+        await hass.services.async_call(DOMAIN, SERVICE_PROFILE, {"cycles": 1, "trace_memory": False}, blocking=True)
+        with pytest.raises(HomeAssistantError):
+            await hass.services.async_call(DOMAIN, SERVICE_PROFILE, {"cycles": 1}, blocking=True)
+
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert DATA_PROFILE_SESSION not in hass.data
@@ -0,0 +1,80 @@
+"""Tests for the RAPT.io poll scheduler."""
+
+import asyncio
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.rapt_io.scheduler import (
+    FIRST_POLL_JITTER,
+    MAX_POLL_JITTER,
+    MIN_POLL_SPACING,
+    POLL_JITTER,
+    RaptPollScheduler,
+)
+
+
+def test_polls_of_entries_are_spread():
+    """Test that entries polling at the same interval are scheduled apart."""
+    scheduler = RaptPollScheduler()
+    slots = [scheduler.async_register(f"entry_{index}") for index in range(5)]
+    now = dt_util.utcnow()
+
+    delays = [slot.schedule(now, 60) for slot in slots]
+
+    assert all(60 <= delay <= 60 + 60 * POLL_JITTER + len(slots) * MIN_POLL_SPACING.total_seconds() for delay in delays)
+    next_polls = sorted(scheduler.next_polls.values())
+    assert len(next_polls) == len(slots)
+    assert all(later - earlier >= MIN_POLL_SPACING for earlier, later in zip(next_polls, next_polls[1:]))
+
+
+def test_first_polls_of_entries_are_spread():
+    """Test that the first polls of entries set up together, e.g. at startup, don't fire in lockstep."""
+    scheduler = RaptPollScheduler()
+    slots = [scheduler.async_register(f"entry_{index}") for index in range(3)]
+    now = dt_util.utcnow()
+
+    delays = [slot.schedule(now, 0, FIRST_POLL_JITTER) for slot in slots]
+
+    assert all(0 <= delay <= FIRST_POLL_JITTER + len(slots) * MIN_POLL_SPACING.total_seconds() for delay in delays)
+    next_polls = sorted(scheduler.next_polls.values())
+    assert all(later - earlier >= MIN_POLL_SPACING for earlier, later in zip(next_polls, next_polls[1:]))
+
+
+def test_jitter_is_capped():
+    """Test that long intervals get a bounded jitter."""
+    scheduler = RaptPollScheduler()
+    slot = scheduler.async_register("entry")
+
+    assert 3600 <= slot.schedule(dt_util.utcnow(), 3600) <= 3600 + MAX_POLL_JITTER
+
+
+def test_unregistered_entry_is_forgotten():
+    """Test that an unregistered entry no longer holds a poll time."""
+    scheduler = RaptPollScheduler()
+    slot = scheduler.async_register("entry")
+    slot.schedule(dt_util.utcnow(), 60)
+
+    slot.async_unregister()
+    slot.schedule(dt_util.utcnow(), 60)
+
+    assert slot.next_poll is None
+    assert scheduler.next_polls == {}
+
+
+async def test_concurrent_polls_are_capped():
+    """Test that no more than the maximum number of entries poll at once."""
+    scheduler = RaptPollScheduler(max_concurrent=2)
+    running = 0
+    peak = 0
+
+    async def poll(slot):
+        nonlocal running, peak
+        async with slot:
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+
+    await asyncio.gather(*(poll(scheduler.async_register(f"entry_{index}")) for index in range(5)))
+
+    assert peak == 2
@@ -5,8 +5,11 @@ from unittest.mock import patch
 from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.const import UnitOfTemperature
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
 
+from custom_components.rapt_io.const import DOMAIN
+
 
 async def test_sensors(hass: HomeAssistant, config_entry):
     """Test that sensors are created and have correct values."""
@@ -125,3 +128,38 @@ async def test_sensors(hass: HomeAssistant, config_entry):
     hydrometer_battery_state = hass.states.get(hydrometer_battery_entity_id)
     assert hydrometer_battery_state is not None
     assert int(hydrometer_battery_state.state) == 90
+
+
+async def test_sensors_follow_account_devices(hass: HomeAssistant, config_entry):
+    """Test that entities are added and removed as devices join and leave the account."""
+    entity_registry = er.async_get(hass)
+    device_registry = dr.async_get(hass)
+    hydrometer = {"id": "pill_1", "name": "First Pill", "deviceType": "Hydrometer", "firmwareVersion": "1.0"}
+
+    with (
+        patch("custom_components.rapt_io.RaptApiClient.get_brewzillas", return_value=[]),
+        patch("custom_components.rapt_io.RaptApiClient.get_bonded_devices", return_value=[]),
+        patch(
+            "custom_components.rapt_io.RaptApiClient.get_hydrometers", return_value=[hydrometer]
+        ) as mock_get_hydrometers,
+    ):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][config_entry.entry_id]
+        assert entity_registry.async_get("sensor.first_pill_gravity") is not None
+
+        mock_get_hydrometers.return_value = [
+            {**hydrometer, "firmwareVersion": "1.1"},
+            {"id": "pill_2", "name": "Second Pill", "deviceType": "Hydrometer"},
+        ]
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert entity_registry.async_get("sensor.second_pill_gravity") is not None
+        assert device_registry.async_get_device(identifiers={(DOMAIN, "pill_1")}).sw_version == "1.1"
+
+        mock_get_hydrometers.return_value = [{"id": "pill_2", "name": "Second Pill", "deviceType": "Hydrometer"}]
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert device_registry.async_get_device(identifiers={(DOMAIN, "pill_1")}) is None
+        assert entity_registry.async_get("sensor.first_pill_gravity") is None
+        assert hass.states.get("sensor.first_pill_gravity") is None
@@ -0,0 +1,136 @@
+"""Tests for the RAPT.io telemetry statistics import."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.rapt_io.api import RaptApiError
+from custom_components.rapt_io.const import DOMAIN
+from custom_components.rapt_io.models import RaptHydrometer
+from custom_components.rapt_io.telemetry import RaptTelemetrySync, hourly_statistics, statistic_id
+
+NOW = datetime(2025, 3, 15, 12, 30, tzinfo=timezone.utc)
+# End of the last complete hour at NOW
+SYNC_END = datetime(2025, 3, 15, 12, tzinfo=timezone.utc)
+
+ADD_STATISTICS = "custom_components.rapt_io.telemetry.async_add_external_statistics"
+
+
+async def _fetch_telemetry(device_id, start, end):
+    """Return one telemetry point half an hour into the requested range."""
+    return [{"createdOn": (start + timedelta(minutes=30)).isoformat(), "gravity": 1.050, "temperature": 20.0}]
+
+
+def _telemetry_sync(hass, fetch=_fetch_telemetry) -> tuple[RaptTelemetrySync, AsyncMock]:
+    """Return a telemetry sync of a hydrometer, with its mocked telemetry fetch."""
+    coordinator = MagicMock()
+    coordinator.devices = [RaptHydrometer(id="pill", name="My RAPT Pill", device_type="Hydrometer")]
+    coordinator.client.get_hydrometer_telemetry = AsyncMock(side_effect=fetch)
+    return RaptTelemetrySync(hass, "entry", coordinator), coordinator.client.get_hydrometer_telemetry
+
+
+def test_hourly_statistics_aggregates_points():
+    """Test that telemetry points are aggregated per hour."""
+    points = [
+        {"createdOn": "2025-03-01T10:05:00+00:00", "gravity": 1.050},
+        {"createdOn": "2025-03-01T10:35:00+00:00", "gravity": 1.048},
+        {"createdOn": "2025-03-01T11:05:00+00:00", "gravity": 1.046},
+        {"createdOn": "2025-03-01T11:20:00+00:00", "temperature": 20.5},
+    ]
+
+    statistics = hourly_statistics(points, "gravity")
+
+    assert [statistic["start"] for statistic in statistics] == [
+        datetime(2025, 3, 1, 10, tzinfo=timezone.utc),
+        datetime(2025, 3, 1, 11, tzinfo=timezone.utc),
+    ]
+    assert statistics[0]["mean"] == pytest.approx(1.049)
+    assert statistics[0]["min"] == 1.048
+    assert statistics[0]["max"] == 1.050
+    assert statistics[1]["mean"] == 1.046
+
+
+def test_statistic_id_is_valid_external_id():
+    """Test that statistic IDs are namespaced and slugified."""
+    assert statistic_id("F1E2D3C4-B5A6", "gravity") == "rapt_io:f1e2d3c4_b5a6_gravity"
+
+
+async def test_sync_backfills_new_devices(hass, freezer):
+    """Test that a device seen for the first time gets seven days of history."""
+    freezer.move_to(NOW)
+    sync, fetch = _telemetry_sync(hass)
+
+    with patch(ADD_STATISTICS) as add_statistics:
+        await sync.async_sync()
+
+    fetch.assert_awaited_once_with("pill", SYNC_END - timedelta(days=7), SYNC_END)
+    imported = {call.args[1]["statistic_id"]: call.args[2] for call in add_statistics.call_args_list}
+    assert set(imported) == {f"{DOMAIN}:pill_gravity", f"{DOMAIN}:pill_temperature"}
+    assert imported[f"{DOMAIN}:pill_gravity"][0]["start"] == SYNC_END - timedelta(days=7)
+
+
+async def test_sync_resumes_from_last_imported_hour(hass, hass_storage, freezer):
+    """Test that a sync resumes from the persisted last imported hour, and the next one from its end."""
+    freezer.move_to(NOW)
+    last_imported = SYNC_END - timedelta(hours=3)
+    hass_storage[f"{DOMAIN}.telemetry.entry"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.telemetry.entry",
+        "data": {"last_imported": {"pill": last_imported.isoformat()}},
+    }
+    sync, fetch = _telemetry_sync(hass)
+
+    with patch(ADD_STATISTICS):
+        await sync.async_sync()
+        fetch.assert_awaited_once_with("pill", last_imported, SYNC_END)
+
+        freezer.tick(timedelta(hours=1))
+        await sync.async_sync()
+    fetch.assert_awaited_with("pill", SYNC_END, SYNC_END + timedelta(hours=1))
+
+
+async def test_sync_backfills_downtime_in_windows(hass, hass_storage, freezer):
+    """Test that the gap after downtime is fetched in windows of at most seven days."""
+    freezer.move_to(NOW)
+    last_imported = SYNC_END - timedelta(days=10)
+    hass_storage[f"{DOMAIN}.telemetry.entry"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.telemetry.entry",
+        "data": {"last_imported": {"pill": last_imported.isoformat()}},
+    }
+    sync, fetch = _telemetry_sync(hass)
+
+    with patch(ADD_STATISTICS) as add_statistics:
+        await sync.async_sync()
+
+    assert [call.args for call in fetch.await_args_list] == [
+        ("pill", last_imported, last_imported + timedelta(days=7)),
+        ("pill", last_imported + timedelta(days=7), SYNC_END),
+    ]
+    gravity = next(
+        call.args[2] for call in add_statistics.call_args_list if call.args[1]["statistic_id"].endswith("gravity")
+    )
+    assert [statistic["start"] for statistic in gravity] == [last_imported, last_imported + timedelta(days=7)]
+
+
+async def test_sync_failure_does_not_advance(hass, freezer):
+    """Test that a failed fetch imports nothing and the next sync retries the same range."""
+    freezer.move_to(NOW)
+    sync, fetch = _telemetry_sync(hass)
+    fetch.side_effect = RaptApiError("down")
+
+    with patch(ADD_STATISTICS) as add_statistics:
+        await sync.async_sync()
+        add_statistics.assert_not_called()
+
+        fetch.side_effect = _fetch_telemetry
+        await sync.async_sync()
+
+    assert [call.args for call in fetch.await_args_list] == [
+        ("pill", SYNC_END - timedelta(days=7), SYNC_END),
+        ("pill", SYNC_END - timedelta(days=7), SYNC_END),
+    ]
+    assert add_statistics.called
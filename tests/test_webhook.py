@@ -0,0 +1,74 @@
+"""Tests for the RAPT.io telemetry webhook."""
+
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.rapt_io.const import CONF_API_KEY, CONF_WEBHOOK, CONF_WEBHOOK_SECRET, DOMAIN
+from custom_components.rapt_io.webhook import WEBHOOK_SECRET_HEADER
+
+SECRET = "a-shared-secret-of-the-webhook"
+
+
+@pytest.fixture(name="webhook_entry")
+async def webhook_entry_fixture(hass):
+    """Set up a config entry receiving telemetry pushes."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="RAPT.io",
+        data={"username": "test_username", CONF_API_KEY: "test_api_key", CONF_WEBHOOK_ID: "rapt_webhook"},
+        options={CONF_WEBHOOK: True, CONF_WEBHOOK_SECRET: SECRET},
+        unique_id="test_device_id",
+    )
+    entry.add_to_hass(hass)
+    assert await async_setup_component(hass, "http", {})
+
+    with (
+        patch("custom_components.rapt_io.RaptApiClient.get_brewzillas", return_value=[]),
+        patch("custom_components.rapt_io.RaptApiClient.get_bonded_devices", return_value=[]),
+        patch(
+            "custom_components.rapt_io.RaptApiClient.get_hydrometers",
+            return_value=[{"id": "pill", "deviceType": "Hydrometer", "name": "My RAPT Pill", "gravity": 1.050}],
+        ),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    return entry
+
+
+async def test_push_updates_sensor(hass, hass_client_no_auth, webhook_entry):
+    """Test that an authenticated push updates the device sensors."""
+    client = await hass_client_no_auth()
+
+    response = await client.post(
+        "/api/webhook/rapt_webhook",
+        json={"deviceId": "pill", "gravity": 1.042, "createdOn": "2024-01-01T11:00:00Z"},
+        headers={WEBHOOK_SECRET_HEADER: SECRET},
+    )
+    await hass.async_block_till_done()
+
+    assert response.status == HTTPStatus.OK
+    assert hass.states.get("sensor.my_rapt_pill_gravity").state == "1.042"
+
+
+async def test_push_with_wrong_secret_is_rejected(hass, hass_client_no_auth, webhook_entry):
+    """Test that a push without the shared secret is rejected."""
+    client = await hass_client_no_auth()
+
+    response = await client.post("/api/webhook/rapt_webhook?secret=wrong", json={"id": "pill", "gravity": 1.0})
+
+    assert response.status == HTTPStatus.UNAUTHORIZED
+    assert hass.states.get("sensor.my_rapt_pill_gravity").state == "1.05"
+
+
+async def test_invalid_push_is_rejected(hass, hass_client_no_auth, webhook_entry):
+    """Test that a push without a device ID is rejected."""
+    client = await hass_client_no_auth()
+
+    response = await client.post(f"/api/webhook/rapt_webhook?secret={SECRET}", json={"gravity": 1.0})
+
+    assert response.status == HTTPStatus.BAD_REQUEST